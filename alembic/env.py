@@ -13,7 +13,9 @@ from src.config import settings
 
 # импортируем модели, чтобы Alembic их обнаружил
 from src.models import dish  # noqa
+from src.models import idempotency_key  # noqa
 from src.models import order  # noqa
+from src.models import order_archive  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -31,6 +33,25 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Объекты поиска блюд вне метаданных моделей создаются DDL (см. src/models/dish.py):
+# на SQLite - виртуальная таблица FTS5 и ее служебные таблицы (dishes_fts_data,
+# dishes_fts_idx, ...), на PostgreSQL - генерируемый столбец search_vector и его индекс
+FTS_TABLE = 'dishes_fts'
+SEARCH_COLUMN = ('dishes', 'search_vector')
+SEARCH_INDEX = 'ix_dishes_search'
+
+
+def include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    """Исключает из сравнения схемы объекты полнотекстового поиска блюд."""
+    if type_ == 'table':
+        return not (name == FTS_TABLE or name.startswith(f'{FTS_TABLE}_'))
+    if type_ == 'column':
+        return (parent_names.get('table_name'), name) != SEARCH_COLUMN
+    if type_ == 'index':
+        return name != SEARCH_INDEX
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -55,6 +76,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -62,7 +84,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
     with context.begin_transaction():
         context.run_migrations()
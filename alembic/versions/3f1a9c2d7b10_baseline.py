@@ -0,0 +1,69 @@
+"""baseline
+
+Revision ID: 3f1a9c2d7b10
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1a9c2d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def utcnow_default() -> sa.TextClause:
+    """Значение по умолчанию времени UTC в том виде, в котором его создает эта ревизия.
+
+    SQL задан литералом, а не выражением из кода приложения: изменение кода
+    не должно менять DDL уже примененной миграции.
+    """
+    if op.get_context().dialect.name == 'sqlite':
+        # 'now' в SQLite - время UTC, %f - секунды с миллисекундами
+        return sa.text("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))")
+    return sa.text("TIMEZONE('utc', now())")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dishes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_dishes_id', 'dishes', ['id'])
+
+    op.create_table(
+        'orders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('order_time', sa.DateTime(), server_default=utcnow_default(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_orders_id', 'orders', ['id'])
+
+    op.create_table(
+        'order_dish',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('dish_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['dish_id'], ['dishes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('order_dish')
+    op.drop_index('ix_orders_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_dishes_id', table_name='dishes')
+    op.drop_table('dishes')
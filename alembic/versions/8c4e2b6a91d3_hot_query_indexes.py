@@ -0,0 +1,39 @@
+"""hot query indexes
+
+Revision ID: 8c4e2b6a91d3
+Revises: 3f1a9c2d7b10
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2b6a91d3'
+down_revision = '3f1a9c2d7b10'
+branch_labels = None
+depends_on = None
+
+# (имя индекса, таблица, колонки)
+INDEXES = (
+    ('ix_order_dish_order_id', 'order_dish', ['order_id']),
+    ('ix_order_dish_dish_id', 'order_dish', ['dish_id']),
+    ('ix_orders_status_order_time', 'orders', ['status', 'order_time']),
+    ('ix_orders_order_time_id', 'orders', ['order_time', 'id']),
+    ('ix_dishes_category', 'dishes', ['category']),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не может выполняться внутри транзакции,
+    # поэтому на PostgreSQL индексы строятся в режиме autocommit без блокировки записи
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
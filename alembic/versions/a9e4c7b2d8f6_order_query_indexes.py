@@ -0,0 +1,62 @@
+"""order query indexes
+
+Revision ID: a9e4c7b2d8f6
+Revises: e6c1a9d3f5b7
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4c7b2d8f6'
+down_revision = 'e6c1a9d3f5b7'
+branch_labels = None
+depends_on = None
+
+
+# SQLite: время заказа, записанное значением по умолчанию до дополнения до микросекунд
+# ('YYYY-MM-DD HH:MM:SS.SSS'), приводится к формату SQLAlchemy ('...SS.SSS000')
+ORDER_TIME_TABLES = ('orders', 'orders_archive', 'order_dish_archive')
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        for table in ORDER_TIME_TABLES:
+            op.execute(f"UPDATE {table} SET order_time = order_time || '000' WHERE length(order_time) = 23")
+
+    # Индексы действующих заказов строятся без блокировки записи (см. hot_query_indexes).
+    # (status, order_time, id) заменяет (status, order_time): id нужен для keyset-пагинации
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_status_order_time_id', 'orders', ['status', 'order_time', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_orders_customer_name_order_time_id', 'orders', ['customer_name', 'order_time', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_orders_status_order_time', table_name='orders', postgresql_concurrently=True, if_exists=True,
+        )
+    # CONCURRENTLY не поддерживается для секционированных таблиц, в архив пишет только перенос заказов
+    op.create_index(
+        'ix_orders_archive_customer_name_order_time_id', 'orders_archive', ['customer_name', 'order_time', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_archive_customer_name_order_time_id', table_name='orders_archive')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_status_order_time', 'orders', ['status', 'order_time'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_orders_customer_name_order_time_id', table_name='orders',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            'ix_orders_status_order_time_id', table_name='orders', postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,47 @@
+"""sqlite order autoincrement
+
+Revision ID: b5d9f3a7c1e8
+Revises: c3e7a1f5b9d2
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d9f3a7c1e8'
+down_revision = 'c3e7a1f5b9d2'
+branch_labels = None
+depends_on = None
+
+
+# SQLite без AUTOINCREMENT выдает новой строке наибольший ID + 1, поэтому ID последних
+# заказов, перенесенных в архив, доставались новым заказам. На PostgreSQL ID выдают
+# последовательности, они не повторяются. Счетчик sqlite_sequence начинается с наибольшего
+# ID среди действующих и архивных строк
+AUTOINCREMENT_TABLES = (('orders', 'orders_archive'), ('order_dish', 'order_dish_archive'))
+
+
+def set_sqlite_autoincrement(enabled: bool) -> None:
+    # Внешние ключи в соединении миграций не включены, поэтому пересоздание orders
+    # не удаляет каскадно связи order_dish
+    for table, _ in AUTOINCREMENT_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': enabled}):
+            pass
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    set_sqlite_autoincrement(True)
+    for table, archive in AUTOINCREMENT_TABLES:
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', COALESCE(MAX(id), 0) "
+            f"FROM (SELECT id FROM {table} UNION ALL SELECT id FROM {archive})"
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        set_sqlite_autoincrement(False)
@@ -0,0 +1,49 @@
+"""sqlite utcnow default
+
+Revision ID: c3e7a1f5b9d2
+Revises: f2b6d8a4c1e3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e7a1f5b9d2'
+down_revision = 'f2b6d8a4c1e3'
+branch_labels = None
+depends_on = None
+
+
+# SQLite: значение по умолчанию дополняется до микросекунд ('...SS.SSS000') - в этом формате
+# SQLAlchemy передает DateTime, и строки сравниваются с ключами keyset-пагинации без ошибок.
+# Выражение по умолчанию в SQLite меняется только пересозданием таблицы
+SQLITE_UTCNOW_MICROSECONDS = "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+SQLITE_UTCNOW_MILLISECONDS = "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))"
+DEFAULT_COLUMNS = (('orders', 'order_time'), ('orders_archive', 'archived_at'))
+# Заказы, созданные с прежним значением по умолчанию после order_query_indexes
+ORDER_TIME_TABLES = ('orders', 'orders_archive', 'order_dish_archive')
+
+
+def set_sqlite_default(default: str) -> None:
+    # Внешние ключи в соединении миграций не включены, поэтому пересоздание orders
+    # не удаляет каскадно связи order_dish
+    for table, column in DEFAULT_COLUMNS:
+        with op.batch_alter_table(table, recreate='always') as batch_op:
+            batch_op.alter_column(
+                column, existing_type=sa.DateTime(), existing_nullable=False, server_default=sa.text(default),
+            )
+
+
+def upgrade() -> None:
+    # На PostgreSQL значение по умолчанию не менялось
+    if op.get_context().dialect.name == 'sqlite':
+        set_sqlite_default(SQLITE_UTCNOW_MICROSECONDS)
+        for table in ORDER_TIME_TABLES:
+            op.execute(f"UPDATE {table} SET order_time = order_time || '000' WHERE length(order_time) = 23")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        set_sqlite_default(SQLITE_UTCNOW_MILLISECONDS)
@@ -0,0 +1,56 @@
+"""order archive
+
+Revision ID: d4a8f2c6e9b1
+Revises: b7d3e5f1a2c4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8f2c6e9b1'
+down_revision = 'b7d3e5f1a2c4'
+branch_labels = None
+depends_on = None
+
+
+def utcnow_default() -> sa.TextClause:
+    """Значение по умолчанию времени UTC (литерал, как в baseline)."""
+    if op.get_context().dialect.name == 'sqlite':
+        return sa.text("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))")
+    return sa.text("TIMEZONE('utc', now())")
+
+
+def upgrade() -> None:
+    # На PostgreSQL таблицы секционированы по месяцам order_time,
+    # секции создаются при переносе заказов в архив
+    op.create_table(
+        'orders_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('order_time', sa.DateTime(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), server_default=utcnow_default(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'order_time'),
+        postgresql_partition_by='RANGE (order_time)',
+    )
+    op.create_index('ix_orders_archive_order_time_id', 'orders_archive', ['order_time', 'id'])
+    op.create_table(
+        'order_dish_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('order_time', sa.DateTime(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('dish_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'order_time'),
+        postgresql_partition_by='RANGE (order_time)',
+    )
+    op.create_index('ix_order_dish_archive_order_id', 'order_dish_archive', ['order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_dish_archive_order_id', table_name='order_dish_archive')
+    op.drop_table('order_dish_archive')
+    op.drop_index('ix_orders_archive_order_time_id', table_name='orders_archive')
+    op.drop_table('orders_archive')
@@ -0,0 +1,82 @@
+"""dish search
+
+Revision ID: e6c1a9d3f5b7
+Revises: d4a8f2c6e9b1
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6c1a9d3f5b7'
+down_revision = 'd4a8f2c6e9b1'
+branch_labels = None
+depends_on = None
+
+
+# DDL задан литералами, а не импортом из моделей: изменение моделей не должно менять миграцию.
+# PostgreSQL: tsvector названия (вес A) и описания (вес B) в генерируемом столбце
+DISH_SEARCH_COLUMN_DDL = (
+    "ALTER TABLE dishes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', name), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED"
+)
+# SQLite: таблица FTS5 с внешним содержимым (строки dishes), синхронизируется триггерами
+DISHES_FTS_DDL = (
+    "CREATE VIRTUAL TABLE dishes_fts USING fts5("
+    "name, description, content='dishes', content_rowid='id', tokenize='unicode61 remove_diacritics 0')",
+    "CREATE TRIGGER dishes_fts_insert AFTER INSERT ON dishes BEGIN "
+    "INSERT INTO dishes_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER dishes_fts_delete AFTER DELETE ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER dishes_fts_update AFTER UPDATE OF name, description ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO dishes_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'sqlite':
+        for statement in DISHES_FTS_DDL:
+            op.execute(statement)
+        # Заполнение индекса FTS5 существующими блюдами
+        op.execute("INSERT INTO dishes_fts(dishes_fts) VALUES ('rebuild')")
+    else:
+        # Добавление генерируемого столбца перезаписывает таблицу блюд под блокировкой
+        op.execute(DISH_SEARCH_COLUMN_DDL)
+
+    # Индексы строятся без блокировки записи (см. hot_query_indexes)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_dishes_category_id', 'dishes', ['category', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_dishes_category', table_name='dishes', postgresql_concurrently=True, if_exists=True)
+        if op.get_context().dialect.name == 'postgresql':
+            op.create_index(
+                'ix_dishes_search', 'dishes', ['search_vector'],
+                postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if op.get_context().dialect.name == 'postgresql':
+            op.drop_index('ix_dishes_search', table_name='dishes', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_dishes_category', 'dishes', ['category'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_dishes_category_id', table_name='dishes', postgresql_concurrently=True, if_exists=True)
+
+    if op.get_context().dialect.name == 'postgresql':
+        op.drop_column('dishes', 'search_vector')
+    else:
+        # Триггеры принадлежат таблице dishes и не удаляются вместе с dishes_fts
+        for trigger in ('dishes_fts_insert', 'dishes_fts_delete', 'dishes_fts_update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS dishes_fts')
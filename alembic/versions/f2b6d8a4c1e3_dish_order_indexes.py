@@ -0,0 +1,40 @@
+"""dish order indexes
+
+Revision ID: f2b6d8a4c1e3
+Revises: a9e4c7b2d8f6
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b6d8a4c1e3'
+down_revision = 'a9e4c7b2d8f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (dish_id, order_id) заменяет (dish_id): заказы с блюдом и продажи блюд читаются
+    # только из индекса, каскадное удаление блюда использует его префикс
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_dish_dish_id_order_id', 'order_dish', ['dish_id', 'order_id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index('ix_order_dish_dish_id', table_name='order_dish', postgresql_concurrently=True, if_exists=True)
+    # CONCURRENTLY не поддерживается для секционированных таблиц, в архив пишет только перенос заказов
+    op.create_index('ix_order_dish_archive_dish_id_order_id', 'order_dish_archive', ['dish_id', 'order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_dish_archive_dish_id_order_id', table_name='order_dish_archive')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_order_dish_dish_id', 'order_dish', ['dish_id'], postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_order_dish_dish_id_order_id', table_name='order_dish', postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1 @@
+"""Бенчмарки сервиса (запуск: python -m benchmarks.<имя>)."""
@@ -0,0 +1,71 @@
+"""Задержка первых запросов после запуска сервера с прогревом пула и без него.
+
+Для каждого значения DB_POOL_WARMUP сервер (uvicorn) несколько раз запускается
+заново; замеряются время запуска (до открытия порта, включая прогрев пула),
+задержка первых запросов к заказам и блюдам и повторного запроса к заказам.
+
+    python -m benchmarks.cold_start --warmup 0 5 --runs 5
+"""
+import argparse
+import asyncio
+import signal
+import statistics
+import time
+
+import httpx
+
+from benchmarks.common import api_client, recreate_database, start_server
+
+PORT = 8765
+REQUESTS = (
+    ('первый GET /orders', '/api/v1/orders/?limit=20'),
+    ('первый GET /dishes', '/api/v1/dishes/?limit=20'),
+    ('второй GET /orders', '/api/v1/orders/?limit=20'),
+)
+
+
+async def seed(dishes: int, orders: int) -> None:
+    await recreate_database()
+    async with api_client() as client:
+        for index in range(dishes):
+            await client.post('/api/v1/dishes/', json={'name': f'Блюдо {index}', 'price': 100, 'category': 'супы'})
+        for index in range(orders):
+            await client.post('/api/v1/orders/', json={'customer_name': f'Клиент {index}', 'dish_ids': [1, 2, 3]})
+
+
+def cold_start(warmup: int) -> list[float]:
+    """Время запуска и задержки запросов REQUESTS одного запуска сервера, мс."""
+    started = time.perf_counter()
+    server = start_server(
+        ['-m', 'uvicorn', 'src.main:app', '--port', str(PORT), '--log-level', 'warning'],
+        PORT, {'DB_POOL_WARMUP': str(warmup)},
+    )
+    timings = [(time.perf_counter() - started) * 1000]
+    try:
+        with httpx.Client(base_url=f'http://127.0.0.1:{PORT}') as client:
+            for _, path in REQUESTS:
+                request_started = time.perf_counter()
+                client.get(path).raise_for_status()
+                timings.append((time.perf_counter() - request_started) * 1000)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--warmup', type=int, nargs='+', default=[0, 5], help='значения DB_POOL_WARMUP')
+    parser.add_argument('--runs', type=int, default=5, help='запусков сервера на каждое значение')
+    args = parser.parse_args()
+
+    asyncio.run(seed(dishes=20, orders=200))
+    for warmup in args.warmup:
+        runs = [cold_start(warmup) for _ in range(args.runs)]
+        medians = [statistics.median(run[index] for run in runs) for index in range(len(REQUESTS) + 1)]
+        details = ', '.join(f'{label} {value:.1f} мс' for (label, _), value in zip(REQUESTS, medians[1:]))
+        print(f'DB_POOL_WARMUP={warmup}: запуск {medians[0]:.0f} мс, {details} (медиана {args.runs} запусков)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Общие функции бенчмарков.
+
+Бенчмарки пересоздают таблицы, поэтому работают с отдельной базой BENCH_DB_URL
+(по умолчанию SQLite-файл bench_restaurant.db), а не с DB_URL из .env.
+Модуль импортируется раньше модулей приложения: настройки читаются при импорте src.config.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+
+BENCH_DB_URL = os.environ.get('BENCH_DB_URL', 'sqlite+aiosqlite:///./bench_restaurant.db')
+os.environ['DB_URL'] = BENCH_DB_URL
+# Логирование, журнал медленных запросов и метрики не должны влиять на замеры
+os.environ.setdefault('LOG_FILE', '')
+os.environ.setdefault('LOG_CONSOLE', 'false')
+os.environ.setdefault('LOG_ACCESS_SAMPLE_RATE', '0')
+os.environ.setdefault('SLOW_QUERY_THRESHOLD_MS', '0')
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+import httpx
+
+from src.api.v1.services.dish_service import dish_catalog, menu_cache
+from src.database import recreate_all_tables
+from src.main import app
+
+SERVER_START_TIMEOUT = 30
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Перцентиль выборки (fraction от 0 до 1)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def api_client() -> httpx.AsyncClient:
+    """Клиент API в том же процессе (без запуска lifespan приложения)."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench')
+
+
+async def recreate_database() -> None:
+    """Пустые таблицы и сброшенные кэши блюд."""
+    await recreate_all_tables()
+    menu_cache.bump()
+    dish_catalog.bump()
+
+
+def start_server(args: list[str], port: int, env: dict[str, str] | None = None) -> subprocess.Popen:
+    """Запуск сервера в отдельном процессе с базой бенчмарка, ожидание открытия порта."""
+    process = subprocess.Popen(
+        [sys.executable, *args],
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Сервер завершился при запуске с кодом {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.05).close()
+        except OSError:
+            time.sleep(0.01)
+        else:
+            return process
+    process.kill()
+    raise RuntimeError(f'Сервер не открыл порт {port} за {SERVER_START_TIMEOUT} с')
@@ -0,0 +1,122 @@
+"""Задержка поиска блюд и фильтра по категории на большом каталоге.
+
+Каталог заполняется случайными названиями и описаниями из фиксированного словаря
+(с постоянным зерном, поэтому данные воспроизводимы). Для каждого запроса замеряются
+первая и вторая страницы GET /api/v1/dishes/ с `q` и/или `category`. Для сравнения
+замеряются поиск подстроки через ILIKE без индекса и загрузка всего меню страницами,
+как делал клиент до появления поиска.
+
+    python -m benchmarks.dish_search --dishes 100000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import insert, or_, select, text
+
+from benchmarks.common import api_client, percentile, recreate_database
+from src.database import async_session_maker, engine
+from src.models import Dish
+from src.utils.constants import DishCategory
+
+ADJECTIVES = [
+    'острый', 'домашний', 'летний', 'пряный', 'сливочный', 'томатный', 'грибной', 'куриный', 'овощной', 'рыбный',
+    'сырный', 'мясной', 'легкий', 'фирменный', 'копченый', 'сладкий', 'ореховый', 'лимонный', 'чесночный', 'медовый',
+]
+NOUNS = [
+    'суп', 'салат', 'борщ', 'плов', 'стейк', 'пирог', 'соус', 'десерт', 'чай', 'морс',
+    'паста', 'рагу', 'омлет', 'блин', 'шашлык', 'ролл', 'пудинг', 'торт', 'кофе', 'лимонад',
+]
+CASES = [
+    ('редкое слово', {'q': '№4242'}),
+    ('слово (1/20 блюд)', {'q': 'плов'}),
+    ('префиксы 2 слов', {'q': 'остр бор'}),
+    ('слово + категория', {'q': 'чай', 'category': DishCategory.BEVERAGES.value}),
+    ('частый префикс', {'q': 'с'}),
+    # Страницы без q отдаются из кэша меню в памяти процесса
+    ('категория (кэш)', {'category': DishCategory.SOUPS.value}),
+]
+PAGE_SIZE = 20
+MENU_PAGE_SIZE = 100
+INSERT_CHUNK = 5000
+
+
+async def seed(dishes: int) -> None:
+    await recreate_database()
+    generator = random.Random(1)
+    categories = [category.value for category in DishCategory]
+    rows = [
+        {
+            'name': f'{generator.choice(ADJECTIVES).capitalize()} {generator.choice(NOUNS)} №{index}',
+            'description': ' '.join(generator.sample(ADJECTIVES + NOUNS, 6)),
+            'price': 100,
+            'category': generator.choice(categories),
+        }
+        for index in range(dishes)
+    ]
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), INSERT_CHUNK):
+            await conn.execute(insert(Dish), rows[start:start + INSERT_CHUNK])
+        await conn.execute(text('ANALYZE'))
+
+
+async def main(dishes: int, requests: int) -> None:
+    await seed(dishes)
+    async with api_client() as client:
+        print(f'{dishes} блюд, страница {PAGE_SIZE} блюд:')
+        for label, params in CASES:
+            pages: list[list[float]] = [[], []]
+            for _ in range(requests):
+                cursor = None
+                for timings in pages:
+                    started = time.perf_counter()
+                    page_params = {**params, 'limit': PAGE_SIZE, **({'cursor': cursor} if cursor else {})}
+                    response = await client.get('/api/v1/dishes/', params=page_params)
+                    timings.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                    cursor = response.json()['next_cursor']
+                    if cursor is None:
+                        break
+            second_page = f', вторая страница p50 {percentile(pages[1], 0.5) * 1000:6.2f} мс' if pages[1] else ''
+            print(
+                f'  {label:18} p50 {percentile(pages[0], 0.5) * 1000:7.2f} мс, '
+                f'p95 {percentile(pages[0], 0.95) * 1000:7.2f} мс{second_page}'
+            )
+
+        # Поиск подстроки без индекса: полный просмотр таблицы
+        async with async_session_maker() as session:
+            for word in ('плов', '№4242'):
+                query = (
+                    select(Dish)
+                    .where(or_(Dish.name.ilike(f'%{word}%'), Dish.description.ilike(f'%{word}%')))
+                    .order_by(Dish.id)
+                    .limit(PAGE_SIZE + 1)
+                )
+                timings = []
+                for _ in range(max(1, requests // 5)):
+                    started = time.perf_counter()
+                    (await session.scalars(query)).all()
+                    timings.append(time.perf_counter() - started)
+                print(f'  для сравнения: ILIKE {word!r} без индекса p50 {percentile(timings, 0.5) * 1000:.2f} мс')
+
+        started = time.perf_counter()
+        cursor, downloaded = None, 0
+        while True:
+            response = await client.get(
+                '/api/v1/dishes/', params={'limit': MENU_PAGE_SIZE, **({'cursor': cursor} if cursor else {})},
+            )
+            page = response.json()
+            downloaded += len(page['items'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        print(f'  для сравнения: загрузка всего меню ({downloaded} блюд) {time.perf_counter() - started:.2f} с')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dishes', type=int, default=100_000, help='размер каталога')
+    parser.add_argument('--requests', type=int, default=60, help='запросов на каждый вариант')
+    args = parser.parse_args()
+    asyncio.run(main(args.dishes, args.requests))
@@ -0,0 +1,102 @@
+"""Количество SQL-запросов и время на создание заказа.
+
+Запросы считаются событием before_cursor_execute на всех движках приложения.
+Для сравнения выполняется и прежний путь создания заказа через ORM (чтение блюд,
+flush + refresh заказа, flush связей, повторный refresh) в отдельной сессии.
+
+    python -m benchmarks.order_statements --requests 300 --batch-size 50
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from benchmarks.common import api_client, recreate_database
+from src.database import async_session_maker, engine, replica_engines
+from src.models import Dish, Order
+from src.utils.constants import OrderStatus
+
+DISH_IDS = [1, 2, 3]
+
+
+class StatementCounter:
+    """Счетчик запросов, отправленных в базу данных всеми движками."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __enter__(self) -> 'StatementCounter':
+        for db_engine in (engine, *replica_engines):
+            event.listen(db_engine.sync_engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for db_engine in (engine, *replica_engines):
+            event.remove(db_engine.sync_engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args: object) -> None:
+        self.count += 1
+
+
+def orm_create_order(session: Session, customer_name: str, dish_ids: list[int]) -> Order:
+    """Прежний путь создания заказа через ORM."""
+    dishes = session.scalars(select(Dish).where(Dish.id.in_(dish_ids))).all()
+    order = Order(customer_name=customer_name, status=OrderStatus.PROCESSING.value)
+    session.add(order)
+    session.flush()
+    session.refresh(order)
+    order.dishes = list(dishes)
+    session.flush()
+    session.refresh(order)
+    return order
+
+
+async def orm_request() -> None:
+    async with async_session_maker() as session:
+        await session.run_sync(orm_create_order, 'Клиент', DISH_IDS)
+        await session.commit()
+
+
+async def measure(label: str, request: Callable[[], Awaitable[None]], requests: int, orders_per_request: int) -> None:
+    await request()
+    with StatementCounter() as counter:
+        started = time.perf_counter()
+        for _ in range(requests):
+            await request()
+        elapsed = time.perf_counter() - started
+    print(
+        f'{label:32} {counter.count / requests:6.1f} запросов к базе на запрос, '
+        f'{counter.count / requests / orders_per_request:5.2f} на заказ, '
+        f'{elapsed / requests * 1000:6.2f} мс на запрос'
+    )
+
+
+async def main(requests: int, batch_size: int) -> None:
+    await recreate_database()
+    async with api_client() as client:
+        for index in range(len(DISH_IDS)):
+            await client.post('/api/v1/dishes/', json={'name': f'Блюдо {index}', 'price': 100, 'category': 'супы'})
+        order = {'customer_name': 'Клиент', 'dish_ids': DISH_IDS}
+
+        async def create_order() -> None:
+            (await client.post('/api/v1/orders/', json=order)).raise_for_status()
+
+        async def create_orders_batch() -> None:
+            (await client.post('/api/v1/orders/batch', json={'items': [order] * batch_size})).raise_for_status()
+
+        await measure('до: ORM, flush + refresh', orm_request, requests, 1)
+        await measure('POST /orders/', create_order, requests, 1)
+        await measure(
+            f'POST /orders/batch ({batch_size} заказов)', create_orders_batch, max(1, requests // 10), batch_size,
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300, help='запросов на каждый вариант')
+    parser.add_argument('--batch-size', type=int, default=50, help='заказов в пакетном запросе')
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.batch_size))
@@ -0,0 +1,91 @@
+"""Задержка проверки блюд заказа: снимок каталога в памяти и запрос к базе.
+
+Проверка блюд (DishService.find_dishes) и создание заказа через API замеряются
+со снимком каталога и с DISH_CATALOG_TTL=0, когда блюда каждого заказа читаются
+запросом к базе (прежний путь). Заказы с известными блюдами создаются, заказы
+с неизвестным блюдом отклоняются.
+
+    python -m benchmarks.order_validation --dishes 500 10000
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Callable
+
+from sqlalchemy import insert
+
+from benchmarks.common import api_client, percentile, recreate_database
+from src.api.v1.services.dish_service import DishService, dish_catalog
+from src.config import settings
+from src.database import engine
+from src.models import Dish
+from src.utils.constants import DishCategory
+from src.utils.unit_of_work import UnitOfWork
+
+DISHES_PER_ORDER = 3
+UNKNOWN_DISH_ID = 10**9
+
+
+async def seed(dishes: int) -> None:
+    await recreate_database()
+    categories = [category.value for category in DishCategory]
+    async with engine.begin() as conn:
+        await conn.execute(insert(Dish), [
+            {'name': f'Блюдо {index}', 'price': 100 + index, 'category': categories[index % len(categories)]}
+            for index in range(dishes)
+        ])
+    dish_catalog.bump()
+
+
+def describe(timings: list[float], scale: float, unit: str) -> str:
+    return f'p50 {percentile(timings, 0.5) * scale:8.1f} {unit}, p99 {percentile(timings, 0.99) * scale:8.1f} {unit}'
+
+
+async def measure(dishes: int, validations: int, requests: int) -> None:
+    dish_ids = list(range(1, dishes + 1))
+    cases: list[tuple[str, Callable[[], list[int]], int]] = [
+        ('известные блюда', lambda: random.sample(dish_ids, DISHES_PER_ORDER), 201),
+        ('неизвестное блюдо', lambda: [dish_ids[0], UNKNOWN_DISH_ID], 400),
+    ]
+    service = DishService(UnitOfWork())
+    async with api_client() as client:
+        for label, make_dish_ids, _ in cases:
+            await service.find_dishes(make_dish_ids())
+            timings = []
+            for _ in range(validations):
+                wanted = make_dish_ids()
+                started = time.perf_counter()
+                await service.find_dishes(wanted)
+                timings.append(time.perf_counter() - started)
+            print(f'    {"find_dishes":14} {label:17}: {describe(timings, 1e6, "мкс")}')
+        for label, make_dish_ids, status_code in cases:
+            timings = []
+            for _ in range(requests):
+                order = {'customer_name': 'Клиент', 'dish_ids': make_dish_ids()}
+                started = time.perf_counter()
+                response = await client.post('/api/v1/orders/', json=order)
+                timings.append(time.perf_counter() - started)
+                assert response.status_code == status_code, response.text
+            print(f'    {"POST /orders/":14} {label:17}: {describe(timings, 1e3, "мс")}')
+
+
+async def main(dish_counts: list[int], validations: int, requests: int) -> None:
+    catalog_ttl = settings.DISH_CATALOG_TTL
+    for dishes in dish_counts:
+        await seed(dishes)
+        for label, ttl in (('снимок каталога', catalog_ttl), ('запрос к базе (DISH_CATALOG_TTL=0)', 0)):
+            settings.DISH_CATALOG_TTL = ttl
+            print(f'{dishes} блюд, {label}:')
+            await measure(dishes, validations, requests)
+    settings.DISH_CATALOG_TTL = catalog_ttl
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dishes', type=int, nargs='+', default=[500, 10_000], help='размер каталога')
+    parser.add_argument('--validations', type=int, default=3000, help='проверок find_dishes на вариант')
+    parser.add_argument('--requests', type=int, default=1000, help='запросов POST /orders/ на вариант')
+    args = parser.parse_args()
+    random.seed(1)
+    asyncio.run(main(args.dishes, args.validations, args.requests))
@@ -0,0 +1,124 @@
+"""Строк в секунду при чтении всех заказов постранично: быстрый путь и ORM + pydantic.
+
+GET /api/v1/orders/ (Core + orjson) сравнивается с прежней реализацией списка:
+ORM-объекты Order с selectinload блюд и ответ через response_model Page[OrderRead].
+Прежняя реализация подключается к приложению отдельным маршрутом только на время
+бенчмарка. Ответы обоих путей сверяются после замеров (прежний путь не упорядочивал
+блюда заказа, поэтому блюда сравниваются без учета порядка).
+
+    python -m benchmarks.orders_list --orders 10000 100000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import orjson
+from sqlalchemy import insert, select, text, tuple_
+from sqlalchemy.orm import selectinload
+
+from benchmarks.common import api_client, recreate_database
+from src.database import async_session_maker, engine
+from src.main import app
+from src.models import Dish, Order
+from src.schemas.order import OrderRead
+from src.schemas.pagination import Page
+from src.utils.constants import OrderStatus
+from src.utils.pagination import decode_cursor, encode_cursor
+
+ORM_PATH = '/bench/orders-orm'
+PAGE_SIZE = 100
+DISHES = 50
+DISHES_PER_ORDER = 3
+INSERT_CHUNK = 5000
+
+
+async def orm_orders_page(limit: int = PAGE_SIZE, cursor: str | None = None) -> dict:
+    """Прежний список заказов: ORM-объекты, сериализация через response_model."""
+    query = select(Order).options(selectinload(Order.dishes)).order_by(Order.order_time, Order.id).limit(limit + 1)
+    if cursor is not None:
+        order_time, order_id = decode_cursor(cursor, 2)
+        query = query.where(tuple_(Order.order_time, Order.id) > (datetime.fromisoformat(order_time), order_id))
+    async with async_session_maker() as session:
+        orders = (await session.scalars(query)).all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].order_time, orders[-1].id)
+    return {'items': orders, 'next_cursor': next_cursor}
+
+
+async def seed(orders: int) -> None:
+    await recreate_database()
+    order_dish = Order.dishes.property.secondary
+    started = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(insert(Dish), [
+            {'name': f'Блюдо {index}', 'price': 100 + index * 1.25, 'category': 'супы'} for index in range(DISHES)
+        ])
+        for first in range(1, orders + 1, INSERT_CHUNK):
+            order_ids = range(first, min(first + INSERT_CHUNK, orders + 1))
+            await conn.execute(insert(Order), [
+                {
+                    'id': order_id,
+                    'customer_name': f'Клиент {order_id}',
+                    'status': OrderStatus.PROCESSING.value,
+                    'order_time': started + timedelta(seconds=order_id * 1.5),
+                }
+                for order_id in order_ids
+            ])
+            await conn.execute(insert(order_dish), [
+                {'order_id': order_id, 'dish_id': 1 + (order_id * 7 + index) % DISHES}
+                for order_id in order_ids
+                for index in range(DISHES_PER_ORDER)
+            ])
+        await conn.execute(text('ANALYZE'))
+
+
+async def read_all(client: httpx.AsyncClient, path: str) -> tuple[float, list[dict]]:
+    """Чтение всех страниц: (секунд, страницы)."""
+    pages, cursor = [], None
+    started = time.perf_counter()
+    while True:
+        response = await client.get(path, params={'limit': PAGE_SIZE, **({'cursor': cursor} if cursor else {})})
+        response.raise_for_status()
+        pages.append(orjson.loads(response.content))
+        cursor = pages[-1]['next_cursor']
+        if cursor is None:
+            return time.perf_counter() - started, pages
+
+
+def normalized(pages: list[dict]) -> list[dict]:
+    """Страницы с блюдами заказов, упорядоченными по ID."""
+    for page in pages:
+        for order in page['items']:
+            order['dishes'].sort(key=lambda dish: dish['id'])
+    return pages
+
+
+async def main(order_counts: list[int], runs: int) -> None:
+    app.add_api_route(ORM_PATH, orm_orders_page, response_model=Page[OrderRead])
+    async with api_client() as client:
+        for orders in order_counts:
+            await seed(orders)
+            responses = []
+            for label, path in (('ORM + pydantic', ORM_PATH), ('Core + orjson', '/api/v1/orders/')):
+                measured = [await read_all(client, path) for _ in range(runs)]
+                elapsed, pages = min(measured, key=lambda result: result[0])
+                responses.append(normalized(pages))
+                rows = sum(len(page['items']) for page in pages)
+                print(
+                    f'{orders:>7} заказов, {label:15}: {rows / elapsed:8.0f} строк/с '
+                    f'({elapsed:.2f} с, лучший из {runs})'
+                )
+            if responses[0] != responses[1]:
+                print('  ответы путей различаются!')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, nargs='+', default=[10_000, 100_000], help='количество заказов')
+    parser.add_argument('--runs', type=int, default=2, help='прогонов на каждый путь (берется лучший)')
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.runs))
@@ -0,0 +1,113 @@
+"""Параллельная запись заказов в файловую SQLite с профилем SQLite и без него.
+
+Профиль (DB_SQLITE_PROFILE): WAL, одно соединение записи с очередью транзакций
+и BEGIN IMMEDIATE, отдельный пул чтения. Без профиля используются настройки
+драйвера по умолчанию. Писатели создают заказы через API, параллельно с ними
+читатели запрашивают список заказов. Для каждого варианта выводятся заказы
+в секунду, задержки записи, чтения в секунду и ошибки "database is locked".
+
+Профиль выбирается при импорте приложения, поэтому каждый вариант выполняется
+в отдельном процессе с новым файлом базы (режим журнала WAL сохраняется в файле).
+
+    BENCH_DB_URL=sqlite+aiosqlite:///./bench_restaurant.db python -m benchmarks.sqlite_writers --writers 1 8 32
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+from benchmarks.common import BENCH_DB_URL, api_client, percentile, recreate_database
+from src.database.sqlite import is_file_sqlite
+
+DISHES = 10
+READERS = 4
+LOCKED = 'database is locked'
+
+
+async def run(writers: int, orders_per_writer: int) -> None:
+    await recreate_database()
+    async with api_client() as client:
+        for index in range(DISHES):
+            await client.post('/api/v1/dishes/', json={'name': f'Блюдо {index}', 'price': 100, 'category': 'супы'})
+
+        outcomes: Counter[str] = Counter()
+        latencies: list[float] = []
+        reads = 0
+        writing = True
+
+        async def writer(number: int) -> None:
+            for index in range(orders_per_writer):
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        '/api/v1/orders/', json={'customer_name': f'Писатель {number}-{index}', 'dish_ids': [1, 2, 3]},
+                    )
+                    outcomes[str(response.status_code)] += 1
+                except Exception as exc:
+                    outcomes[LOCKED if LOCKED in str(exc) else type(exc).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        async def reader() -> None:
+            nonlocal reads
+            while writing:
+                try:
+                    response = await client.get('/api/v1/orders/', params={'limit': 20})
+                    reads += response.status_code == 200
+                except Exception as exc:
+                    outcomes[f'чтение: {LOCKED if LOCKED in str(exc) else type(exc).__name__}'] += 1
+
+        readers = [asyncio.create_task(reader()) for _ in range(READERS)]
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(number) for number in range(writers)))
+        elapsed = time.perf_counter() - started
+        writing = False
+        await asyncio.gather(*readers)
+
+    print(
+        f"DB_SQLITE_PROFILE={os.environ.get('DB_SQLITE_PROFILE', 'true'):5} писателей {writers:3}: "
+        f"{outcomes['201'] / elapsed:6.0f} заказов/с, p50 {percentile(latencies, 0.5) * 1000:6.1f} мс, "
+        f"p99 {percentile(latencies, 0.99) * 1000:7.1f} мс, чтений {reads / elapsed:6.0f}/с, "
+        f"{LOCKED}: {outcomes[LOCKED]}, все исходы: {dict(outcomes)}"
+    )
+
+
+async def run_all(writer_counts: list[int], orders_per_writer: int) -> None:
+    # Один цикл событий на все замеры: очередь записи и соединения пула привязаны к циклу
+    for writers in writer_counts:
+        await run(writers, orders_per_writer)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, nargs='+', default=[1, 8, 32], help='количество писателей')
+    parser.add_argument('--orders', type=int, default=50, help='заказов на писателя')
+    parser.add_argument('--profile', choices=['true', 'false'], nargs='+', default=['true', 'false'],
+                        help='значения DB_SQLITE_PROFILE')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not is_file_sqlite(BENCH_DB_URL):
+        sys.exit(f'Бенчмарк требует файловую SQLite в BENCH_DB_URL, задано: {BENCH_DB_URL}')
+    if args.run:
+        asyncio.run(run_all(args.writers, args.orders))
+        return
+    database = Path(make_url(BENCH_DB_URL).database)
+    for profile in args.profile:
+        for path in (database, database.with_name(database.name + '-wal'), database.with_name(database.name + '-shm')):
+            path.unlink(missing_ok=True)
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_writers', '--run', '--orders', str(args.orders),
+             '--writers', *map(str, args.writers)],
+            env={**os.environ, 'DB_SQLITE_PROFILE': profile},
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
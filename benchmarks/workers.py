@@ -0,0 +1,149 @@
+"""Пропускная способность production-сервера (python -m src.server) при разном числе процессов.
+
+Для каждого значения WEB_WORKERS сервер запускается с общим бюджетом соединений
+DB_CONNECTION_BUDGET, который делится между процессами. Нагрузка - постоянное
+число одновременных клиентов: 9 из 10 запросов читают страницу заказов,
+каждый 10-й создает заказ. Выводятся запросы в секунду, задержки, ошибки и
+(для PostgreSQL) наибольшее число соединений сервера с базой за время замера.
+С --reload посередине замера серверу отправляется SIGHUP (поочередный перезапуск процессов).
+
+    BENCH_DB_URL=postgresql+asyncpg://... python -m benchmarks.workers --workers 1 2 4 --budget 20
+"""
+import argparse
+import asyncio
+import os
+import signal
+import time
+from collections import Counter
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.common import api_client, percentile, recreate_database, start_server
+from src.database import engine
+
+PORT = 8766
+DISHES = 50
+ORDERS = 2000
+BATCH_SIZE = 100
+# Процессы сервера начинают принимать соединения не одновременно
+SETTLE_SECONDS = 2
+WRITE_EVERY = 10
+
+
+async def seed() -> None:
+    await recreate_database()
+    async with api_client() as client:
+        for index in range(DISHES):
+            await client.post('/api/v1/dishes/', json={'name': f'Блюдо {index}', 'price': 100, 'category': 'супы'})
+        for first in range(0, ORDERS, BATCH_SIZE):
+            items = [
+                {'customer_name': f'Клиент {index}', 'dish_ids': [1 + index % DISHES, 1 + (index + 1) % DISHES]}
+                for index in range(first, first + BATCH_SIZE)
+            ]
+            (await client.post('/api/v1/orders/batch', json={'items': items})).raise_for_status()
+
+
+async def count_server_connections() -> int | None:
+    """Соединения с базой данных, кроме собственного (только PostgreSQL)."""
+    if engine.dialect.name != 'postgresql':
+        return None
+    async with engine.connect() as conn:
+        return await conn.scalar(text(
+            'SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()'
+        ))
+
+
+async def load(duration: float, concurrency: int, reload_pid: int | None) -> dict:
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    peak_connections = None
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        request_number = 0
+        while time.perf_counter() < deadline:
+            request_number += 1
+            started = time.perf_counter()
+            try:
+                if request_number % WRITE_EVERY == 0:
+                    order = {'customer_name': 'Нагрузка', 'dish_ids': [1, 2]}
+                    response = await client.post('/api/v1/orders/', json=order)
+                else:
+                    response = await client.get('/api/v1/orders/', params={'limit': 20})
+            except httpx.HTTPError as exc:
+                errors[type(exc).__name__] += 1
+                continue
+            if response.is_success:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors[str(response.status_code)] += 1
+
+    async def sample_connections() -> None:
+        nonlocal peak_connections
+        while time.perf_counter() < deadline:
+            connections = await count_server_connections()
+            if connections is None:
+                return
+            peak_connections = max(peak_connections or 0, connections)
+            await asyncio.sleep(0.1)
+
+    async def reload() -> None:
+        await asyncio.sleep(duration / 2)
+        os.kill(reload_pid, signal.SIGHUP)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{PORT}', limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client_loop(client) for _ in range(concurrency)),
+            sample_connections(),
+            *([reload()] if reload_pid is not None else []),
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+        'errors': dict(errors),
+        'peak_connections': peak_connections,
+    }
+
+
+async def run(workers_counts: list[int], budget: int, concurrency: int, duration: float, reload: bool) -> None:
+    # Один цикл событий на подготовку и все замеры: соединения пула привязаны к циклу
+    await seed()
+    for workers in workers_counts:
+        server = start_server(
+            ['-m', 'src.server'], PORT,
+            {'WEB_WORKERS': str(workers), 'WEB_PORT': str(PORT), 'DB_CONNECTION_BUDGET': str(budget)},
+        )
+        try:
+            await asyncio.sleep(SETTLE_SECONDS)
+            result = await load(duration, concurrency, server.pid if reload else None)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+        connections = result['peak_connections']
+        print(
+            f"WEB_WORKERS={workers} DB_CONNECTION_BUDGET={budget}{' +SIGHUP' if reload else ''}: "
+            f"{result['rps']:6.0f} запросов/с, p50 {result['p50']:6.1f} мс, p99 {result['p99']:6.1f} мс, "
+            f"ошибки {result['errors'] or 0}"
+            + (f', соединений с базой не больше {connections}' if connections is not None else '')
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='значения WEB_WORKERS')
+    parser.add_argument('--budget', type=int, default=20, help='DB_CONNECTION_BUDGET на все процессы')
+    parser.add_argument('--concurrency', type=int, default=64, help='одновременных клиентов')
+    parser.add_argument('--duration', type=float, default=15, help='длительность замера, с')
+    parser.add_argument('--reload', action='store_true', help='SIGHUP серверу посередине замера')
+    args = parser.parse_args()
+
+    asyncio.run(run(args.workers, args.budget, args.concurrency, args.duration, args.reload))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Скрипт для проверки использования индексов запросами репозиториев.
+
+Выполняет типовые запросы репозиториев в транзакции, которая затем
+откатывается, перехватывает отправленный в базу SQL и запускает для
+каждого запроса EXPLAIN. Запрос считается проблемным, если план содержит
+полный просмотр таблицы. На PostgreSQL последовательное сканирование
+отключается (enable_seqscan = off), чтобы результат не зависел от объема
+данных: если индекс применим, планировщик обязан его выбрать.
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+
+import orjson
+from sqlalchemy import delete, event
+
+from src.database import async_session_maker, engine
+from src.models import Order
+from src.repositories.dish_repository import DishRepository
+from src.repositories.order_repository import OrderFilters, OrderRepository
+from src.utils.constants import DishCategory, OrderStatus
+
+
+async def run_repository_queries(session) -> None:
+    """Типовые запросы горячих путей."""
+    orders = OrderRepository(session)
+    dishes = DishRepository(session)
+    order_dish = Order.dishes.property.secondary
+
+    await orders.get_page(20, (datetime(2024, 1, 1), 1))
+    await orders.get_dishes_by_order_ids([1, 2, 3])
+    # Чтение вместе с архивом и перенос заказов в архив
+    await orders.get_page(20, (datetime(2024, 1, 1), 1), include_archive=True)
+    await orders.get_dishes_by_order_ids([1, 2, 3], (datetime(2024, 1, 1), datetime(2024, 2, 1)))
+    await orders.get_statuses([1, 2, 3])
+    # Поиск заказов по статусу, клиенту и времени (в обе стороны, с архивом)
+    hour_ago = datetime(2024, 1, 1, 11)
+    await orders.find_page(OrderFilters(status=OrderStatus.PREPARING, time_from=hour_ago), 20)
+    await orders.find_page(OrderFilters(customer_name='Иван'), 20, (datetime(2024, 1, 1), 1), descending=True)
+    await orders.find_page(OrderFilters(time_from=hour_ago, time_to=datetime(2024, 1, 1, 12)), 20, descending=True)
+    await orders.find_page(OrderFilters(customer_name='Иван'), 20, include_archive=True)
+    await orders.estimate_count(OrderFilters(customer_name='Иван'), include_archive=True, limit=1000)
+    # Заказы с блюдом и продажи блюд (по индексу промежуточных таблиц)
+    await orders.find_page_by_dish(1, 20, 5)
+    await orders.find_page_by_dish(1, 20, include_archive=True)
+    await orders.count_by_dish_ids([1, 2, 3], include_archive=True)
+    await orders.archive_finished(OrderStatus.get_final_statuses(), datetime(2024, 1, 1), 100)
+    await dishes.get_page(20, 1)
+    await dishes.get_page(20, 1, DishCategory.SOUPS.value)
+    await dishes.search('борщ укр', 20)
+    await dishes.search('борщ', 20, (0.5, 1), DishCategory.SOUPS.value)
+    await dishes.get_by_ids([1, 2, 3])
+    # Запросы, которые база выполняет при каскадном удалении заказа или блюда
+    await session.execute(delete(order_dish).where(order_dish.c.order_id == 1))
+    await session.execute(delete(order_dish).where(order_dish.c.dish_id == 1))
+
+
+def find_full_scans(dialect: str, plan_rows: list) -> list[str]:
+    """Поиск полных просмотров таблиц в плане запроса."""
+    if dialect == 'postgresql':
+        scans = []
+
+        def walk(node: dict) -> None:
+            if node.get('Node Type') == 'Seq Scan':
+                scans.append(node['Relation Name'])
+            for child in node.get('Plans', []):
+                walk(child)
+
+        plan = plan_rows[0][0]
+        walk((orjson.loads(plan) if isinstance(plan, str) else plan)[0]['Plan'])
+        return scans
+
+    # SQLite: "SCAN <table>" без использования индекса означает полный просмотр.
+    # Просмотр результата подзапроса (CO-ROUTINE/MATERIALIZE) полным просмотром таблицы не является
+    subqueries = {
+        row[-1].split()[1] for row in plan_rows if row[-1].startswith(('CO-ROUTINE ', 'MATERIALIZE '))
+    }
+    return [
+        row[-1] for row in plan_rows
+        if row[-1].startswith('SCAN') and 'INDEX' not in row[-1] and row[-1].split()[1] not in subqueries
+    ]
+
+
+async def main() -> int:
+    print("🔍 Проверка использования индексов запросами репозиториев...")
+
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not statement.lstrip().upper().startswith('EXPLAIN'):
+            captured.append((statement, parameters))
+
+    dialect = engine.dialect.name
+    explain_prefix = 'EXPLAIN (FORMAT JSON) ' if dialect == 'postgresql' else 'EXPLAIN QUERY PLAN '
+
+    failed = 0
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        async with async_session_maker() as session:
+            conn = await session.connection()
+            if dialect == 'postgresql':
+                await conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+            captured.clear()
+            await run_repository_queries(session)
+
+            for statement, parameters in list(captured):
+                result = await conn.exec_driver_sql(explain_prefix + statement, parameters)
+                scans = find_full_scans(dialect, result.all())
+                status = "❌" if scans else "✅"
+                failed += bool(scans)
+                print(f"{status} {' '.join(statement.split())[:100]}")
+                for scan in scans:
+                    print(f"     полный просмотр: {scan}")
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+        await engine.dispose()
+
+    if failed:
+        print(f"❌ Запросов без подходящего индекса: {failed}")
+        return 1
+    print("✅ Все запросы используют индексы")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
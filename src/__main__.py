@@ -1,14 +1,5 @@
 import uvicorn
-from loguru import logger
 
 if __name__ == '__main__':
-    logger.add(
-        'logs.json',
-        format='{time} {level} {message}',
-        level='DEBUG',
-        rotation='10 MB',
-        compression='zip',
-        serialize=True,
-    )
-
-    uvicorn.run(app='src.main:app', host='0.0.0.0', port=8000, reload=True) 
\ No newline at end of file
+    # Логи (в том числе журнал запросов) настраивает приложение при запуске, см. src.utils.logging
+    uvicorn.run(app='src.main:app', host='0.0.0.0', port=8000, reload=True, access_log=False)
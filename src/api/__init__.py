@@ -12,7 +12,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
 
-from src.api.v1.routers import dishes, orders
+from src.api.v1.routers import admin, dishes, orders
+from src.config import settings
 from src.database.database import get_async_session
 from src.metadata import ERRORS_MAP
 from src.schemas.response import BaseResponse
@@ -20,6 +21,8 @@ from src.schemas.response import BaseResponse
 router = APIRouter()
 router.include_router(dishes.router, prefix='/v1', tags=['Dishes | v1'])
 router.include_router(orders.router, prefix='/v1', tags=['Orders | v1'])
+if settings.ADMIN_ENDPOINTS_ENABLED:
+    router.include_router(admin.router, prefix='/v1', tags=['Admin | v1'])
 
 
 @router.get(
@@ -0,0 +1,182 @@
+"""ASGI middleware приложения."""
+import asyncio
+import random
+import time
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.replicas import current_client_id
+from src.utils.metrics import RequestStats, current_request_stats, metrics
+from src.utils.slow_queries import current_request_scope
+
+CLIENT_ID_HEADER = b'x-client-id'
+
+
+class ClientContextMiddleware:
+    """Определяет контекст запроса: идентификатор клиента и маршрут.
+
+    Идентификатор клиента нужен для окна read-your-writes и берется из
+    заголовка X-Client-Id, при его отсутствии - адрес клиента. Scope запроса
+    используется журналом медленных SQL-запросов для определения маршрута.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        client_id = next(
+            (value.decode('latin-1') for name, value in scope['headers'] if name == CLIENT_ID_HEADER), None,
+        )
+        if client_id is None and scope.get('client'):
+            client_id = scope['client'][0]
+
+        token = current_client_id.set(client_id)
+        scope_token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_scope.reset(scope_token)
+            current_client_id.reset(token)
+
+
+class MetricsMiddleware:
+    """Учет длительности запросов, количества и времени SQL-запросов по маршрутам.
+
+    С `server_timing=True` добавляет в ответ заголовок Server-Timing.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append('Server-Timing', stats.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            metrics.observe_request(
+                scope['method'],
+                route.path if route is not None else 'unmatched',
+                status_code,
+                time.perf_counter() - started,
+                stats,
+            )
+            current_request_stats.reset(token)
+
+
+class AccessLogMiddleware:
+    """Выборочный журнал HTTP-запросов.
+
+    Записывается доля `sample_rate` запросов, ответы с ошибкой сервера (5xx)
+    записываются всегда. Для невыбранных запросов запись лога не создается.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500 or random.random() < self.sample_rate:
+                duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                client = scope.get('client')
+                logger.bind(access={
+                    'method': scope['method'],
+                    'path': scope['path'],
+                    'status': status_code,
+                    'duration_ms': duration_ms,
+                    'client': client[0] if client else None,
+                }).info('{} {} {} {} мс', scope['method'], scope['path'], status_code, duration_ms)
+
+
+class InFlightRequests:
+    """Счетчик обрабатываемых HTTP-запросов для корректной остановки приложения."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        # Приложение останавливается: клиентам предлагается закрыть соединения
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def started(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def finished(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def wait_idle(self) -> None:
+        """Ожидание завершения всех запросов (время ожидания ограничивает вызывающий код)."""
+        await self._idle.wait()
+
+
+inflight_requests = InFlightRequests()
+
+
+class InFlightRequestsMiddleware:
+    """Учет обрабатываемых HTTP-запросов в `inflight_requests`.
+
+    Во время остановки добавляет к ответам `Connection: close`, чтобы клиенты
+    не отправляли новые запросы в keep-alive соединения, которые сервер закроет.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start' and inflight_requests.draining:
+                MutableHeaders(scope=message)['Connection'] = 'close'
+            await send(message)
+
+        inflight_requests.started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            inflight_requests.finished()
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Query
+from src.utils.slow_queries import slow_queries
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/slow-queries")
+async def list_slow_queries(limit: int = Query(50, ge=1, le=1000)) -> list[dict]:
+    """Последние медленные SQL-запросы (новые первыми) с маршрутом и планом EXPLAIN."""
+    return slow_queries.recent(limit)
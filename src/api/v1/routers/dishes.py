@@ -1,19 +1,85 @@
-from fastapi import APIRouter, Depends
-from src.api.v1.services.dish_service import DishService
-from src.schemas.dish import DishCreate, DishRead
 from typing import List
 
+from fastapi import APIRouter, Depends, Header, Query, Response
+from src.api.v1.services.dish_service import DishService
+from src.api.v1.services.idempotency_service import IdempotencyService
+from src.api.v1.services.order_service import OrderService
+from src.schemas.dish import DishCreate, DishRead, DishSales
+from src.schemas.order import OrderRead
+from src.schemas.pagination import Page
+from src.utils.cache import etag_matches
+from src.utils.constants import (
+    DEFAULT_PAGE_SIZE,
+    MAX_DISH_SEARCH_LENGTH,
+    MAX_DISH_SALES_BATCH_SIZE,
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    MAX_PAGE_SIZE,
+    DishCategory,
+)
+
 router = APIRouter(prefix="/dishes", tags=["Dishes"])
 
-@router.get("/", response_model=List[DishRead])
-async def list_dishes(dish_service: DishService = Depends()):
-    """Получить список всех блюд."""
-    return await dish_service.get_all_dishes()
+@router.get("/", response_model=Page[DishRead])
+async def list_dishes(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                      cursor: str | None = None,
+                      category: DishCategory | None = None,
+                      q: str | None = Query(None, min_length=1, max_length=MAX_DISH_SEARCH_LENGTH),
+                      if_none_match: str | None = Header(None),
+                      dish_service: DishService = Depends()):
+    """Получить страницу блюд (курсорная пагинация), с `category` - только блюда категории.
+
+    С `q` выполняется поиск по названию и описанию (по началу слов), блюда
+    упорядочены по релевантности. Страницы без `q` кэшируются в памяти процесса
+    и сопровождаются ETag: при совпадении If-None-Match возвращается 304 без
+    обращения к базе данных.
+    """
+    if q is not None:
+        return Response(
+            content=await dish_service.search_dishes(q, limit, cursor, category),
+            media_type="application/json",
+        )
+    cached = await dish_service.get_dishes_page_cached(limit, cursor, category)
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+@router.get("/sales", response_model=List[DishSales])
+async def get_dishes_sales(dish_ids: List[int] = Query(min_length=1, max_length=MAX_DISH_SALES_BATCH_SIZE),
+                           include_archive: bool = False,
+                           order_service: OrderService = Depends()):
+    """Количество заказов и порций для каждого блюда из `dish_ids` (один запрос к базе)."""
+    return await order_service.get_dish_sales(dish_ids, include_archive)
+
+@router.get("/{dish_id}/orders", response_model=Page[OrderRead])
+async def list_dish_orders(dish_id: int,
+                           limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           cursor: str | None = None,
+                           include_archive: bool = False,
+                           order_service: OrderService = Depends()):
+    """Получить страницу заказов с блюдом (по возрастанию ID заказа), с `include_archive` - вместе с архивными."""
+    return Response(
+        content=await order_service.get_dish_orders_page(dish_id, limit, cursor, include_archive),
+        media_type="application/json",
+    )
 
 @router.post("/", response_model=DishRead, status_code=201)
-async def create_dish(dish: DishCreate, dish_service: DishService = Depends()):
-    """Добавить новое блюдо."""
-    return await dish_service.create_dish(dish)
+async def create_dish(dish: DishCreate,
+                      idempotency_key: str | None = Header(None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH),
+                      dish_service: DishService = Depends(),
+                      idempotency_service: IdempotencyService = Depends()):
+    """Добавить новое блюдо (с заголовком Idempotency-Key повтор возвращает исходный ответ)."""
+    if idempotency_key is None:
+        return await dish_service.create_dish(dish)
+    stored, replayed = await idempotency_service.execute(
+        "dishes", idempotency_key, dish, lambda: dish_service.create_dish(dish), DishRead, 201,
+    )
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None,
+    )
 
 @router.delete("/{dish_id}", status_code=204)
 async def delete_dish(dish_id: int, dish_service: DishService = Depends()):
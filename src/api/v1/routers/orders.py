@@ -1,19 +1,110 @@
-from fastapi import APIRouter, Depends
-from src.api.v1.services.order_service import OrderService
-from src.schemas.order import OrderCreate, OrderRead, OrderStatusUpdate
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from src.api.v1.services.idempotency_service import IdempotencyService
+from src.api.v1.services.order_service import OrderService, order_events
+from src.schemas.order import (
+    OrderBatchCreate,
+    OrderBatchItemResult,
+    OrderBulkStatusResult,
+    OrderBulkStatusUpdate,
+    OrderCreate,
+    OrderRead,
+    OrderStatusUpdate,
+)
+from src.schemas.pagination import EstimatedPage, Page
+from src.utils.constants import (
+    DEFAULT_PAGE_SIZE,
+    MAX_CUSTOMER_NAME_LENGTH,
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    MAX_PAGE_SIZE,
+    OrderSort,
+    OrderStatus,
+)
+from datetime import datetime
 from typing import List
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
-@router.get("/", response_model=List[OrderRead])
-async def list_orders(order_service: OrderService = Depends()):
-    """Получить список всех заказов."""
-    return await order_service.get_all_orders()
+@router.get("/", response_model=Page[OrderRead])
+async def list_orders(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                      cursor: str | None = None,
+                      include_archive: bool = False,
+                      order_service: OrderService = Depends()):
+    """Получить страницу заказов (курсорная пагинация), с `include_archive` - вместе с архивными."""
+    return Response(
+        content=await order_service.get_orders_page(limit, cursor, include_archive),
+        media_type="application/json",
+    )
+
+@router.get("/search", response_model=EstimatedPage[OrderRead])
+async def search_orders(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                        cursor: str | None = None,
+                        status: OrderStatus | None = None,
+                        customer_name: str | None = Query(None, min_length=1, max_length=MAX_CUSTOMER_NAME_LENGTH),
+                        time_from: datetime | None = None,
+                        time_to: datetime | None = None,
+                        sort: OrderSort = OrderSort.OLDEST,
+                        include_archive: bool = False,
+                        order_service: OrderService = Depends()):
+    """Найти заказы по статусу, имени клиента и времени заказа [time_from, time_to).
+
+    `sort=-order_time` - сначала новые заказы. Первая страница содержит
+    приблизительное общее количество найденных заказов (`total_estimate`).
+    """
+    return Response(
+        content=await order_service.search_orders(
+            limit, cursor, status, customer_name, time_from, time_to, sort, include_archive,
+        ),
+        media_type="application/json",
+    )
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_orders(include_archive: bool = False, order_service: OrderService = Depends()):
+    """Выгрузить все заказы с блюдами в формате NDJSON (потоковая передача)."""
+    return StreamingResponse(
+        order_service.export_orders(include_archive=include_archive), media_type="application/x-ndjson",
+    )
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_order_events():
+    """Поток событий заказов (Server-Sent Events): создание, смена статуса, удаление."""
+    return StreamingResponse(
+        order_events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("/", response_model=OrderRead, status_code=201)
-async def create_order(order: OrderCreate, order_service: OrderService = Depends()):
-    """Создать новый заказ (статус по умолчанию 'в обработке')."""
-    return await order_service.create_order(order)
+async def create_order(order: OrderCreate,
+                       idempotency_key: str | None = Header(None, max_length=MAX_IDEMPOTENCY_KEY_LENGTH),
+                       order_service: OrderService = Depends(),
+                       idempotency_service: IdempotencyService = Depends()):
+    """Создать новый заказ (статус по умолчанию 'в обработке').
+
+    С заголовком Idempotency-Key повтор запроса возвращает исходный ответ
+    без создания нового заказа.
+    """
+    if idempotency_key is None:
+        return await order_service.create_order(order)
+    stored, replayed = await idempotency_service.execute(
+        "orders", idempotency_key, order, lambda: order_service.create_order(order), OrderRead, 201,
+    )
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None,
+    )
+
+@router.post("/batch", response_model=List[OrderBatchItemResult])
+async def create_orders_batch(batch: OrderBatchCreate, order_service: OrderService = Depends()):
+    """Создать несколько заказов за один запрос (результат по каждому заказу)."""
+    return await order_service.create_orders_batch(batch.items)
+
+@router.patch("/status", response_model=OrderBulkStatusResult)
+async def update_orders_status(status_update: OrderBulkStatusUpdate, order_service: OrderService = Depends()):
+    """Изменить статус нескольких заказов (недопустимые переходы отклоняются с причиной)."""
+    return await order_service.update_orders_status(status_update.order_ids, status_update.status)
 
 @router.delete("/{order_id}", status_code=204)
 async def delete_order(order_id: int, order_service: OrderService = Depends()):
@@ -1,24 +1,98 @@
 """Сервис для работы с блюдами."""
+import orjson
 from fastapi import Depends
-from src.schemas.dish import DishCreate
+from src.config import settings
+from src.schemas.dish import DishCreate, DishRead
+from src.schemas.pagination import Page
+from src.utils.cache import CachedResponse, VersionedResponseCache
+from src.utils.catalog import CatalogDish, DishCatalogIndex
 from src.utils.service import BaseService, UnitOfWork, transaction_mode
+from src.utils.pagination import cursor_value, decode_cursor, encode_cursor
+from src.utils.constants import DishCategory
 from src.models.dish import Dish
 
 
+# Кэш сериализованных страниц меню, сбрасывается при любом изменении блюд
+menu_cache = VersionedResponseCache(ttl=settings.MENU_CACHE_TTL, max_entries=settings.MENU_CACHE_MAX_ENTRIES)
+
+# Снимок каталога блюд для проверки заказов, перестраивается после изменения блюд
+dish_catalog = DishCatalogIndex(ttl=settings.DISH_CATALOG_TTL, min_refresh_interval=settings.DISH_CATALOG_MIN_REFRESH)
+
+
 class DishService(BaseService):
     """Сервис для управления блюдами."""
     
     _repo = "dishes"
 
-    @transaction_mode
+    @transaction_mode(readonly=True)
     async def get_all_dishes(self) -> list[Dish]:
         """Получение всех блюд."""
         return await self.uow.dishes.get_all()
 
+    @transaction_mode(readonly=True)
+    async def get_dishes_page(
+            self, limit: int, cursor: str | None = None, category: DishCategory | None = None,
+    ) -> dict:
+        """Получение страницы блюд, упорядоченных по id (с `category` - только блюд категории)."""
+        after_id = None
+        if cursor is not None:
+            (after_id,) = decode_cursor(cursor, 1)
+            cursor_value(after_id, int)
+
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        dishes = await self.uow.dishes.get_page(limit + 1, after_id, category.value if category else None)
+        next_cursor = None
+        if len(dishes) > limit:
+            dishes = dishes[:limit]
+            next_cursor = encode_cursor(dishes[-1].id)
+        return {"items": dishes, "next_cursor": next_cursor}
+
+    async def get_dishes_page_cached(
+            self, limit: int, cursor: str | None = None, category: DishCategory | None = None,
+    ) -> CachedResponse:
+        """Получение сериализованной страницы блюд из кэша меню.
+
+        При попадании в кэш не открывает транзакцию и не выполняет сериализацию.
+        """
+        key = (limit, cursor, category)
+        cached = menu_cache.get(key)
+        if cached is not None:
+            return cached
+
+        version = menu_cache.version
+        page = await self.get_dishes_page(limit, cursor, category)
+        body = orjson.dumps(Page[DishRead].model_validate(page).model_dump())
+        return menu_cache.set(key, version, body)
+
+    @transaction_mode(readonly=True)
+    async def search_dishes(
+            self, query: str, limit: int, cursor: str | None = None, category: DishCategory | None = None,
+    ) -> bytes:
+        """Поиск блюд по названию и описанию: страница в формате Page[DishRead].
+
+        Блюда упорядочены по убыванию релевантности, курсор - ключ (релевантность, id)
+        последнего блюда. Результаты поиска не кэшируются: запросы слишком разнообразны.
+        """
+        after = None
+        if cursor is not None:
+            rank, dish_id = decode_cursor(cursor, 2)
+            after = (float(cursor_value(rank, int, float)), cursor_value(dish_id, int))
+
+        rows = await self.uow.dishes.search(query, limit + 1, after, category.value if category else None)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id)
+        page = {"items": [dish for dish, _ in rows], "next_cursor": next_cursor}
+        return orjson.dumps(Page[DishRead].model_validate(page).model_dump())
+
     @transaction_mode
     async def create_dish(self, dish_data: DishCreate) -> Dish:
         """Создание нового блюда."""
-        return await self.uow.dishes.create_from_schema(dish_data)
+        dish = await self.uow.dishes.create_from_schema(dish_data)
+        self.uow.add_after_commit(menu_cache.bump)
+        self.uow.add_after_commit(dish_catalog.bump)
+        return dish
 
     @transaction_mode
     async def delete_dish(self, dish_id: int) -> bool:
@@ -26,9 +100,30 @@ class DishService(BaseService):
         success = await self.uow.dishes.delete_by_id(dish_id)
         if not success:
             self.check_existence(None, "Блюдо не найдено")
+        self.uow.add_after_commit(menu_cache.bump)
+        self.uow.add_after_commit(dish_catalog.bump)
         return success
 
     @transaction_mode
     async def get_dishes_by_ids(self, dish_ids: list[int]) -> list[Dish]:
         """Получение блюд по списку ID."""
-        return await self.uow.dishes.get_by_ids(dish_ids) 
\ No newline at end of file
+        return await self.uow.dishes.get_by_ids(dish_ids)
+
+    async def find_dishes(self, dish_ids: list[int]) -> dict[int, CatalogDish | Dish]:
+        """Поиск блюд по списку ID для проверки заказа.
+
+        Блюда берутся из снимка каталога в памяти, база данных читается только
+        при перестроении снимка. С DISH_CATALOG_TTL=0 блюда читаются запросом к базе.
+
+        Returns:
+            Найденные блюда по ID (отсутствующие ID пропускаются)
+        """
+        if settings.DISH_CATALOG_TTL <= 0:
+            return {dish.id: dish for dish in await self.get_dishes_by_ids(dish_ids)}
+        catalog = await dish_catalog.get(self._load_catalog_rows, dish_ids)
+        return catalog.get_many(dish_ids)
+
+    @transaction_mode
+    async def _load_catalog_rows(self) -> list[tuple[int, str, float, str]]:
+        # Каталог читается с основной базы: по нему проверяются записи
+        return await self.uow.dishes.get_catalog_rows()
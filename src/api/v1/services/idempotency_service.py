@@ -0,0 +1,132 @@
+"""Сервис для выполнения запросов с ключами идемпотентности."""
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from src.config import settings
+from src.utils.constants import IDEMPOTENCY_KEY_REUSED_MSG
+from src.utils.idempotency import IdempotencyCache, StoredResponse, request_fingerprint, utcnow
+from src.utils.service import BaseService, transaction_mode
+
+
+# Кэш ответов по ключам идемпотентности в памяти процесса
+idempotency_cache = IdempotencyCache(max_entries=settings.IDEMPOTENCY_CACHE_MAX_ENTRIES)
+
+
+class IdempotencyKeyTakenError(Exception):
+    """Ключ сохранен конкурентным запросом (в другом процессе) во время выполнения."""
+
+
+class IdempotencyService(BaseService):
+    """Сервис для повторяемых запросов с заголовком Idempotency-Key.
+
+    Первый запрос с ключом выполняет обработчик и в той же транзакции сохраняет
+    сериализованный ответ. Повторы получают сохраненный ответ без повторного
+    выполнения; конкурентные повторы в том же процессе ждут первый запрос.
+    Ошибочные ответы не сохраняются.
+    """
+
+    _repo = "idempotency_keys"
+
+    async def execute(
+            self,
+            scope: str,
+            key: str,
+            request_data: BaseModel,
+            handler: Callable[[], Awaitable[Any]],
+            response_model: type[BaseModel],
+            status_code: int,
+    ) -> tuple[StoredResponse, bool]:
+        """Выполнение запроса с ключом идемпотентности.
+
+        Args:
+            scope: область действия ключа (эндпоинт)
+            key: значение заголовка Idempotency-Key
+            request_data: тело запроса
+            handler: обработчик запроса (выполняется в общей транзакции)
+            response_model: схема ответа для сериализации результата обработчика
+            status_code: код успешного ответа
+
+        Returns:
+            Ответ и признак того, что он был сохранен ранее (повтор)
+        """
+        request_hash = request_fingerprint(request_data)
+        cache_key = (scope, key)
+        while True:
+            stored = idempotency_cache.get(cache_key)
+            if stored is not None:
+                replayed = True
+                break
+            inflight = idempotency_cache.inflight(cache_key)
+            if inflight is None:
+                stored, replayed = await self._execute_once(
+                    scope, key, request_hash, handler, response_model, status_code,
+                )
+                break
+            # Ждем первый запрос: при успехе ответ появится в кэше, при ошибке выполняем сами
+            await inflight.wait()
+
+        if stored.request_hash != request_hash:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=IDEMPOTENCY_KEY_REUSED_MSG)
+        return stored, replayed
+
+    async def _execute_once(
+            self,
+            scope: str,
+            key: str,
+            request_hash: str,
+            handler: Callable[[], Awaitable[Any]],
+            response_model: type[BaseModel],
+            status_code: int,
+    ) -> tuple[StoredResponse, bool]:
+        cache_key = (scope, key)
+        idempotency_cache.start(cache_key)
+        try:
+            try:
+                stored, replayed = await self._load_or_run(
+                    scope, key, request_hash, handler, response_model, status_code,
+                )
+            except IdempotencyKeyTakenError:
+                # Транзакция откатилась, ответ конкурентного запроса уже сохранен в базе
+                stored, replayed = await self._load_or_run(
+                    scope, key, request_hash, handler, response_model, status_code,
+                )
+            idempotency_cache.put(cache_key, stored)
+            return stored, replayed
+        finally:
+            idempotency_cache.finish(cache_key)
+
+    @transaction_mode
+    async def _load_or_run(
+            self,
+            scope: str,
+            key: str,
+            request_hash: str,
+            handler: Callable[[], Awaitable[Any]],
+            response_model: type[BaseModel],
+            status_code: int,
+    ) -> tuple[StoredResponse, bool]:
+        """Чтение сохраненного ответа или выполнение обработчика с сохранением ответа."""
+        now = utcnow()
+        saved = await self.uow.idempotency_keys.get_active(scope, key, now)
+        if saved is not None:
+            return StoredResponse(saved.request_hash, saved.status_code, saved.response, saved.expires_at), True
+
+        result = await handler()
+        stored = StoredResponse(
+            request_hash=request_hash,
+            status_code=status_code,
+            body=orjson.dumps(response_model.model_validate(result).model_dump(mode="json")),
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_TTL),
+        )
+        if not await self.uow.idempotency_keys.save(
+                scope, key, stored.request_hash, stored.status_code, stored.body, stored.expires_at, now,
+        ):
+            raise IdempotencyKeyTakenError
+
+        if idempotency_cache.cleanup_due(settings.IDEMPOTENCY_CLEANUP_INTERVAL):
+            await self.uow.idempotency_keys.delete_expired(now)
+        return stored, False
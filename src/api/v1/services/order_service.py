@@ -1,18 +1,40 @@
 """Сервис для работы с заказами."""
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import orjson
 from fastapi import HTTPException, status, Depends
-from src.schemas.order import OrderCreate
+from sqlalchemy.exc import IntegrityError
+from src.config import settings
+from src.schemas.order import OrderCreate, OrderBatchItemResult, OrderRead
 from src.utils.service import BaseService, UnitOfWork, transaction_mode
-from src.models.order import Order
-from src.api.v1.services.dish_service import DishService
+from src.repositories.order_repository import OrderFilters
+from src.api.v1.services.dish_service import DishService, dish_catalog
+from src.utils.events import EventHub
+from src.utils.idempotency import utcnow
+from src.utils.pagination import cursor_value, decode_cursor, encode_cursor
 from src.utils.constants import (
+    DISH_NOT_FOUND_MSG,
+    EXPORT_CHUNK_SIZE,
+    INVALID_CURSOR_MSG,
+    ORDER_COUNT_LIMIT,
+    ORDER_DISHES_NOT_FOUND_MSG,
     ORDER_NOT_FOUND_MSG,
     ORDER_CANNOT_BE_CANCELLED_MSG,
     ORDER_INVALID_STATUS_TRANSITION_MSG,
+    OrderSort,
     OrderStatus,
     ORDER_EMPTY_DISHES_MSG
 )
 
 
+# События заказов для экранов кухни и курьеров, публикуются после подтверждения транзакции
+order_events = EventHub(queue_size=settings.ORDER_EVENTS_QUEUE_SIZE, heartbeat=settings.ORDER_EVENTS_HEARTBEAT)
+
+
 # Карта последовательности статусов заказа: текущий -> следующий допустимый
 _next_status = {
     "в обработке": "готовится",
@@ -21,6 +43,38 @@ _next_status = {
 }
 
 
+def _decode_order_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """Ключ (order_time, id) из курсора страницы заказов."""
+    if cursor is None:
+        return None
+    order_time, order_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(cursor_value(order_time, str)), cursor_value(order_id, int)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=INVALID_CURSOR_MSG)
+
+
+def _all_dishes_found(dishes: dict[int, Any], dish_ids: list[int]) -> bool:
+    """Все ли блюда заказа найдены (повтор ID блюда - несколько порций, а не ошибка)."""
+    return all(dish_id in dishes for dish_id in dish_ids)
+
+
+def _as_naive_utc(value: datetime | None) -> datetime | None:
+    """Время с часовым поясом в UTC без пояса (как хранится в базе), время без пояса - как есть."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _transition_error(current_status: str) -> str:
+    """Сообщение о недопустимом переходе из текущего статуса."""
+    # Получаем список допустимых статусов для более информативной ошибки
+    valid_transitions = OrderStatus.get_valid_transitions().get(current_status, [])
+    if valid_transitions:
+        return f"Из статуса '{current_status}' можно перейти только к: {', '.join(valid_transitions)}"
+    return f"Статус '{current_status}' является финальным и не может быть изменен"
+
+
 class OrderService(BaseService):
     """Сервис для управления заказами."""
     
@@ -30,62 +84,285 @@ class OrderService(BaseService):
         super().__init__(uow)
         self.dish_service = dish_service
 
-    @transaction_mode
-    async def get_all_orders(self) -> list[Order]:
+    @transaction_mode(readonly=True)
+    async def get_all_orders(self) -> list[dict[str, Any]]:
         """Получение всех заказов."""
         return await self.uow.orders.get_all()
 
-    @transaction_mode
-    async def create_order(self, order_data: OrderCreate) -> Order:
-        """Создание нового заказа."""
-        # Проверяем существование всех блюд по переданным dish_ids
-        dishes = await self.dish_service.get_dishes_by_ids(order_data.dish_ids)
-        if len(dishes) != len(order_data.dish_ids):
+    @transaction_mode(readonly=True)
+    async def get_orders_page(self, limit: int, cursor: str | None = None, include_archive: bool = False) -> bytes:
+        """Получение страницы заказов, упорядоченных по (order_time, id).
+
+        Страница сразу сериализуется в JSON (формат Page[OrderRead]) без
+        ORM-объектов и валидации pydantic: это самый нагруженный список.
+        С `include_archive=True` в список попадают и архивные заказы.
+        """
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        orders = await self.uow.orders.get_page(limit + 1, _decode_order_cursor(cursor), include_archive)
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1]["order_time"], orders[-1]["id"])
+        return orjson.dumps({"items": orders, "next_cursor": next_cursor})
+
+    @transaction_mode(readonly=True)
+    async def search_orders(
+            self,
+            limit: int,
+            cursor: str | None = None,
+            order_status: OrderStatus | None = None,
+            customer_name: str | None = None,
+            time_from: datetime | None = None,
+            time_to: datetime | None = None,
+            sort: OrderSort = OrderSort.OLDEST,
+            include_archive: bool = False,
+    ) -> bytes:
+        """Поиск заказов по статусу, имени клиента и диапазону времени [time_from, time_to).
+
+        Страница сериализуется в JSON в формате EstimatedPage[OrderRead]. Первая
+        страница (без курсора) содержит приблизительное общее количество заказов
+        `total_estimate`, на следующих оно не вычисляется. Архив просматривается
+        только без фильтра по статусу или для финальных статусов: других в нем нет.
+        """
+        filters = OrderFilters(
+            status=order_status.value if order_status is not None else None,
+            customer_name=customer_name,
+            time_from=_as_naive_utc(time_from),
+            time_to=_as_naive_utc(time_to),
+        )
+        if order_status is not None and order_status not in OrderStatus.get_final_statuses():
+            include_archive = False
+
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        orders = await self.uow.orders.find_page(
+            filters, limit + 1, _decode_order_cursor(cursor), sort is OrderSort.NEWEST, include_archive,
+        )
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1]["order_time"], orders[-1]["id"])
+
+        total_estimate = None
+        if cursor is None:
+            total_estimate = await self.uow.orders.estimate_count(filters, include_archive, ORDER_COUNT_LIMIT)
+        return orjson.dumps({"items": orders, "next_cursor": next_cursor, "total_estimate": total_estimate})
+
+    @transaction_mode(readonly=True)
+    async def get_dish_orders_page(
+            self, dish_id: int, limit: int, cursor: str | None = None, include_archive: bool = False,
+    ) -> bytes:
+        """Получение страницы заказов с блюдом, упорядоченных по id (формат Page[OrderRead]).
+
+        Raises:
+            HTTPException: 404, если блюдо не найдено
+        """
+        after_id = None
+        if cursor is not None:
+            (after_id,) = decode_cursor(cursor, 1)
+            cursor_value(after_id, int)
+        # Связи удаленного блюда остаются в архиве, поэтому блюдо проверяется до чтения заказов
+        dish = await self.uow.dishes.get_by_filter_one_or_none(id=dish_id)
+        self.check_existence(dish, DISH_NOT_FOUND_MSG)
+
+        # Запрашиваем на одну запись больше, чтобы узнать, есть ли следующая страница
+        orders = await self.uow.orders.find_page_by_dish(dish_id, limit + 1, after_id, include_archive)
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1]["id"])
+        return orjson.dumps({"items": orders, "next_cursor": next_cursor})
+
+    @transaction_mode(readonly=True)
+    async def get_dish_sales(self, dish_ids: list[int], include_archive: bool = False) -> list[dict[str, int]]:
+        """Количество заказов и порций по каждому блюду из списка (один запрос).
+
+        Результат содержит все переданные ID в исходном порядке, без повторов;
+        для блюд без заказов и неизвестных ID счетчики равны нулю.
+        """
+        dish_ids = list(dict.fromkeys(dish_ids))
+        sales = await self.uow.orders.count_by_dish_ids(dish_ids, include_archive)
+        result = []
+        for dish_id in dish_ids:
+            orders, portions = sales.get(dish_id, (0, 0))
+            result.append({"dish_id": dish_id, "orders": orders, "portions": portions})
+        return result
+
+    async def export_orders(
+            self, chunk_size: int = EXPORT_CHUNK_SIZE, include_archive: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """Потоковая выгрузка всех заказов с блюдами в формате NDJSON.
+
+        Генератор сам открывает UnitOfWork, так как выполняется уже после
+        возврата из обработчика запроса, во время отправки ответа.
+        """
+        self.uow.readonly = True
+        async with self.uow:
+            async for orders in self.uow.orders.stream_with_dishes(chunk_size, include_archive):
+                yield b"".join(orjson.dumps(order, option=orjson.OPT_APPEND_NEWLINE) for order in orders)
+
+    async def create_order(self, order_data: OrderCreate) -> dict[str, Any]:
+        """Создание нового заказа.
+
+        Блюда проверяются по снимку каталога до открытия транзакции: заказ
+        с несуществующими блюдами отклоняется без обращения к базе данных.
+        """
+        dishes = await self.dish_service.find_dishes(order_data.dish_ids)
+        if not _all_dishes_found(dishes, order_data.dish_ids):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Некоторые из указанных блюд не существуют"
+                detail=ORDER_DISHES_NOT_FOUND_MSG
             )
-        
+        return await self._insert_order(order_data.customer_name, [dishes[dish_id] for dish_id in order_data.dish_ids])
+
+    @transaction_mode
+    async def _insert_order(self, customer_name: str, dishes: list[Any]) -> dict[str, Any]:
         # Создаем заказ через репозиторий (статус автоматически будет OrderStatus.PROCESSING)
-        new_order = await self.uow.orders.create_with_dishes(order_data.customer_name, dishes)
+        with self._dishes_deleted_guard():
+            new_order = await self.uow.orders.create_with_dishes(customer_name, dishes)
+        self._publish_after_commit("order_created", OrderRead.model_validate(new_order).model_dump())
         return new_order
 
+    async def create_orders_batch(self, orders_data: list[OrderCreate]) -> list[OrderBatchItemResult]:
+        """Пакетное создание заказов с отдельным результатом для каждого заказа.
+
+        Все блюда проверяются по снимку каталога, заказы с несуществующими блюдами
+        отклоняются, остальные создаются массовой вставкой.
+        """
+        dish_ids = list({dish_id for order_data in orders_data for dish_id in order_data.dish_ids})
+        dishes = await self.dish_service.find_dishes(dish_ids)
+
+        results: list[OrderBatchItemResult | None] = [None] * len(orders_data)
+        valid: list[tuple[int, OrderCreate]] = []
+        for index, order_data in enumerate(orders_data):
+            if _all_dishes_found(dishes, order_data.dish_ids):
+                valid.append((index, order_data))
+            else:
+                results[index] = OrderBatchItemResult(index=index, success=False, error=ORDER_DISHES_NOT_FOUND_MSG)
+        if valid:
+            await self._insert_orders_batch(valid, dishes, results)
+        return results
+
+    @transaction_mode
+    async def _insert_orders_batch(
+            self,
+            valid: list[tuple[int, OrderCreate]],
+            dishes: dict[int, Any],
+            results: list[OrderBatchItemResult | None],
+    ) -> None:
+        with self._dishes_deleted_guard():
+            created = await self.uow.orders.bulk_create_with_dishes(
+                [(order_data.customer_name, order_data.dish_ids) for _, order_data in valid]
+            )
+        for (index, order_data), order in zip(valid, created, strict=True):
+            order["dishes"] = [dishes[dish_id] for dish_id in order_data.dish_ids]
+            results[index] = OrderBatchItemResult(index=index, success=True, order=order)
+            self._publish_after_commit("order_created", results[index].order.model_dump())
+
+    @staticmethod
+    @contextmanager
+    def _dishes_deleted_guard() -> Iterator[None]:
+        """Отклонение заказа, если блюдо удалено после построения снимка каталога.
+
+        Снимок может не знать об удалении блюда другим процессом: вставку тогда
+        отклоняет внешний ключ order_dish, а снимок перестраивается.
+        """
+        try:
+            yield
+        except IntegrityError:
+            dish_catalog.bump()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=ORDER_DISHES_NOT_FOUND_MSG)
+
     @transaction_mode
     async def delete_order(self, order_id: int) -> None:
-        """Удаление заказа по ID (только в статусе 'в обработке')."""
-        order = await self.uow.orders.get_by_id(order_id)
-        self.check_existence(order, ORDER_NOT_FOUND_MSG)
-        
-        if not OrderStatus.can_be_cancelled(order.status):
+        """Удаление заказа по ID (только в статусах, допускающих отмену).
+
+        Проверка статуса выполняется в условии DELETE. Заказ читается
+        только при неудаче, чтобы отличить отсутствующий заказ от неподходящего статуса.
+        """
+        deleted = await self.uow.orders.delete_by_id(order_id, OrderStatus.get_cancellable_statuses())
+        if not deleted:
+            current_statuses = await self.uow.orders.get_statuses([order_id])
+            self.check_existence(current_statuses, ORDER_NOT_FOUND_MSG)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=ORDER_CANNOT_BE_CANCELLED_MSG
             )
         
-        # Удаляем заказ
-        await self.uow.orders.delete_by_id(order_id)
+        self._publish_after_commit("order_deleted", {"id": order_id})
 
     @transaction_mode
-    async def update_order_status(self, order_id: int, new_status: str) -> Order:
-        """Обновление статуса заказа."""
-        order = await self.uow.orders.get_by_id(order_id)
-        self.check_existence(order, ORDER_NOT_FOUND_MSG)
-        
-        # Проверяем допустимость перехода статуса
-        current_status = order.status
-        if not OrderStatus.can_transition(current_status, new_status):
-            # Получаем список допустимых статусов для более информативной ошибки
-            valid_transitions = OrderStatus.get_valid_transitions().get(current_status, [])
-            if valid_transitions:
-                detail = f"Из статуса '{current_status}' можно перейти только к: {', '.join(valid_transitions)}"
-            else:
-                detail = f"Статус '{current_status}' является финальным и не может быть изменен"
-                
+    async def update_order_status(self, order_id: int, new_status: str) -> dict[str, Any]:
+        """Обновление статуса заказа.
+
+        Допустимость перехода проверяется в условии UPDATE (compare-and-set).
+        Текущий статус читается только при неудаче, чтобы отличить
+        отсутствующий заказ от недопустимого перехода.
+        """
+        allowed_from = OrderStatus.get_allowed_predecessors(new_status)
+        updated_order = await self.uow.orders.update_status(order_id, new_status, allowed_from)
+        if updated_order is None:
+            current_statuses = await self.uow.orders.get_statuses([order_id])
+            self.check_existence(current_statuses, ORDER_NOT_FOUND_MSG)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=detail
+                detail=_transition_error(current_statuses[order_id])
             )
-        
-        # Обновляем статус через репозиторий
-        updated_order = await self.uow.orders.update_status(order, new_status)
-        return updated_order 
\ No newline at end of file
+
+        self._publish_after_commit("order_status_changed", {"id": order_id, "status": new_status})
+        return updated_order
+
+    @transaction_mode
+    async def update_orders_status(self, order_ids: list[int], new_status: str) -> dict[str, Any]:
+        """Смена статуса нескольких заказов одним условным UPDATE.
+
+        Допустимость перехода проверяется в самом запросе по списку статусов-предшественников.
+        Причины отказа определяются дополнительным запросом только для неизмененных заказов.
+        """
+        order_ids = list(dict.fromkeys(order_ids))
+        allowed_from = OrderStatus.get_allowed_predecessors(new_status)
+        updated = await self.uow.orders.update_status_where_allowed(order_ids, new_status, allowed_from)
+
+        updated_ids = set(updated)
+        rejected_ids = [order_id for order_id in order_ids if order_id not in updated_ids]
+        current_statuses = await self.uow.orders.get_statuses(rejected_ids)
+        rejected = [
+            {
+                "id": order_id,
+                "reason": (
+                    ORDER_NOT_FOUND_MSG if order_id not in current_statuses
+                    else _transition_error(current_statuses[order_id])
+                ),
+            }
+            for order_id in rejected_ids
+        ]
+
+        for order_id in updated:
+            self._publish_after_commit("order_status_changed", {"id": order_id, "status": new_status})
+        return {"updated": updated, "rejected": rejected}
+
+    async def archive_finished_orders(self, older_than_days: float, chunk_size: int, pause: float = 0) -> int:
+        """Перенос в архив заказов в финальных статусах старше `older_than_days` дней.
+
+        Каждая пачка из `chunk_size` заказов переносится в отдельной транзакции,
+        между пачками выдерживается пауза `pause` секунд, чтобы не нагружать базу.
+
+        Returns:
+            Количество перенесенных заказов
+        """
+        older_than = utcnow() - timedelta(days=older_than_days)
+        total = 0
+        while True:
+            moved = await self._archive_chunk(older_than, chunk_size)
+            total += moved
+            if moved < chunk_size:
+                return total
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+    @transaction_mode
+    async def _archive_chunk(self, older_than: datetime, chunk_size: int) -> int:
+        return await self.uow.orders.archive_finished(OrderStatus.get_final_statuses(), older_than, chunk_size)
+
+    def _publish_after_commit(self, event: str, data: dict[str, Any]) -> None:
+        """Публикация события заказа после успешного подтверждения транзакции."""
+        self.uow.add_after_commit(lambda: order_events.publish(event, data)) 
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Перенос завершенных и отмененных заказов в архив.
+
+Запуск (например, по расписанию cron): `python -m src.archive [--days N] [--chunk-size N]`.
+"""
+import argparse
+import asyncio
+import time
+
+from loguru import logger
+
+from src.api.v1.services.dish_service import DishService
+from src.api.v1.services.order_service import OrderService
+from src.config import settings
+from src.database import engine, replica_engines
+from src.utils.unit_of_work import UnitOfWork
+
+
+async def archive_orders(older_than_days: float, chunk_size: int, pause: float) -> int:
+    uow = UnitOfWork()
+    order_service = OrderService(uow, DishService(uow))
+    try:
+        return await order_service.archive_finished_orders(older_than_days, chunk_size, pause)
+    finally:
+        for db_engine in (engine, *replica_engines):
+            await db_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Перенос заказов в финальных статусах в архив')
+    parser.add_argument('--days', type=float, default=settings.ARCHIVE_AFTER_DAYS, help='возраст заказа в днях')
+    parser.add_argument('--chunk-size', type=int, default=settings.ARCHIVE_CHUNK_SIZE, help='заказов в транзакции')
+    parser.add_argument('--pause', type=float, default=settings.ARCHIVE_CHUNK_PAUSE, help='пауза между пачками, с')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    moved = asyncio.run(archive_orders(args.days, args.chunk_size, args.pause))
+    logger.info('Перенесено в архив заказов: {} за {:.1f} с', moved, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
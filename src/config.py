@@ -25,7 +25,95 @@ class Settings:
     DB_ECHO: bool = bool(os.environ.get('DB_ECHO', False))
     DB_POOL_SIZE: int = int(os.environ.get('DB_POOL_SIZE', '50'))
     DB_MAX_OVERFLOW: int = int(os.environ.get('DB_MAX_OVERFLOW', '100'))
+    # Профиль файловой SQLite: WAL, одно соединение записи с очередью транзакций
+    # и отдельный пул соединений чтения; busy_timeout в миллисекундах, mmap_size в байтах
+    DB_SQLITE_PROFILE: bool = os.environ.get('DB_SQLITE_PROFILE', 'true').lower() in ('1', 'true', 'yes')
+    DB_SQLITE_READERS: int = int(os.environ.get('DB_SQLITE_READERS', '4'))
+    DB_SQLITE_BUSY_TIMEOUT: int = int(os.environ.get('DB_SQLITE_BUSY_TIMEOUT', '5000'))
+    DB_SQLITE_MMAP_SIZE: int = int(os.environ.get('DB_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    # Размер кэша подготовленных выражений asyncpg на соединение (0 - выключен)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(os.environ.get('DB_PREPARED_STATEMENT_CACHE_SIZE', '500'))
+    # Количество соединений пула, открываемых при запуске приложения
+    DB_POOL_WARMUP: int = int(os.environ.get('DB_POOL_WARMUP', '5'))
+
+    # Реплики для чтения: список URL через запятую, стратегия выбора
+    # (round_robin или least_connections) и окно read-your-writes в секундах
+    DB_REPLICA_URLS: list[str] = [
+        url.strip() for url in os.environ.get('DB_REPLICA_URLS', '').split(',') if url.strip()
+    ]
+    DB_REPLICA_STRATEGY: str = os.environ.get('DB_REPLICA_STRATEGY', 'round_robin')
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.environ.get('DB_READ_YOUR_WRITES_SECONDS', '0'))
     
+    # Кэш меню (сериализованные ответы GET /api/v1/dishes)
+    MENU_CACHE_TTL: float = float(os.environ.get('MENU_CACHE_TTL', '60'))
+    MENU_CACHE_MAX_ENTRIES: int = int(os.environ.get('MENU_CACHE_MAX_ENTRIES', '1024'))
+
+    # Снимок каталога блюд для проверки заказов: время жизни в секундах (0 - блюда
+    # проверяются запросом к базе) и минимальный интервал перестроения при запросе
+    # блюда с ID больше известных снимку
+    DISH_CATALOG_TTL: float = float(os.environ.get('DISH_CATALOG_TTL', '30'))
+    DISH_CATALOG_MIN_REFRESH: float = float(os.environ.get('DISH_CATALOG_MIN_REFRESH', '1'))
+
+    # Поток событий заказов (SSE): размер очереди подписчика и интервал heartbeat в секундах
+    ORDER_EVENTS_QUEUE_SIZE: int = int(os.environ.get('ORDER_EVENTS_QUEUE_SIZE', '100'))
+    ORDER_EVENTS_HEARTBEAT: float = float(os.environ.get('ORDER_EVENTS_HEARTBEAT', '15'))
+
+    # Метрики Prometheus (/metrics) и заголовок Server-Timing в ответах
+    METRICS_ENABLED: bool = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_SERVER_TIMING: bool = os.environ.get('METRICS_SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+
+    # Журнал медленных SQL-запросов: порог в миллисекундах (0 - выключен),
+    # размер кольцевого буфера, построение плана EXPLAIN в фоне и запись значений параметров
+    # (по умолчанию не пишутся: в параметрах бывают персональные данные клиентов)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '200'))
+    SLOW_QUERY_BUFFER_SIZE: int = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', '100'))
+    SLOW_QUERY_EXPLAIN: bool = os.environ.get('SLOW_QUERY_EXPLAIN', 'true').lower() in ('1', 'true', 'yes')
+    SLOW_QUERY_LOG_PARAMETERS: bool = (
+        os.environ.get('SLOW_QUERY_LOG_PARAMETERS', 'false').lower() in ('1', 'true', 'yes')
+    )
+    # Служебные эндпоинты /api/v1/admin/* (журнал медленных запросов с текстом SQL и планами)
+    # не требуют авторизации, поэтому по умолчанию не подключаются
+    ADMIN_ENDPOINTS_ENABLED: bool = (
+        os.environ.get('ADMIN_ENDPOINTS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    )
+
+    # Ключи идемпотентности (Idempotency-Key): время хранения ответа в секундах,
+    # размер LRU-кэша в памяти и интервал удаления просроченных ключей из базы
+    IDEMPOTENCY_TTL: float = float(os.environ.get('IDEMPOTENCY_TTL', '86400'))
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = int(os.environ.get('IDEMPOTENCY_CACHE_MAX_ENTRIES', '10000'))
+    IDEMPOTENCY_CLEANUP_INTERVAL: float = float(os.environ.get('IDEMPOTENCY_CLEANUP_INTERVAL', '300'))
+
+    # Архив заказов (python -m src.archive): заказы в финальных статусах старше ARCHIVE_AFTER_DAYS
+    # дней переносятся пачками по ARCHIVE_CHUNK_SIZE с паузой ARCHIVE_CHUNK_PAUSE секунд между ними
+    ARCHIVE_AFTER_DAYS: float = float(os.environ.get('ARCHIVE_AFTER_DAYS', '30'))
+    ARCHIVE_CHUNK_SIZE: int = int(os.environ.get('ARCHIVE_CHUNK_SIZE', '1000'))
+    ARCHIVE_CHUNK_PAUSE: float = float(os.environ.get('ARCHIVE_CHUNK_PAUSE', '0.05'))
+
+    # Максимальное время ожидания завершения обрабатываемых запросов при остановке (секунды)
+    SHUTDOWN_DRAIN_TIMEOUT: float = float(os.environ.get('SHUTDOWN_DRAIN_TIMEOUT', '30'))
+    # Сколько секунд после сигнала остановки ответы закрывают keep-alive соединения
+    # (Connection: close), прежде чем сервер перестанет принимать запросы
+    SHUTDOWN_KEEPALIVE_GRACE: float = float(os.environ.get('SHUTDOWN_KEEPALIVE_GRACE', '1'))
+
+    # Запуск в production (python -m src.server): количество процессов, адрес и общий
+    # бюджет соединений с каждой базой данных, который делится между процессами (0 - не делить).
+    # По умолчанию один процесс: события заказов, метрики, кэш меню и ожидание запросов
+    # с тем же ключом идемпотентности работают в памяти процесса (см. src/server.py)
+    WEB_WORKERS: int = int(os.environ.get('WEB_WORKERS', '1'))
+    WEB_HOST: str = os.environ.get('WEB_HOST', '0.0.0.0')
+    WEB_PORT: int = int(os.environ.get('WEB_PORT', '8000'))
+    DB_CONNECTION_BUDGET: int = int(os.environ.get('DB_CONNECTION_BUDGET', '90'))
+
+    # Логи пишутся фоновым потоком из очереди размером LOG_QUEUE_SIZE (при переполнении
+    # записи отбрасываются): на консоль и в файл LOG_FILE в JSON (пустое значение - без файла)
+    # с ротацией по размеру и сжатием в zip; журнал запросов пишется для доли LOG_ACCESS_SAMPLE_RATE
+    LOG_LEVEL: str = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FILE: str = os.environ.get('LOG_FILE', 'logs.json')
+    LOG_ROTATION_BYTES: int = int(os.environ.get('LOG_ROTATION_BYTES', str(10 * 1024 * 1024)))
+    LOG_CONSOLE: bool = os.environ.get('LOG_CONSOLE', 'true').lower() in ('1', 'true', 'yes')
+    LOG_QUEUE_SIZE: int = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+    LOG_ACCESS_SAMPLE_RATE: float = float(os.environ.get('LOG_ACCESS_SAMPLE_RATE', '0.1'))
+
     # Общие настройки приложения
     DEBUG: bool = bool(os.environ.get('DEBUG', False))
 
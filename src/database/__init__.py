@@ -5,12 +5,16 @@ from .database import (
     engine,
     async_session_maker,
     get_async_session,
+    replica_engines,
+    replica_router,
+    sqlite_write_lock,
 )
 from .utils import (
     create_all_tables,
     drop_all_tables,
     recreate_all_tables,
     check_database_connection,
+    warm_up_pool,
 )
 
 __all__ = [
@@ -19,8 +23,12 @@ __all__ = [
     "engine", 
     "async_session_maker",
     "get_async_session",
+    "replica_engines",
+    "replica_router",
+    "sqlite_write_lock",
     "create_all_tables",
     "drop_all_tables", 
     "recreate_all_tables",
     "check_database_connection",
+    "warm_up_pool",
 ] 
\ No newline at end of file
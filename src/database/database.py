@@ -1,10 +1,13 @@
 """Модуль для работы с базой данных."""
+import asyncio
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
+from src.database.replicas import ReplicaRouter
+from src.database.sqlite import configure_sqlite_engine, is_file_sqlite
 
 
 class BaseModel(DeclarativeBase):
@@ -25,11 +28,24 @@ class BaseModel(DeclarativeBase):
         return f'<{self.__class__.__name__} {", ".join(cols)}>'
 
 
+def get_connect_args(url: str) -> dict:
+    """Параметры подключения драйвера для URL базы данных."""
+    if url.startswith('postgresql+asyncpg'):
+        # Подготовленные выражения кэшируются на соединении по тексту запроса
+        return {'prepared_statement_cache_size': settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+    return {}
+
+
+# Файловая SQLite: одно соединение записи (транзакции записи выстраиваются в очередь
+# через sqlite_write_lock) и отдельный пул чтения, который подключается как реплика
+sqlite_profile = settings.DB_SQLITE_PROFILE and is_file_sqlite(settings.DB_URL)
+
 engine = create_async_engine(
     settings.DB_URL,
     echo=settings.DB_ECHO,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_size=1 if sqlite_profile else settings.DB_POOL_SIZE,
+    max_overflow=0 if sqlite_profile else settings.DB_MAX_OVERFLOW,
+    connect_args=get_connect_args(settings.DB_URL),
     future=True
 )
 
@@ -40,6 +56,41 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False
 )
 
+replica_engines = [
+    create_async_engine(
+        replica_url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        connect_args=get_connect_args(replica_url),
+    )
+    for replica_url in settings.DB_REPLICA_URLS
+]
+
+sqlite_write_lock: asyncio.Lock | None = None
+if sqlite_profile:
+    sqlite_write_lock = asyncio.Lock()
+    configure_sqlite_engine(engine, writer=True)
+    if not replica_engines and settings.DB_SQLITE_READERS > 0:
+        reader_engine = create_async_engine(
+            settings.DB_URL,
+            echo=settings.DB_ECHO,
+            pool_size=settings.DB_SQLITE_READERS,
+            max_overflow=0,
+        )
+        configure_sqlite_engine(reader_engine, writer=False)
+        replica_engines.append(reader_engine)
+
+replica_router = ReplicaRouter(
+    primary=async_session_maker,
+    replicas=[
+        (replica_engine, async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False))
+        for replica_engine in replica_engines
+    ],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
 # Теперь Base это и есть BaseModel
 Base = BaseModel
 
@@ -52,6 +103,9 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
 __all__ = [
     "engine",
     "async_session_maker", 
+    "replica_engines",
+    "replica_router",
+    "sqlite_write_lock",
     "Base",
     "BaseModel",  # Экспортируем оба имени для совместимости
     "get_async_session"
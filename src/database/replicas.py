@@ -0,0 +1,72 @@
+"""Маршрутизация читающих транзакций на реплики базы данных."""
+import itertools
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+# Идентификатор клиента текущего запроса (устанавливается middleware)
+current_client_id: ContextVar[str | None] = ContextVar('current_client_id', default=None)
+
+REPLICA_STRATEGIES = ('round_robin', 'least_connections')
+
+
+class ReplicaRouter:
+    """Выбор фабрики сессий для читающих транзакций.
+
+    Если реплики не настроены или клиент недавно выполнял запись
+    (окно read-your-writes), чтение идет на основную базу.
+    """
+
+    max_tracked_clients = 10_000
+
+    def __init__(
+            self,
+            primary: async_sessionmaker[AsyncSession],
+            replicas: list[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]],
+            strategy: str = 'round_robin',
+            read_your_writes_seconds: float = 0,
+    ) -> None:
+        if strategy not in REPLICA_STRATEGIES:
+            err_msg = f'Неизвестная стратегия выбора реплики: {strategy}'
+            raise ValueError(err_msg)
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._round_robin = itertools.cycle(range(len(replicas)))
+        self._last_writes: OrderedDict[str, float] = OrderedDict()
+
+    def mark_write(self) -> None:
+        """Запоминает время записи текущего клиента для окна read-your-writes."""
+        client_id = current_client_id.get()
+        if not self.replicas or self.read_your_writes_seconds <= 0 or client_id is None:
+            return
+        self._last_writes[client_id] = time.monotonic()
+        self._last_writes.move_to_end(client_id)
+        if len(self._last_writes) > self.max_tracked_clients:
+            self._last_writes.popitem(last=False)
+
+    def get_session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """Возвращает фабрику сессий для читающей транзакции."""
+        if not self.replicas or self._wrote_recently():
+            return self.primary
+        if self.strategy == 'least_connections':
+            _, session_maker = min(self.replicas, key=lambda replica: _checked_out(replica[0]))
+            return session_maker
+        _, session_maker = self.replicas[next(self._round_robin)]
+        return session_maker
+
+    def _wrote_recently(self) -> bool:
+        client_id = current_client_id.get()
+        if self.read_your_writes_seconds <= 0 or client_id is None:
+            return False
+        last_write = self._last_writes.get(client_id)
+        return last_write is not None and time.monotonic() - last_write < self.read_your_writes_seconds
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    """Количество соединений, выданных пулом движка."""
+    checkedout = getattr(engine.sync_engine.pool, 'checkedout', None)
+    return checkedout() if checkedout is not None else 0
@@ -0,0 +1,41 @@
+"""Профиль SQLite: настройки соединений и раздельные движки записи и чтения."""
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+
+
+def is_file_sqlite(url: str) -> bool:
+    """Проверка, что URL указывает на файловую базу SQLite (не в памяти)."""
+    return url.startswith('sqlite') and ':memory:' not in url and 'mode=memory' not in url
+
+
+def configure_sqlite_engine(engine: AsyncEngine, writer: bool) -> None:
+    """Настройка соединений движка SQLite.
+
+    WAL позволяет читать параллельно с записью, synchronous=NORMAL в режиме WAL
+    безопасен при сбое приложения и не делает fsync на каждый коммит. Транзакции
+    открываются явно: на движке записи - BEGIN IMMEDIATE, чтобы блокировка
+    записи бралась сразу, а не при первом изменении (иначе параллельные
+    транзакции получают "database is locked" без ожидания busy_timeout).
+    Соединения движка чтения работают в режиме query_only.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        # Транзакциями управляет SQLAlchemy (событие begin), а не драйвер
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.execute(f'PRAGMA busy_timeout={settings.DB_SQLITE_BUSY_TIMEOUT}')
+        cursor.execute(f'PRAGMA mmap_size={settings.DB_SQLITE_MMAP_SIZE}')
+        if not writer:
+            cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+    @event.listens_for(sync_engine, 'begin')
+    def begin(conn) -> None:
+        conn.exec_driver_sql('BEGIN IMMEDIATE' if writer else 'BEGIN')
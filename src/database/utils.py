@@ -1,5 +1,9 @@
 """Утилиты для работы с базой данных."""
-from sqlalchemy.ext.asyncio import AsyncEngine
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 from src.database.database import engine, Base
 
 
@@ -44,4 +48,40 @@ async def check_database_connection() -> bool:
             await conn.execute("SELECT 1")
         return True
     except Exception:
-        return False 
\ No newline at end of file
+        return False 
+
+
+async def warm_up_pool(
+        db_engine: AsyncEngine,
+        connections: int,
+        prime: Callable[[AsyncConnection], Awaitable[None]] | None = None,
+) -> int:
+    """Предварительное открытие соединений пула.
+
+    Соединения открываются одновременно, чтобы пул создал их все, а не
+    переиспользовал одно. На каждом выполняется проверочный запрос и `prime`
+    (в транзакции, которая затем откатывается), после чего соединения
+    возвращаются в пул.
+
+    Returns:
+        int: количество открытых соединений
+    """
+    opened: list[AsyncConnection] = []
+
+    async def open_connection() -> None:
+        conn = await db_engine.connect()
+        opened.append(conn)
+        await conn.execute(text('SELECT 1'))
+        if prime is not None:
+            await prime(conn)
+        await conn.rollback()
+
+    try:
+        # TaskGroup при ошибке отменяет остальные открытия и дожидается их, поэтому закрываются все соединения
+        async with asyncio.TaskGroup() as tasks:
+            for _ in range(connections):
+                tasks.create_task(open_connection())
+    finally:
+        for conn in opened:
+            await conn.close()
+    return len(opened)
@@ -1,11 +1,109 @@
+import asyncio
 import os
+import signal
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
 
 from dotenv import find_dotenv, load_dotenv
 from fastapi import FastAPI
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
 from src.api import router
+from src.api.middlewares import (
+    AccessLogMiddleware,
+    ClientContextMiddleware,
+    InFlightRequestsMiddleware,
+    MetricsMiddleware,
+    inflight_requests,
+)
+from src.api.v1.services.order_service import order_events
+from src.config import settings
+from src.database import engine, replica_engines, sqlite_write_lock, warm_up_pool
 from src.metadata import DESCRIPTION, TAG_METADATA, TITLE, VERSION
+from src.repositories.dish_repository import DishRepository
+from src.repositories.order_repository import OrderRepository
+from src.utils.constants import DEFAULT_PAGE_SIZE
+from src.utils.logging import log_writer
+from src.utils.metrics import instrument_engine, metrics
+from src.utils.slow_queries import slow_queries
+
+
+async def metrics_endpoint() -> PlainTextResponse:
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4')
+
+
+async def prime_statement_caches(conn: AsyncConnection) -> None:
+    """Выполнение запросов горячих путей на соединении.
+
+    Заполняет кэш компиляции SQLAlchemy и кэш подготовленных выражений
+    драйвера для этого соединения, чтобы первые запросы их не ждали.
+    """
+    session = AsyncSession(bind=conn)
+    orders = OrderRepository(session)
+    dishes = DishRepository(session)
+    await orders.get_page(DEFAULT_PAGE_SIZE + 1)
+    await orders.get_page(DEFAULT_PAGE_SIZE + 1, (datetime.min, 0))
+    await orders.get_dishes_by_order_ids([0])
+    await dishes.get_page(DEFAULT_PAGE_SIZE + 1)
+    await dishes.get_page(DEFAULT_PAGE_SIZE + 1, 0)
+    await dishes.get_by_ids([0])
+    await session.close()
+
+
+def close_event_streams_on_exit() -> None:
+    """Закрытие потоков SSE и keep-alive соединений при получении сигнала остановки.
+
+    Сервер (uvicorn) перед остановкой приложения ждет закрытия всех соединений,
+    а бесконечные потоки событий сами не завершаются. Обработчики сигналов
+    сервера сохраняются и вызываются через SHUTDOWN_KEEPALIVE_GRACE секунд:
+    до этого ответы закрывают keep-alive соединения, и запросы клиентов
+    не попадают в соединения, которые сервер закрывает при остановке.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(sig)
+
+        def handler(signum, frame, previous=previous):
+            loop.call_soon_threadsafe(order_events.close)
+            inflight_requests.draining = True
+            if callable(previous):
+                loop.call_soon_threadsafe(loop.call_later, settings.SHUTDOWN_KEEPALIVE_GRACE, previous, signum, frame)
+
+        signal.signal(sig, handler)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Прогрев пулов соединений при запуске и корректное освобождение ресурсов при остановке."""
+    log_writer.start(settings.LOG_LEVEL)
+    for db_engine in (engine, *replica_engines):
+        connections = min(settings.DB_POOL_WARMUP, db_engine.pool.size())
+        if connections > 0:
+            await warm_up_pool(db_engine, connections, prime_statement_caches)
+    logger.info('Пулы соединений прогреты')
+    close_event_streams_on_exit()
+
+    yield
+
+    # Подписчики SSE отключаются сразу (клиенты переподключатся к другому экземпляру),
+    # остальные запросы завершаются в пределах SHUTDOWN_DRAIN_TIMEOUT
+    order_events.close()
+    try:
+        async with asyncio.timeout(settings.SHUTDOWN_DRAIN_TIMEOUT):
+            await inflight_requests.wait_idle()
+    except TimeoutError:
+        logger.warning(f'Остановка с незавершенными запросами: {inflight_requests.count}')
+    for db_engine in (engine, *replica_engines):
+        await db_engine.dispose()
+    logger.info('Соединения с базой данных закрыты')
+    log_writer.stop()
 
 
 def create_fast_api_app() -> FastAPI:
@@ -19,6 +117,7 @@ def create_fast_api_app() -> FastAPI:
             description=DESCRIPTION,
             version=VERSION,
             openapi_tags=TAG_METADATA,
+            lifespan=lifespan,
         )
     else:
         fastapi_app = FastAPI(
@@ -29,8 +128,25 @@ def create_fast_api_app() -> FastAPI:
             openapi_tags=TAG_METADATA,
             docs_url=None,
             redoc_url=None,
+            lifespan=lifespan,
         )
 
+    # В профиле SQLite планы строятся на пуле чтения: единственное соединение записи ими не занимается
+    explain_engine = replica_engines[0] if sqlite_write_lock is not None and replica_engines else None
+    slow_queries.instrument(engine, explain_engine)
+    for db_engine in replica_engines:
+        slow_queries.instrument(db_engine)
+    fastapi_app.add_middleware(ClientContextMiddleware)
+    if settings.METRICS_ENABLED:
+        for db_engine in (engine, *replica_engines):
+            instrument_engine(db_engine)
+        fastapi_app.add_middleware(MetricsMiddleware, server_timing=settings.METRICS_SERVER_TIMING)
+        fastapi_app.add_api_route(
+            '/metrics', metrics_endpoint, methods=['GET'], tags=['Health'], include_in_schema=False,
+        )
+    if settings.LOG_ACCESS_SAMPLE_RATE > 0:
+        fastapi_app.add_middleware(AccessLogMiddleware, sample_rate=settings.LOG_ACCESS_SAMPLE_RATE)
+    fastapi_app.add_middleware(InFlightRequestsMiddleware)
     fastapi_app.include_router(router, prefix='/api')
     return fastapi_app
 
@@ -7,6 +7,10 @@ TAG_METADATA = [
         'name': 'Orders | v1',
         'description': 'Операции с заказами v1.',
     },
+    {
+        'name': 'Admin | v1',
+        'description': 'Служебные операции: диагностика производительности.',
+    },
     {
         'name': 'Health',
         'description': 'Проверка работоспособности сервиса.',
@@ -1,7 +1,12 @@
 from .dish import Dish
+from .idempotency_key import IdempotencyKey
 from .order import Order
+from .order_archive import OrderArchive, order_dish_archive
 
 __all__ = [
     "Dish", 
+    "IdempotencyKey",
     "Order", 
+    "OrderArchive",
+    "order_dish_archive",
 ] 
\ No newline at end of file
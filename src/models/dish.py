@@ -1,13 +1,31 @@
 from sqlalchemy.orm import relationship, Mapped
-from sqlalchemy import text
+from sqlalchemy import DDL, Index, event
 from src.database import Base
 from src.utils.custom_types import integer_pk, str_required, str_optional, float_price
 
+# Полнотекстовый поиск блюд на PostgreSQL: tsvector названия (вес A) и описания (вес B).
+# Конфигурация 'simple' не приводит слова к основе: поиск идет по префиксам слов,
+# как в FTS5 на SQLite. Вектор хранится в генерируемом столбце search_vector
+# (в модели не отображается), чтобы ранжирование не разбирало текст каждой строки
+DISH_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', name), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+DISH_SEARCH_COLUMN_DDL = (
+    f"ALTER TABLE dishes ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({DISH_SEARCH_VECTOR}) STORED"
+)
+
+
 class Dish(Base):
     __tablename__ = "dishes"
     
     # Кастомные настройки отображения - показываем id, name, price
     repr_cols = ('id', 'name', 'price')
+
+    __table_args__ = (
+        # Фильтр по категории со страницами по id
+        Index('ix_dishes_category_id', 'category', 'id'),
+    )
     
     id: Mapped[integer_pk]
     name: Mapped[str_required]
@@ -15,37 +33,32 @@ class Dish(Base):
     price: Mapped[float_price]
     category: Mapped[str_required]
     
-    # Обратные связи создаются автоматически через DishRelatedMixin
-    # orders, menus, promotions и т.д. будут добавлены динамически
+    # Обратные связи (заказы с блюдом) не загружаются через модель: они читаются
+    # постранично запросами репозиториев, например OrderRepository.find_page_by_dish
 
-    def get_related_objects(self, model_class):
-        """Универсальный метод для получения объектов, связанных с этим блюдом."""
-        # Формируем имя промежуточной таблицы
-        table_name = model_class.__tablename__
-        association_table = f"{table_name[:-1]}_dish"
-        
-        # Выполняем запрос через промежуточную таблицу
-        from sqlalchemy.orm import sessionmaker
-        session = sessionmaker.object_session(self)
-        if session:
-            return session.query(model_class).join(
-                text(f"{association_table}"),
-                text(f"{model_class.__tablename__}.id = {association_table}.{table_name[:-1]}_id")
-            ).filter(
-                text(f"{association_table}.dish_id = :dish_id")
-            ).params(dish_id=self.id).all()
-        return []
-    
-    def get_orders(self):
-        """Получить все заказы, содержащие это блюдо."""
-        from src.models.order import Order
-        return self.get_related_objects(Order)
-    
-    # При добавлении новых моделей с DishRelatedMixin можно добавить:
-    # def get_menus(self):
-    #     from src.models.menu import Menu
-    #     return self.get_related_objects(Menu)
-    #
-    # def get_promotions(self):
-    #     from src.models.promotion import Promotion  
-    #     return self.get_related_objects(Promotion)
+
+# SQLite: таблица FTS5 с внешним содержимым (строки dishes), синхронизируется триггерами.
+# Диакритика не удаляется: "й" и "ё" - отдельные буквы, как и в конфигурации 'simple'
+DISHES_FTS_DDL = (
+    "CREATE VIRTUAL TABLE dishes_fts USING fts5("
+    "name, description, content='dishes', content_rowid='id', tokenize='unicode61 remove_diacritics 0')",
+    "CREATE TRIGGER dishes_fts_insert AFTER INSERT ON dishes BEGIN "
+    "INSERT INTO dishes_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER dishes_fts_delete AFTER DELETE ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER dishes_fts_update AFTER UPDATE OF name, description ON dishes BEGIN "
+    "INSERT INTO dishes_fts(dishes_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO dishes_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+)
+
+event.listen(Dish.__table__, 'after_create', DDL(DISH_SEARCH_COLUMN_DDL).execute_if(dialect='postgresql'))
+event.listen(
+    Dish.__table__,
+    'after_create',
+    DDL('CREATE INDEX ix_dishes_search ON dishes USING gin (search_vector)').execute_if(dialect='postgresql'),
+)
+for _statement in DISHES_FTS_DDL:
+    event.listen(Dish.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(Dish.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS dishes_fts').execute_if(dialect='sqlite'))
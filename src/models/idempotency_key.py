@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from src.database import Base
+from src.utils.constants import MAX_IDEMPOTENCY_KEY_LENGTH
+
+
+class IdempotencyKey(Base):
+    """Сохраненный ответ на запрос с заголовком Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+
+    repr_cols = ('scope', 'key', 'status_code')
+
+    __table_args__ = (
+        # Удаление просроченных ключей
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    # Область действия ключа (например, "orders"), один ключ может использоваться в разных эндпоинтах
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    key: Mapped[str] = mapped_column(String(MAX_IDEMPOTENCY_KEY_LENGTH), primary_key=True)
+    # SHA-256 тела запроса: повтор с тем же ключом и другим телом отклоняется
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -1,7 +1,7 @@
 """Миксин для связи с блюдами."""
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy import Column, ForeignKey, Index, Integer, Table
 from sqlalchemy.orm import Mapped, declared_attr, relationship
 
 if TYPE_CHECKING:
@@ -15,8 +15,13 @@ class DishRelatedMixin:
     - Промежуточную таблицу для связи многие-ко-многим
     - dishes: relationship к модели Dish (односторонняя связь)
     
-    Обратные связи не создаются автоматически. Для получения связанных 
-    объектов в модели Dish используйте прямые запросы или методы.
+    Промежуточная таблица имеет собственный первичный ключ, поэтому одно блюдо
+    может быть связано с объектом несколько раз (порции). Связь dishes схлопывает
+    такие повторы, поэтому ответы API строятся из строк промежуточной таблицы.
+
+    Обратные связи не создаются автоматически. Объекты, связанные с блюдом,
+    читаются запросами репозиториев по индексу (dish_id, <объект>_id)
+    промежуточной таблицы (например, OrderRepository.find_page_by_dish).
     """
 
     @declared_attr
@@ -26,13 +31,22 @@ class DishRelatedMixin:
         table_name = cls.__tablename__
         # Создаем имя промежуточной таблицы (например "order_dish")  
         association_table_name = f"{table_name[:-1]}_dish"  # убираем 's' в конце
+        owner_id = f"{table_name[:-1]}_id"
         
         return Table(
             association_table_name,
             cls.metadata,
             Column("id", Integer, primary_key=True),
-            Column(f"{table_name[:-1]}_id", Integer, ForeignKey(f"{table_name}.id", ondelete="CASCADE"), nullable=False),
-            Column("dish_id", Integer, ForeignKey("dishes.id", ondelete="CASCADE"), nullable=False)
+            # Индексы по внешним ключам нужны для загрузки блюд заказа и каскадного удаления
+            Column(
+                owner_id, Integer, ForeignKey(f"{table_name}.id", ondelete="CASCADE"),
+                nullable=False, index=True,
+            ),
+            Column("dish_id", Integer, ForeignKey("dishes.id", ondelete="CASCADE"), nullable=False),
+            # Объекты с блюдом по возрастанию ID читаются из индекса без обращения к таблице
+            Index(f"ix_{association_table_name}_dish_id_{owner_id}", "dish_id", owner_id),
+            # ID связей сохраняются в архиве, поэтому не выдаются повторно и на SQLite
+            sqlite_autoincrement=True,
         )
 
     @declared_attr
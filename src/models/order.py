@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlalchemy.orm import relationship, Mapped
 from src.database import Base
 from src.models.mixins.dish_mixin import DishRelatedMixin
@@ -9,6 +10,17 @@ class Order(Base, DishRelatedMixin):
     
     # Кастомные настройки отображения - показываем id, customer_name, status
     repr_cols = ('id', 'customer_name', 'status')
+
+    __table_args__ = (
+        # Фильтрация по статусу или клиенту с keyset-пагинацией/диапазоном по времени
+        Index('ix_orders_status_order_time_id', 'status', 'order_time', 'id'),
+        Index('ix_orders_customer_name_order_time_id', 'customer_name', 'order_time', 'id'),
+        # Keyset-пагинация по (order_time, id)
+        Index('ix_orders_order_time_id', 'order_time', 'id'),
+        # SQLite без AUTOINCREMENT повторно выдает наибольший освободившийся ID, а ID
+        # заказов, перенесенных в архив, не должны совпадать с ID действующих заказов
+        {'sqlite_autoincrement': True},
+    )
     
     id: Mapped[integer_pk]
     customer_name: Mapped[str_required]
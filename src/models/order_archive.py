@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, Table
+from sqlalchemy.orm import Mapped, mapped_column
+from src.database import Base
+from src.utils.custom_types import created_at, str_required
+
+# На PostgreSQL архивные таблицы секционированы по диапазонам order_time (секция на месяц),
+# поэтому order_time входит в первичные ключи. Секции создаются при переносе заказов в архив.
+ARCHIVE_PARTITION_BY = 'RANGE (order_time)'
+
+
+class OrderArchive(Base):
+    """Заказ в финальном статусе, перенесенный из orders в архив."""
+    __tablename__ = "orders_archive"
+
+    repr_cols = ('id', 'customer_name', 'status')
+
+    __table_args__ = (
+        # Keyset-пагинация по (order_time, id)
+        Index('ix_orders_archive_order_time_id', 'order_time', 'id'),
+        # Заказы клиента
+        Index('ix_orders_archive_customer_name_order_time_id', 'customer_name', 'order_time', 'id'),
+        {'postgresql_partition_by': ARCHIVE_PARTITION_BY},
+    )
+
+    # ID сохраняется из orders, поэтому не пересекается с ID действующих заказов
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    order_time: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    customer_name: Mapped[str_required]
+    status: Mapped[str_required]
+    archived_at: Mapped[created_at]
+
+
+# Блюда архивных заказов (копия строк order_dish с временем заказа для секционирования).
+# Внешних ключей нет: строки переносятся вместе с заказом, ссылки на удаленные
+# блюда отбрасываются при чтении так же, как каскадное удаление в order_dish.
+order_dish_archive = Table(
+    "order_dish_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("order_time", DateTime, primary_key=True),
+    Column("order_id", Integer, nullable=False, index=True),
+    Column("dish_id", Integer, nullable=False),
+    # Архивные заказы с блюдом (как ix_order_dish_dish_id_order_id)
+    Index('ix_order_dish_archive_dish_id_order_id', 'dish_id', 'order_id'),
+    postgresql_partition_by=ARCHIVE_PARTITION_BY,
+)
@@ -1,8 +1,24 @@
-from sqlalchemy import select
+import re
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.models.dish import Dish
 from src.utils.repository import BaseRepository
 
+# Генерируемый столбец tsvector поиска блюд на PostgreSQL (GIN-индекс ix_dishes_search)
+dish_search_vector = literal_column('dishes.search_vector', type_=TSVECTOR)
+
+# Таблица FTS5 поиска блюд на SQLite (создается вместе с dishes) и веса столбцов в bm25
+dishes_fts = table('dishes_fts', column('rowid'))
+FTS_WEIGHTS = (literal_column('10.0'), literal_column('1.0'))
+
+
+def search_terms(query: str) -> list[str]:
+    """Слова поискового запроса в нижнем регистре (без знаков препинания и подчеркиваний)."""
+    return re.findall(r'[^\W_]+', query.lower())
+
+
 class DishRepository(BaseRepository):
     model = Dish
 
@@ -10,21 +26,80 @@ class DishRepository(BaseRepository):
         """Получение всех блюд."""
         return await self.get_by_filter_all()
 
-    async def get_by_ids(self, ids: list[int]) -> list[Dish]:
-        """Получение блюд по списку ID."""
-        if not ids:
-            return []
-        result = await self.session.execute(select(Dish).where(Dish.id.in_(ids)))
+    async def get_page(self, limit: int, after_id: int | None = None, category: str | None = None) -> list[Dish]:
+        """Получение страницы блюд по ключу id.
+
+        Args:
+            limit: максимальное количество блюд на странице
+            after_id: id последнего блюда предыдущей страницы
+            category: только блюда этой категории
+        """
+        query = select(Dish).order_by(Dish.id).limit(limit)
+        if after_id is not None:
+            query = query.where(Dish.id > after_id)
+        if category is not None:
+            query = query.where(Dish.category == category)
+        result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def search(
+            self,
+            query: str,
+            limit: int,
+            after: tuple[float, int] | None = None,
+            category: str | None = None,
+    ) -> list[tuple[Dish, float]]:
+        """Поиск блюд по префиксам слов в названии и описании.
+
+        Блюдо подходит, если в нем есть все слова запроса (как начало слова).
+        Результаты упорядочены по убыванию релевантности, затем по id.
+        На PostgreSQL используется GIN-индекс по tsvector, на SQLite - таблица FTS5.
+
+        Args:
+            query: поисковый запрос
+            limit: максимальное количество блюд на странице
+            after: ключ (релевантность, id) последнего блюда предыдущей страницы
+            category: только блюда этой категории
+
+        Returns:
+            Пары (блюдо, релевантность)
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        if self.session.bind.dialect.name == 'postgresql':
+            tsquery = func.to_tsquery(literal_column("'simple'"), ' & '.join(f'{term}:*' for term in terms))
+            rank = func.ts_rank(dish_search_vector, tsquery)
+            statement = select(Dish, rank.label('rank')).where(dish_search_vector.bool_op('@@')(tsquery))
+        else:
+            rank = -func.bm25(literal_column('dishes_fts'), *FTS_WEIGHTS)
+            statement = (
+                select(Dish, rank.label('rank'))
+                .select_from(dishes_fts)
+                .join(Dish, Dish.id == dishes_fts.c.rowid)
+                .where(text('dishes_fts MATCH :match').bindparams(match=' '.join(f'"{term}"*' for term in terms)))
+            )
+
+        statement = statement.order_by(rank.desc(), Dish.id).limit(limit)
+        if after is not None:
+            after_rank, after_id = after
+            statement = statement.where(or_(rank < after_rank, and_(rank == after_rank, Dish.id > after_id)))
+        if category is not None:
+            statement = statement.where(Dish.category == category)
+        result = await self.session.execute(statement)
+        return result.all()
+
+    async def get_catalog_rows(self) -> list[tuple[int, str, float, str]]:
+        """Получение (id, название, цена, категория) всех блюд, упорядоченных по id."""
+        query = select(Dish.id, Dish.name, Dish.price, Dish.category).order_by(Dish.id)
+        result = await self.session.execute(query)
+        return result.all()
+
     async def create_from_schema(self, dish_data) -> Dish:
         """Создает новый объект Dish в базе из схемы DishCreate."""
         return await self.add_one_and_get_obj(**dish_data.model_dump())
 
     async def delete_by_id(self, dish_id: int) -> bool:
         """Удаляет блюдо по ID. Возвращает True, если удалено, или False, если не найдено."""
-        dish = await self.get_by_filter_one_or_none(id=dish_id)
-        if not dish:
-            return False
-        await self.delete_by_ids(dish_id)
-        return True
+        return await self.delete_one_by_id(dish_id)
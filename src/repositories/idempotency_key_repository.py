@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models.idempotency_key import IdempotencyKey
+from src.utils.repository import BaseRepository
+
+# INSERT ... ON CONFLICT поддерживается PostgreSQL и SQLite
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+class IdempotencyKeyRepository(BaseRepository):
+    model = IdempotencyKey
+
+    async def get_active(self, scope: str, key: str, now: datetime) -> IdempotencyKey | None:
+        """Получение непросроченного сохраненного ответа по ключу."""
+        result = await self.session.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at > now,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def save(
+            self,
+            scope: str,
+            key: str,
+            request_hash: str,
+            status_code: int,
+            response: bytes,
+            expires_at: datetime,
+            now: datetime,
+    ) -> bool:
+        """Сохранение ответа по ключу.
+
+        Просроченная запись с тем же ключом перезаписывается. Если ключ уже
+        занят действующей записью (ее сохранил конкурентный запрос), ничего не
+        меняется и возвращается False.
+        """
+        insert = DIALECT_INSERTS[self.session.bind.dialect.name]
+        query = insert(IdempotencyKey).values(
+            scope=scope,
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response=response,
+            expires_at=expires_at,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+            set_={
+                'request_hash': query.excluded.request_hash,
+                'status_code': query.excluded.status_code,
+                'response': query.excluded.response,
+                'expires_at': query.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= now,
+        ).returning(IdempotencyKey.key)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    async def delete_expired(self, now: datetime) -> int:
+        """Удаление просроченных ключей. Возвращает количество удаленных записей."""
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+        )
+        return result.rowcount
@@ -1,44 +1,571 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from src.models.order import Order
+from src.models.order_archive import OrderArchive, order_dish_archive
 from src.models.dish import Dish
-from src.utils.repository import BaseRepository
+from src.utils.repository import BaseRepository, ids_criterion, statement_cache
+
+orders_table: Table = Order.__table__
+orders_archive_table: Table = OrderArchive.__table__
+order_dish_table: Table = Order.dishes.property.secondary
+
+# Поля заказа в формате OrderRead (без блюд)
+ORDER_FIELDS = ("id", "customer_name", "status", "order_time")
+
+
+@dataclass(frozen=True, slots=True)
+class OrderFilters:
+    """Условия выборки заказов (None - без ограничения)."""
+
+    status: str | None = None
+    customer_name: str | None = None
+    # Диапазон order_time: начало включительно, конец не включительно
+    time_from: datetime | None = None
+    time_to: datetime | None = None
+
+    def criteria(self, table: Table) -> list[ColumnElement[bool]]:
+        """Условия WHERE для таблицы заказов (действующих или архивных)."""
+        criteria = []
+        if self.status is not None:
+            criteria.append(table.c.status == self.status)
+        if self.customer_name is not None:
+            criteria.append(table.c.customer_name == self.customer_name)
+        if self.time_from is not None:
+            criteria.append(table.c.order_time >= self.time_from)
+        if self.time_to is not None:
+            criteria.append(table.c.order_time < self.time_to)
+        return criteria
+
+
+def _page_query(
+        table: Table,
+        limit: int,
+        after: tuple[datetime, int] | None,
+        filters: OrderFilters | None = None,
+        descending: bool = False,
+) -> Select:
+    """Страница заказов таблицы по ключу (order_time, id), с `descending` - от новых к старым."""
+    key = (table.c.order_time, table.c.id)
+    query = (
+        select(*(table.c[name] for name in ORDER_FIELDS))
+        .order_by(*(column.desc() for column in key) if descending else key)
+        .limit(limit)
+    )
+    if filters is not None:
+        query = query.where(*filters.criteria(table))
+    if after is not None:
+        # Отдельное условие по order_time позволяет PostgreSQL отсечь секции архива
+        if descending:
+            query = query.where(table.c.order_time <= after[0], tuple_(*key) < after)
+        else:
+            query = query.where(table.c.order_time >= after[0], tuple_(*key) > after)
+    return query
+
+
+def _month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
 
 class OrderRepository(BaseRepository):
     model = Order
 
-    async def get_all(self) -> list[Order]:
-        """Получение всех заказов с загрузкой связанных блюд."""
-        # Загружаем связанные блюда сразу (selectinload) чтобы избежать дополнительных запросов
-        result = await self.session.execute(select(Order).options(selectinload(Order.dishes)))
-        return result.scalars().all()
+    async def get_all(self) -> list[dict[str, Any]]:
+        """Получение всех заказов с блюдами в формате OrderRead.
+
+        Блюда догружаются одним запросом через промежуточную таблицу, а не связью
+        Order.dishes: связь ORM схлопывает повторы блюда (порции) в один объект.
+        """
+        result = await self.session.execute(
+            select(*(orders_table.c[name] for name in ORDER_FIELDS)).order_by(orders_table.c.id),
+        )
+        orders = [dict(zip(ORDER_FIELDS, row, strict=True)) for row in result]
+        await self._attach_dishes(orders)
+        return orders
+
+    async def get_page(
+            self, limit: int, after: tuple[datetime, int] | None = None, include_archive: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Получение страницы заказов по ключу (order_time, id) вместе с блюдами.
+
+        Выбираются только нужные столбцы без создания ORM-объектов, блюда
+        догружаются одним запросом на страницу. Результат - словари в формате OrderRead.
+
+        Args:
+            limit: максимальное количество заказов на странице
+            after: ключ (order_time, id) последнего заказа предыдущей страницы
+            include_archive: включить заказы из архива
+        """
+        return await self.find_page(OrderFilters(), limit, after, include_archive=include_archive)
+
+    async def find_page(
+            self,
+            filters: OrderFilters,
+            limit: int,
+            after: tuple[datetime, int] | None = None,
+            descending: bool = False,
+            include_archive: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Получение страницы заказов, подходящих под условия, вместе с блюдами.
+
+        Каждому набору условий соответствует составной индекс с (order_time, id)
+        в конце: (status, ...), (customer_name, ...) или только (order_time, id)
+        для диапазона времени, поэтому страница читается из индекса без сортировки.
+        Блюда догружаются одним запросом только для заказов страницы.
+
+        Args:
+            filters: условия выборки
+            limit: максимальное количество заказов на странице
+            after: ключ (order_time, id) последнего заказа предыдущей страницы
+            descending: от новых заказов к старым
+            include_archive: включить заказы из архива
+        """
+        query = _page_query(orders_table, limit, after, filters, descending)
+        if include_archive:
+            # Страница собирается из страниц обеих таблиц, каждая читается по своему индексу
+            page = union_all(
+                select(_page_query(orders_table, limit, after, filters, descending).subquery()),
+                select(_page_query(orders_archive_table, limit, after, filters, descending).subquery()),
+            ).subquery()
+            key = (page.c.order_time, page.c.id)
+            query = select(page).order_by(*(column.desc() for column in key) if descending else key).limit(limit)
+        result = await self.session.execute(query)
+        # Ключи задаются явно: имена столбцов подзапроса UNION - не str, а метки SQLAlchemy
+        orders = [dict(zip(ORDER_FIELDS, row, strict=True)) for row in result]
+
+        archived_between = None
+        if include_archive and orders:
+            first, last = orders[0]["order_time"], orders[-1]["order_time"]
+            archived_between = (last, first) if descending else (first, last)
+        await self._attach_dishes(orders, archived_between)
+        return orders
+
+    async def estimate_count(
+            self, filters: OrderFilters, include_archive: bool = False, limit: int | None = None,
+    ) -> int:
+        """Приблизительное количество заказов, подходящих под условия.
+
+        На PostgreSQL - оценка планировщика по статистике таблиц (EXPLAIN без
+        выполнения запроса). На других базах статистики нет, поэтому заказы
+        считаются, но не дальше `limit` строк на таблицу.
+        """
+        tables = (orders_table, orders_archive_table) if include_archive else (orders_table,)
+        total = 0
+        for table in tables:
+            query = select(table.c.id).where(*filters.criteria(table))
+            if self.session.bind.dialect.name == 'postgresql':
+                total += await self._planner_rows(query)
+            else:
+                if limit is not None:
+                    query = query.limit(limit)
+                counted = await self.session.execute(select(func.count()).select_from(query.subquery()))
+                total += counted.scalar_one()
+        return total
+
+    async def _planner_rows(self, query: Select) -> int:
+        """Оценка количества строк результата запроса планировщиком PostgreSQL."""
+        connection = await self.session.connection()
+        compiled = query.compile(dialect=connection.dialect)
+        parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", parameters)
+        plan = result.scalar_one()
+        return int((orjson.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]["Plan Rows"])
+
+    async def find_page_by_dish(
+            self, dish_id: int, limit: int, after_id: int | None = None, include_archive: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Получение страницы заказов с блюдом по ключу id вместе с блюдами.
+
+        ID заказов читаются из индекса (dish_id, order_id) промежуточной таблицы
+        (заказ с несколькими порциями блюда попадает на страницу один раз), затем
+        к ним присоединяются заказы по первичному ключу. Результат - словари в формате OrderRead.
+
+        Args:
+            dish_id: ID блюда
+            limit: максимальное количество заказов на странице
+            after_id: ID последнего заказа предыдущей страницы
+            include_archive: включить заказы из архива
+        """
+        query = self._dish_orders_query(order_dish_table, orders_table, dish_id, limit, after_id)
+        if include_archive:
+            archived = self._dish_orders_query(order_dish_archive, orders_archive_table, dish_id, limit, after_id)
+            page = union_all(select(query.subquery()), select(archived.subquery())).subquery()
+            query = select(page).order_by(page.c.id).limit(limit)
+        result = await self.session.execute(query)
+        orders = [dict(zip(ORDER_FIELDS, row, strict=True)) for row in result]
+
+        archived_between = None
+        if include_archive and orders:
+            order_times = [order["order_time"] for order in orders]
+            archived_between = (min(order_times), max(order_times))
+        await self._attach_dishes(orders, archived_between)
+        return orders
+
+    @staticmethod
+    def _dish_orders_query(links: Table, table: Table, dish_id: int, limit: int, after_id: int | None) -> Select:
+        """Страница заказов таблицы `table`, связанных с блюдом через таблицу `links`."""
+        key = (links.c.order_id, links.c.order_time) if "order_time" in links.c else (links.c.order_id,)
+        order_ids = (
+            select(*key)
+            .where(links.c.dish_id == dish_id)
+            .distinct()
+            .order_by(links.c.order_id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            order_ids = order_ids.where(links.c.order_id > after_id)
+        order_ids = order_ids.subquery()
+        condition = table.c.id == order_ids.c.order_id
+        if "order_time" in links.c:
+            # Время заказа из строки связи ограничивает просматриваемые секции архива
+            condition &= table.c.order_time == order_ids.c.order_time
+        return (
+            select(*(table.c[name] for name in ORDER_FIELDS))
+            .join(order_ids, condition)
+            .order_by(table.c.id)
+        )
+
+    async def count_by_dish_ids(
+            self, dish_ids: list[int], include_archive: bool = False,
+    ) -> dict[int, tuple[int, int]]:
+        """Продажи блюд одним запросом: количество заказов и порций по каждому блюду.
+
+        Строки промежуточной таблицы группируются по dish_id и читаются только
+        из индекса (dish_id, order_id). ID архивных и действующих заказов
+        не пересекаются, поэтому счетчики таблиц складываются.
+
+        Returns:
+            Пары (заказов, порций) по ID блюда (блюда без заказов пропускаются)
+        """
+        if not dish_ids:
+            return {}
+        dialect_name = self.session.bind.dialect.name
+        query = statement_cache.get(
+            (Order, 'sales_by_dish_ids', dialect_name, include_archive),
+            lambda: self._dish_sales_query(dialect_name, include_archive),
+        )
+        result = await self.session.execute(query, {"ids": dish_ids})
+        return {dish_id: (orders, portions) for dish_id, orders, portions in result}
+
+    @staticmethod
+    def _dish_sales_query(dialect_name: str, include_archive: bool) -> Select:
+        """Запрос количества заказов и порций по списку ID блюд."""
+        def sales(links: Table) -> Select:
+            return (
+                select(
+                    links.c.dish_id,
+                    func.count(links.c.order_id.distinct()).label("orders"),
+                    func.count().label("portions"),
+                )
+                .where(ids_criterion(links.c.dish_id, dialect_name))
+                .group_by(links.c.dish_id)
+            )
+
+        if not include_archive:
+            return sales(order_dish_table)
+        rows = union_all(sales(order_dish_table), sales(order_dish_archive)).subquery()
+        return (
+            select(rows.c.dish_id, func.sum(rows.c.orders), func.sum(rows.c.portions))
+            .group_by(rows.c.dish_id)
+        )
+
+    async def get_dishes_by_order_ids(
+            self, order_ids: list[int], archived_between: tuple[datetime, datetime] | None = None,
+    ) -> dict[int, list[dict[str, Any]]]:
+        """Загрузка блюд для набора заказов одним запросом через промежуточную таблицу.
+
+        Если передан `archived_between` (диапазон order_time заказов), блюда
+        ищутся и среди архивных заказов. На PostgreSQL диапазон ограничивает
+        просматриваемые секции архива.
+        """
+        if not order_ids:
+            return {}
+        dialect_name = self.session.bind.dialect.name
+        include_archive = archived_between is not None
+        query = statement_cache.get(
+            (Order, 'dishes_by_order_ids', dialect_name, include_archive),
+            lambda: self._dishes_query(dialect_name, include_archive),
+        )
+        params: dict[str, Any] = {"ids": order_ids}
+        if include_archive and dialect_name == 'postgresql':
+            params["time_from"], params["time_to"] = archived_between
+        result = await self.session.execute(query, params)
+
+        dishes: dict[int, list[dict[str, Any]]] = {}
+        for order_id, dish_id, name, price, category in result:
+            dishes.setdefault(order_id, []).append(
+                {"id": dish_id, "name": name, "price": price, "category": category}
+            )
+        return dishes
+
+    @staticmethod
+    def _dishes_query(dialect_name: str, include_archive: bool) -> Select:
+        """Запрос блюд заказов по списку ID, с архивом - в диапазоне order_time."""
+        if not include_archive:
+            return (
+                select(order_dish_table.c.order_id, Dish.id, Dish.name, Dish.price, Dish.category)
+                .join(Dish, Dish.id == order_dish_table.c.dish_id)
+                .where(ids_criterion(order_dish_table.c.order_id, dialect_name))
+                .order_by(order_dish_table.c.order_id, order_dish_table.c.id)
+            )
+
+        def links(table: Table) -> Select:
+            return (
+                select(
+                    table.c.order_id, table.c.id.label("link_id"),
+                    Dish.id.label("dish_id"), Dish.name, Dish.price, Dish.category,
+                )
+                .join(Dish, Dish.id == table.c.dish_id)
+                .where(ids_criterion(table.c.order_id, dialect_name))
+            )
+
+        archived = links(order_dish_archive)
+        if dialect_name == 'postgresql':
+            archived = archived.where(
+                order_dish_archive.c.order_time.between(bindparam("time_from"), bindparam("time_to"))
+            )
+        rows = union_all(links(order_dish_table), archived).subquery()
+        return (
+            select(rows.c.order_id, rows.c.dish_id, rows.c.name, rows.c.price, rows.c.category)
+            .order_by(rows.c.order_id, rows.c.link_id)
+        )
+
+    async def _attach_dishes(
+            self, orders: list[dict[str, Any]], archived_between: tuple[datetime, datetime] | None = None,
+    ) -> None:
+        dishes = await self.get_dishes_by_order_ids([order["id"] for order in orders], archived_between)
+        for order in orders:
+            order["dishes"] = dishes.get(order["id"], [])
+
+    async def stream_with_dishes(
+            self, chunk_size: int, include_archive: bool = False,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Потоковое чтение всех заказов с блюдами пачками по chunk_size.
+
+        Заказы читаются через серверный курсор, блюда догружаются одним запросом на пачку,
+        поэтому в памяти одновременно находится не больше одной пачки.
+        С `include_archive=True` выгружаются и архивные заказы.
+        """
+        query = select(*(orders_table.c[name] for name in ORDER_FIELDS))
+        if include_archive:
+            rows = union_all(query, select(*(orders_archive_table.c[name] for name in ORDER_FIELDS))).subquery()
+            query = select(rows)
+        query = query.order_by(query.selected_columns.id).execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            orders = [dict(zip(ORDER_FIELDS, row, strict=True)) for row in partition]
+            archived_between = None
+            if include_archive:
+                order_times = [order["order_time"] for order in orders]
+                archived_between = (min(order_times), max(order_times))
+            await self._attach_dishes(orders, archived_between)
+            yield orders
 
     async def get_by_id(self, order_id: int) -> Order | None:
         """Получение заказа по ID."""
         return await self.get_by_filter_one_or_none(id=order_id)
 
-    async def create_with_dishes(self, customer_name: str, dishes: list[Dish]) -> Order:
-        """Создание заказа с привязанными блюдами."""
-        order_data = {
-            "customer_name": customer_name,
-            "status": "в обработке"
-        }
-        new_order = await self.add_one_and_get_obj(**order_data)
-        # Привязываем объекты Dish к заказу, если список непустой
-        new_order.dishes = dishes
-        await self.session.flush()
-        await self.session.refresh(new_order)
+    async def create_with_dishes(self, customer_name: str, dishes: list[Dish]) -> dict[str, Any]:
+        """Создание заказа с привязанными блюдами.
+
+        Заказ вставляется через INSERT ... RETURNING, связи с блюдами - одной пакетной
+        вставкой. Результат собирается из уже имеющихся данных без повторного чтения.
+        """
+        (new_order,) = await self.bulk_create_with_dishes([(customer_name, [dish.id for dish in dishes])])
+        new_order["dishes"] = dishes
         return new_order
 
-    async def update_status(self, order: Order, new_status: str) -> Order:
-        """Обновляет статус существующего заказа."""
-        return await self.update_one_by_id(order.id, status=new_status)
-
-    async def delete_by_id(self, order_id: int) -> bool:
-        """Удаляет заказ по ID. Возвращает True, если удален, или False, если не найден."""
-        order = await self.get_by_filter_one_or_none(id=order_id)
-        if not order:
-            return False
-        await self.delete_by_ids(order_id)
-        return True
+    async def bulk_create_with_dishes(self, orders: list[tuple[str, list[int]]]) -> list[dict[str, Any]]:
+        """Массовое создание заказов с привязанными блюдами.
+
+        Заказы вставляются одним многострочным INSERT ... RETURNING,
+        связи с блюдами - одной пакетной вставкой в промежуточную таблицу.
+
+        Args:
+            orders: пары (имя клиента, список ID блюд) в порядке создания
+
+        Returns:
+            Созданные заказы в порядке `orders` (без поля dishes)
+        """
+        if not orders:
+            return []
+        result = await self.session.execute(
+            insert(Order).returning(
+                Order.id, Order.customer_name, Order.status, Order.order_time,
+                sort_by_parameter_order=True,
+            ),
+            [{"customer_name": customer_name} for customer_name, _ in orders],
+        )
+        created = [dict(row) for row in result.mappings()]
+
+        order_dish = Order.dishes.property.secondary
+        links = [
+            {"order_id": order["id"], "dish_id": dish_id}
+            for order, (_, dish_ids) in zip(created, orders, strict=True)
+            for dish_id in dish_ids
+        ]
+        if links:
+            await self.session.execute(insert(order_dish), links)
+        return created
+
+    async def update_status(
+            self, order_id: int, new_status: str, allowed_from: list[str],
+    ) -> dict[str, Any] | None:
+        """Атомарно обновляет статус заказа, если его текущий статус входит в `allowed_from`.
+
+        Проверка и обновление выполняются одним UPDATE ... RETURNING, поэтому
+        конкурентные переходы не могут перезаписать друг друга. Блюда догружаются
+        так же, как для страниц заказов, с сохранением повторов (порций).
+
+        Returns:
+            Обновленный заказ с блюдами в формате OrderRead или None,
+            если заказ не найден или переход недопустим
+        """
+        if not allowed_from:
+            return None
+        query = (
+            update(orders_table)
+            .where(orders_table.c.id == order_id, orders_table.c.status.in_(allowed_from))
+            .values(status=new_status)
+            .returning(*(orders_table.c[name] for name in ORDER_FIELDS))
+        )
+        row = (await self.session.execute(query)).one_or_none()
+        if row is None:
+            return None
+        order = dict(zip(ORDER_FIELDS, row, strict=True))
+        await self._attach_dishes([order])
+        return order
+
+    async def update_status_where_allowed(
+            self, order_ids: list[int], new_status: str, allowed_from: list[str],
+    ) -> list[int]:
+        """Смена статуса заказов одним условным UPDATE.
+
+        Обновляются только заказы, текущий статус которых входит в `allowed_from`.
+
+        Returns:
+            ID обновленных заказов
+        """
+        if not order_ids or not allowed_from:
+            return []
+        query = (
+            update(Order)
+            .where(ids_criterion(Order.id, self.session.bind.dialect.name), Order.status.in_(allowed_from))
+            .values(status=new_status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query, {"ids": order_ids})
+        return list(result.scalars())
+
+    async def get_statuses(self, order_ids: list[int]) -> dict[int, str]:
+        """Получение текущих статусов заказов по списку ID (включая архивные заказы)."""
+        if not order_ids:
+            return {}
+        dialect_name = self.session.bind.dialect.name
+        query = statement_cache.get(
+            (Order, 'statuses_by_ids', dialect_name),
+            lambda: union_all(*(
+                select(table.c.id, table.c.status).where(ids_criterion(table.c.id, dialect_name))
+                for table in (orders_table, orders_archive_table)
+            )),
+        )
+        result = await self.session.execute(query, {"ids": order_ids})
+        return dict(result.all())
+
+    async def archive_finished(self, statuses: list[str], older_than: datetime, limit: int) -> int:
+        """Перенос пачки заказов в финальных статусах старше `older_than` в архив.
+
+        Заказы и их блюда копируются в архивные таблицы и удаляются из orders и
+        order_dish в текущей транзакции. На PostgreSQL выбранные заказы блокируются
+        с SKIP LOCKED, поэтому параллельные запуски переносят разные пачки.
+
+        Returns:
+            Количество перенесенных заказов (меньше `limit`, если подходящие заказы закончились)
+        """
+        dialect_name = self.session.bind.dialect.name
+        query = (
+            select(Order.id, Order.order_time)
+            .where(Order.status.in_(statuses), Order.order_time < older_than)
+            .order_by(Order.order_time, Order.id)
+            .limit(limit)
+        )
+        if dialect_name == 'postgresql':
+            query = query.with_for_update(skip_locked=True)
+        rows = (await self.session.execute(query)).all()
+        if not rows:
+            return 0
+        if dialect_name == 'postgresql':
+            await self._create_archive_partitions({_month_start(order_time) for _, order_time in rows})
+
+        params = {"ids": [order_id for order_id, _ in rows]}
+        await self.session.execute(
+            insert(orders_archive_table).from_select(
+                ORDER_FIELDS,
+                select(*(orders_table.c[name] for name in ORDER_FIELDS))
+                .where(ids_criterion(orders_table.c.id, dialect_name)),
+            ),
+            params,
+        )
+        await self.session.execute(
+            insert(order_dish_archive).from_select(
+                ("id", "order_time", "order_id", "dish_id"),
+                select(order_dish_table.c.id, orders_table.c.order_time, order_dish_table.c.order_id,
+                       order_dish_table.c.dish_id)
+                .join(orders_table, orders_table.c.id == order_dish_table.c.order_id)
+                .where(ids_criterion(order_dish_table.c.order_id, dialect_name)),
+            ),
+            params,
+        )
+        # Связи удаляются явно, не полагаясь на каскад внешнего ключа (в SQLite он может быть выключен)
+        await self.session.execute(
+            delete(order_dish_table).where(ids_criterion(order_dish_table.c.order_id, dialect_name)), params,
+        )
+        await self.session.execute(
+            delete(orders_table).where(ids_criterion(orders_table.c.id, dialect_name)), params,
+        )
+        return len(rows)
+
+    async def _create_archive_partitions(self, months: set[date]) -> None:
+        """Создание недостающих месячных секций архивных таблиц (PostgreSQL)."""
+        for month in sorted(months):
+            for table in (orders_archive_table, order_dish_archive):
+                partition = f"{table.name}_{month:%Y_%m}"
+                exists = await self.session.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition})
+                if not exists:
+                    await self.session.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {table.name} "
+                        f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+                    ))
+
+    async def delete_by_id(self, order_id: int, statuses: list[str] | None = None) -> bool:
+        """Удаляет заказ по ID одним запросом.
+
+        Если передан `statuses`, заказ удаляется только в одном из этих статусов.
+        Возвращает True, если удален, или False, если не найден или статус не подходит.
+        """
+        if statuses is None:
+            return await self.delete_one_by_id(order_id)
+        return await self.delete_one_by_id(order_id, Order.status.in_(statuses))
@@ -16,3 +16,9 @@ class DishRead(DishBase):
 
     class Config:
         from_attributes = True
+
+class DishSales(BaseModel):
+    """Продажи блюда: количество заказов с блюдом и порций в них."""
+    dish_id: int
+    orders: int
+    portions: int
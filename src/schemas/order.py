@@ -1,10 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List
 
+from src.utils.constants import MAX_ORDERS_BATCH_SIZE
+
 class OrderCreate(BaseModel):
     customer_name: str
-    dish_ids: List[int]
+    # Повтор ID блюда - несколько порций этого блюда в заказе
+    dish_ids: List[int] = Field(description='ID блюд заказа, повтор ID - еще одна порция блюда')
 
 class DishInOrder(BaseModel):
     """Вложенная схема блюда внутри заказа (упрощенная)."""
@@ -21,10 +24,36 @@ class OrderRead(BaseModel):
     customer_name: str
     status: str
     order_time: datetime
-    dishes: List[DishInOrder]
+    dishes: List[DishInOrder] = Field(description='Блюда заказа в порядке dish_ids, по элементу на порцию')
 
     class Config:
         from_attributes = True
 
 class OrderStatusUpdate(BaseModel):
     status: str
+
+class OrderBatchCreate(BaseModel):
+    """Схема для пакетного создания заказов."""
+    items: List[OrderCreate] = Field(min_length=1, max_length=MAX_ORDERS_BATCH_SIZE)
+
+class OrderBatchItemResult(BaseModel):
+    """Результат создания одного заказа из пакета."""
+    index: int
+    success: bool
+    order: OrderRead | None = None
+    error: str | None = None
+
+class OrderBulkStatusUpdate(BaseModel):
+    """Схема для одновременной смены статуса нескольких заказов."""
+    order_ids: List[int] = Field(min_length=1, max_length=MAX_ORDERS_BATCH_SIZE)
+    status: str
+
+class OrderStatusRejection(BaseModel):
+    """Заказ, статус которого не был изменен, и причина отказа."""
+    id: int
+    reason: str
+
+class OrderBulkStatusResult(BaseModel):
+    """Результат одновременной смены статуса нескольких заказов."""
+    updated: List[int]
+    rejected: List[OrderStatusRejection]
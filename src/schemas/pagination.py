@@ -0,0 +1,16 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    """Страница результатов с курсором на следующую страницу."""
+    items: List[T]
+    next_cursor: str | None = None
+
+
+class EstimatedPage(Page[T], Generic[T]):
+    """Страница результатов с приблизительным общим количеством (только на первой странице)."""
+    total_estimate: int | None = None
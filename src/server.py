@@ -0,0 +1,97 @@
+"""Запуск приложения в production: несколько процессов uvicorn под управлением супервизора.
+
+Запуск: `python -m src.server`. Сигналы родительскому процессу:
+SIGHUP - поочередный перезапуск процессов с новым кодом,
+SIGINT/SIGTERM - остановка.
+
+Часть возможностей приложения хранит состояние в памяти процесса и при
+WEB_WORKERS > 1 действует только в пределах одного процесса:
+- поток событий GET /api/v1/orders/events получает только события заказов,
+  измененных тем же процессом;
+- GET /metrics отдает счетчики процесса, обработавшего запрос;
+- ETag меню зависит от версии кэша процесса, поэтому после изменения блюд
+  другие процессы могут отвечать 304 до истечения MENU_CACHE_TTL;
+- запросы с одинаковым Idempotency-Key ожидают друг друга только в одном
+  процессе (между процессами повтор отсекается уникальным ключом в базе).
+Поэтому по умолчанию запускается один процесс.
+"""
+import importlib.util
+import os
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import Multiprocess
+
+from src.config import settings
+from src.database.sqlite import is_file_sqlite
+
+
+def split_connection_budget(budget: int, workers: int) -> int:
+    """Количество соединений с базой данных на процесс в пределах общего бюджета.
+
+    Raises:
+        ValueError: если бюджета не хватает хотя бы на одно соединение на процесс
+    """
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise ValueError(f'DB_CONNECTION_BUDGET={budget} меньше количества процессов ({workers})')
+    return per_worker
+
+
+def apply_connection_budget(workers: int) -> None:
+    """Ограничение пулов соединений процессов общим бюджетом DB_CONNECTION_BUDGET.
+
+    Настройки передаются процессам через переменные окружения. Весь бюджет процесса
+    отдается постоянному пулу без переполнения: соединения сверх пула все равно
+    нарушили бы бюджет, а при нехватке запросы ждут освобождения соединения.
+    Бюджет действует на каждую базу данных (основную и каждую реплику) отдельно.
+    """
+    if settings.DB_CONNECTION_BUDGET <= 0:
+        return
+    if is_file_sqlite(settings.DB_URL):
+        # Пулы SQLite задаются профилем SQLite, соединения с сервером не расходуются
+        return
+    per_worker = split_connection_budget(settings.DB_CONNECTION_BUDGET, workers)
+    os.environ['DB_POOL_SIZE'] = str(per_worker)
+    os.environ['DB_MAX_OVERFLOW'] = '0'
+    logger.info(
+        'Бюджет соединений {}: {} процесс(ов) по {} соединений',
+        settings.DB_CONNECTION_BUDGET, workers, per_worker,
+    )
+
+
+def main() -> None:
+    workers = max(1, settings.WEB_WORKERS)
+    apply_connection_budget(workers)
+
+    # uvloop и httptools входят в uvicorn[standard], без них используются asyncio и h11
+    loop = 'uvloop' if importlib.util.find_spec('uvloop') else 'asyncio'
+    http = 'httptools' if importlib.util.find_spec('httptools') else 'h11'
+    logger.info('Запуск {} процесс(ов), цикл событий {}, HTTP-парсер {}', workers, loop, http)
+    if workers > 1:
+        logger.warning(
+            'WEB_WORKERS={}: события заказов, /metrics, кэш меню и ожидание повторов '
+            'Idempotency-Key действуют в пределах одного процесса', workers,
+        )
+
+    config = uvicorn.Config(
+        app='src.main:app',
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        # Журнал запросов пишет приложение (AccessLogMiddleware) с выборкой
+        access_log=False,
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_TIMEOUT),
+    )
+    server = uvicorn.Server(config)
+    # Супервизор используется и для одного процесса: он перезапускает упавшие
+    # процессы и выполняет перезагрузку по SIGHUP
+    sock = config.bind_socket()
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Внутрипроцессный кэш сериализованных ответов API."""
+import hashlib
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """Готовое тело ответа и его ETag."""
+
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class VersionedResponseCache:
+    """Кэш сериализованных ответов, инвалидируемый счетчиком версий.
+
+    Любая запись увеличивает версию через `bump`, после чего все ранее
+    сохраненные ответы считаются устаревшими. Ответ, подготовленный по данным
+    предыдущей версии, не сохраняется. TTL ограничивает устаревание данных,
+    измененных другим процессом.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._version = 0
+        self._entries: dict[Hashable, CachedResponse] = {}
+
+    @property
+    def version(self) -> int:
+        """Текущая версия данных."""
+        return self._version
+
+    def bump(self) -> None:
+        """Увеличение версии и сброс всех сохраненных ответов."""
+        self._version += 1
+        self._entries.clear()
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """Получение актуального ответа по ключу, если он есть."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def set(self, key: Hashable, version: int, body: bytes) -> CachedResponse:
+        """Сохранение ответа, подготовленного по данным версии `version`."""
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            created_at=time.monotonic(),
+        )
+        if version != self._version:
+            return entry
+
+        if len(self._entries) >= self.max_entries:
+            # Вытесняем самую старую запись (словарь сохраняет порядок вставки)
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = entry
+        return entry
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверка заголовка If-None-Match на совпадение с ETag (слабое сравнение)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
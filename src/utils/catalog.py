@@ -0,0 +1,132 @@
+"""Снимок каталога блюд в памяти процесса для проверки блюд в заказах."""
+import asyncio
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from operator import itemgetter
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDish:
+    """Блюдо из снимка каталога (поля, которые возвращаются в составе заказа)."""
+
+    id: int
+    name: str
+    price: float
+    category: str
+
+
+class DishCatalog:
+    """Неизменяемый снимок каталога блюд: ID -> (название, цена, категория).
+
+    ID хранятся в отсортированном массиве `array('q')`, цены - в `array('d')`,
+    названия и категории - в кортежах с теми же индексами. Поиск бинарный,
+    объекты блюд создаются только для найденных ID.
+    """
+
+    __slots__ = ('version', 'created_at', '_ids', '_names', '_prices', '_categories')
+
+    def __init__(self, rows: Iterable[tuple[int, str, float, str]], version: int) -> None:
+        rows = sorted(rows, key=itemgetter(0))
+        self.version = version
+        self.created_at = time.monotonic()
+        self._ids = array('q', [row[0] for row in rows])
+        self._names = tuple(row[1] for row in rows)
+        self._prices = array('d', [row[2] for row in rows])
+        self._categories = tuple(row[3] for row in rows)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def max_id(self) -> int:
+        """Наибольший ID в снимке (0 для пустого каталога)."""
+        return self._ids[-1] if self._ids else 0
+
+    def _index(self, dish_id: int) -> int:
+        index = bisect_left(self._ids, dish_id)
+        if index < len(self._ids) and self._ids[index] == dish_id:
+            return index
+        return -1
+
+    def get(self, dish_id: int) -> CatalogDish | None:
+        """Блюдо по ID или None, если его нет в снимке."""
+        index = self._index(dish_id)
+        if index < 0:
+            return None
+        return CatalogDish(dish_id, self._names[index], self._prices[index], self._categories[index])
+
+    def get_many(self, dish_ids: Iterable[int]) -> dict[int, CatalogDish]:
+        """Найденные в снимке блюда по ID (отсутствующие ID пропускаются)."""
+        found = {}
+        for dish_id in dish_ids:
+            if dish_id not in found:
+                dish = self.get(dish_id)
+                if dish is not None:
+                    found[dish_id] = dish
+        return found
+
+
+class DishCatalogIndex:
+    """Текущий снимок каталога блюд с проверкой версии.
+
+    Создание и удаление блюд в этом процессе увеличивают версию через `bump`,
+    и снимок другой версии перестраивается при следующем обращении. Изменения
+    из других процессов учитываются по TTL, а ID больше наибольшего ID снимка
+    (блюдо могло быть создано другим процессом) вызывают перестроение не чаще
+    одного раза в `min_refresh_interval`. Снимок заменяется целиком одной
+    ссылкой, поэтому читатели всегда видят согласованный каталог.
+    """
+
+    def __init__(self, ttl: float, min_refresh_interval: float) -> None:
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._version = 0
+        self._snapshot: DishCatalog | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        """Текущая версия каталога."""
+        return self._version
+
+    def bump(self) -> None:
+        """Увеличение версии: текущий снимок будет перестроен при следующем обращении."""
+        self._version += 1
+
+    def _fresh(self, dish_ids: Sequence[int]) -> DishCatalog | None:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            return None
+        age = time.monotonic() - snapshot.created_at
+        if age > self.ttl:
+            return None
+        if age > self.min_refresh_interval and any(dish_id > snapshot.max_id for dish_id in dish_ids):
+            return None
+        return snapshot
+
+    async def get(
+            self,
+            loader: Callable[[], Awaitable[Iterable[tuple[int, str, float, str]]]],
+            dish_ids: Sequence[int] = (),
+    ) -> DishCatalog:
+        """Актуальный снимок для проверки `dish_ids`; устаревший перестраивается через `loader`.
+
+        Одновременно снимок перестраивает только одна корутина, остальные ждут ее результат.
+        """
+        snapshot = self._fresh(dish_ids)
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._fresh(dish_ids)
+            if snapshot is not None:
+                return snapshot
+            version = self._version
+            snapshot = DishCatalog(await loader(), version)
+            # Снимок, построенный по данным предыдущей версии, не сохраняется
+            if version == self._version:
+                self._snapshot = snapshot
+            return snapshot
@@ -17,11 +17,14 @@ ORDER_NOT_FOUND_MSG = "Заказ не найден"
 ORDER_CANNOT_BE_CANCELLED_MSG = "Отменить заказ можно только в статусе 'в обработке'"
 ORDER_INVALID_STATUS_TRANSITION_MSG = "Недопустимый переход статуса заказа"
 ORDER_EMPTY_DISHES_MSG = "Заказ должен содержать хотя бы одно блюдо"
+ORDER_DISHES_NOT_FOUND_MSG = "Некоторые из указанных блюд не существуют"
 
 # Общие
 INVALID_ID_MSG = "Неверный ID"
 VALIDATION_ERROR_MSG = "Ошибка валидации данных"
 INTERNAL_SERVER_ERROR_MSG = "Внутренняя ошибка сервера"
+INVALID_CURSOR_MSG = "Некорректный курсор пагинации"
+IDEMPOTENCY_KEY_REUSED_MSG = "Ключ идемпотентности уже использован для другого запроса"
 
 
 # ===============================
@@ -50,16 +53,42 @@ class OrderStatus(str, Enum):
             cls.CANCELLED: []   # Финальный статус
         }
     
+    @classmethod
+    def get_allowed_predecessors(cls, to_status: str) -> list[str]:
+        """Возвращает статусы, из которых допустим переход в указанный статус."""
+        return [
+            from_status
+            for from_status, to_statuses in cls.get_valid_transitions().items()
+            if to_status in to_statuses
+        ]
+    
     @classmethod
     def can_transition(cls, from_status: str, to_status: str) -> bool:
         """Проверяет, возможен ли переход между статусами."""
         transitions = cls.get_valid_transitions()
         return to_status in transitions.get(from_status, [])
     
+    @classmethod
+    def get_cancellable_statuses(cls) -> list[str]:
+        """Возвращает статусы, в которых заказ можно отменить."""
+        return [cls.PROCESSING, cls.PREPARING]
+
+    @classmethod
+    def get_final_statuses(cls) -> list[str]:
+        """Возвращает финальные статусы (такие заказы переносятся в архив)."""
+        return [cls.COMPLETED, cls.CANCELLED]
+
     @classmethod
     def can_be_cancelled(cls, status: str) -> bool:
         """Проверяет, можно ли отменить заказ в данном статусе."""
-        return status in [cls.PROCESSING, cls.PREPARING]
+        return status in cls.get_cancellable_statuses()
+
+
+class OrderSort(str, Enum):
+    """Порядок списка заказов по времени заказа."""
+
+    OLDEST = "order_time"          # Сначала старые
+    NEWEST = "-order_time"         # Сначала новые
 
 
 # ===============================
@@ -87,16 +116,28 @@ MIN_DISH_PRICE = 0.01           # Минимальная цена блюда
 MAX_DISH_PRICE = 99999.99       # Максимальная цена блюда
 MAX_DISH_NAME_LENGTH = 100      # Максимальная длина названия блюда
 MAX_DISH_DESCRIPTION_LENGTH = 500  # Максимальная длина описания
+MAX_DISH_SEARCH_LENGTH = 100    # Максимальная длина поискового запроса по блюдам
+MAX_DISH_SALES_BATCH_SIZE = 500  # Максимальное количество блюд в запросе продаж
 
 # Заказы
 MIN_ORDER_DISHES = 1            # Минимальное количество блюд в заказе
 MAX_ORDER_DISHES = 50           # Максимальное количество блюд в заказе
 MAX_CUSTOMER_NAME_LENGTH = 100  # Максимальная длина имени клиента
+MAX_ORDERS_BATCH_SIZE = 500     # Максимальное количество заказов в пакетном запросе
 
 # Пагинация
 DEFAULT_PAGE_SIZE = 20          # Размер страницы по умолчанию
 MAX_PAGE_SIZE = 100            # Максимальный размер страницы
 
+# Подсчет заказов без статистики планировщика (не PostgreSQL): предел точного подсчета
+ORDER_COUNT_LIMIT = 10000
+
+# Выгрузка
+EXPORT_CHUNK_SIZE = 1000        # Количество заказов, читаемых с курсора за раз
+
+# Идемпотентность
+MAX_IDEMPOTENCY_KEY_LENGTH = 255  # Максимальная длина заголовка Idempotency-Key
+
 
 # ===============================
 # HTTP КОДЫ ОТВЕТОВ
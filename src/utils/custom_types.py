@@ -4,8 +4,10 @@ from datetime import datetime
 from typing import Annotated, Any
 from uuid import uuid4
 
-from sqlalchemy import UUID, DateTime, Integer, String, Float, text
+from sqlalchemy import UUID, DateTime, Integer, String, Float
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import mapped_column
+from sqlalchemy.sql.functions import FunctionElement
 from src.utils.constants import OrderStatus
 
 # Тип для асинхронных функций
@@ -15,8 +17,29 @@ AsyncFunc = Callable[..., Awaitable[Any]]
 integer_pk = Annotated[int, mapped_column(Integer, primary_key=True, index=True)]
 uuid_pk = Annotated[uuid4, mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)]
 
+
+class utcnow(FunctionElement):
+    """Текущее время UTC без часового пояса, вычисляемое базой данных."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _compile_utcnow(element, compiler, **kwargs) -> str:
+    return "TIMEZONE('utc', now())"
+
+
+@compiles(utcnow, 'sqlite')
+def _compile_utcnow_sqlite(element, compiler, **kwargs) -> str:
+    # 'now' в SQLite - время UTC, %f - секунды с миллисекундами. Дополнение до микросекунд
+    # дает формат, в котором SQLAlchemy передает DateTime, иначе сравнение строк
+    # с параметрами (ключами keyset-пагинации) ошибается при совпадении миллисекунд
+    # Миграции задают это выражение литералом, его изменение требует новой миграции
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
 # SQL выражения для временных меток
-dt_now_utc_sql = text("TIMEZONE('utc', now())")
+dt_now_utc_sql = utcnow()
 
 # Поля аудита времени
 created_at = Annotated[datetime, mapped_column(DateTime, server_default=dt_now_utc_sql)]
@@ -0,0 +1,75 @@
+"""Внутрипроцессная рассылка событий подписчикам (Server-Sent Events)."""
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+from loguru import logger
+
+# Комментарий SSE, который поддерживает соединение открытым через прокси
+HEARTBEAT_FRAME = b': ping\n\n'
+
+
+def sse_frame(event: str, data: Any) -> bytes:
+    """Формирование кадра Server-Sent Events."""
+    return b'event: ' + event.encode() + b'\ndata: ' + orjson.dumps(data) + b'\n\n'
+
+
+class EventHub:
+    """Рассылка событий подписчикам через ограниченные очереди.
+
+    Публикация никогда не ждет подписчиков: если очередь подписчика
+    переполнена, он считается медленным и отключается. Клиент SSE
+    после этого переподключается самостоятельно.
+    """
+
+    def __init__(self, queue_size: int, heartbeat: float) -> None:
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._subscribers: set[asyncio.Queue[bytes | None]] = set()
+
+    @property
+    def subscribers_count(self) -> int:
+        """Количество активных подписчиков."""
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Отправка события всем подписчикам (сериализуется один раз)."""
+        if not self._subscribers:
+            return
+        frame = sse_frame(event, data)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning('Отключен медленный подписчик событий')
+                self._disconnect(queue)
+
+    def close(self) -> None:
+        """Отключение всех подписчиков (при остановке приложения)."""
+        for queue in list(self._subscribers):
+            self._disconnect(queue)
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Поток кадров SSE для одного подписчика с периодическим heartbeat."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=self.heartbeat)
+                except TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._subscribers.discard(queue)
+
+    def _disconnect(self, queue: asyncio.Queue[bytes | None]) -> None:
+        """Отключение подписчика: очередь очищается и получает маркер завершения."""
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
@@ -0,0 +1,86 @@
+"""Внутрипроцессный кэш ответов на запросы с ключами идемпотентности."""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import orjson
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResponse:
+    """Сохраненный ответ на запрос с ключом идемпотентности."""
+
+    request_hash: str
+    status_code: int
+    body: bytes
+    expires_at: datetime
+
+
+class IdempotencyCache:
+    """LRU-кэш сохраненных ответов перед таблицей ключей идемпотентности.
+
+    Также хранит события выполняющихся запросов: конкурентный запрос с тем же
+    ключом ждет завершения первого, а не выполняет обработчик повторно.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, StoredResponse] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Event] = {}
+        self._last_cleanup = time.monotonic()
+
+    def get(self, key: Hashable) -> StoredResponse | None:
+        """Получение непросроченного ответа по ключу."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= utcnow():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: StoredResponse) -> None:
+        """Сохранение ответа с вытеснением давно не использованных записей."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def inflight(self, key: Hashable) -> asyncio.Event | None:
+        """Событие завершения выполняющегося запроса с этим ключом, если он есть."""
+        return self._inflight.get(key)
+
+    def start(self, key: Hashable) -> asyncio.Event:
+        """Регистрация выполняющегося запроса."""
+        event = self._inflight[key] = asyncio.Event()
+        return event
+
+    def finish(self, key: Hashable) -> None:
+        """Завершение запроса (успешное или нет) и пробуждение ожидающих."""
+        event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def cleanup_due(self, interval: float) -> bool:
+        """Проверка, пора ли удалять просроченные ключи из базы (не чаще раза в `interval` секунд)."""
+        now = time.monotonic()
+        if now - self._last_cleanup < interval:
+            return False
+        self._last_cleanup = now
+        return True
+
+
+def request_fingerprint(data: BaseModel) -> str:
+    """SHA-256 тела запроса для сравнения повторов с одинаковым ключом."""
+    return hashlib.sha256(orjson.dumps(data.model_dump(mode='json'), option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def utcnow() -> datetime:
+    """Текущее время UTC без часового пояса (как хранится в базе)."""
+    return datetime.now(UTC).replace(tzinfo=None)
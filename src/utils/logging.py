@@ -0,0 +1,206 @@
+"""Неблокирующая запись логов: ограниченная очередь и фоновый поток записи."""
+import os
+import queue
+import sys
+import threading
+import traceback
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import orjson
+from loguru import logger
+
+from src.config import settings
+from src.utils.metrics import metrics
+
+# Максимальное количество записей, которые фоновый поток записывает за один раз
+WRITE_BATCH_SIZE = 500
+
+
+class RotatingFile:
+    """Файл лога с ротацией по размеру и сжатием старых файлов в zip.
+
+    В файл пишет один процесс: при нескольких процессах каждый пишет в свой
+    файл (см. process_log_path), поэтому сжимается только файл, в который
+    больше никто не пишет. Сжатие выполняется в отдельном потоке.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open('ab')
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+        if self.max_bytes > 0 and os.fstat(self._file.fileno()).st_size >= self.max_bytes:
+            self._rotate()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        suffix = f'{datetime.now():%Y-%m-%d_%H-%M-%S_%f}{self.path.suffix}'
+        rotated = self.path.with_name(f'{self.path.stem}.{suffix}')
+        try:
+            self.path.rename(rotated)
+        except OSError as exc:
+            # Файл удален или переименован извне: запись продолжается в новый файл
+            sys.stderr.write(f'Ошибка ротации лога: {exc}\n')
+        else:
+            threading.Thread(target=_compress, args=(rotated,), name='log-compress').start()
+        finally:
+            self._file = self.path.open('ab')
+
+
+def process_log_path(path: str, pid: int) -> str:
+    """Путь к файлу лога процесса: ID процесса добавляется перед расширением (logs.json -> logs.123.json)."""
+    file = Path(path)
+    return str(file.with_name(f'{file.stem}.{pid}{file.suffix}'))
+
+
+def _compress(path: Path) -> None:
+    with zipfile.ZipFile(path.with_name(path.name + '.zip'), 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.write(path, arcname=path.name)
+    path.unlink()
+
+
+class LogWriter:
+    """Запись логов loguru в фоновом потоке.
+
+    Sink только кладет запись в ограниченную очередь и никогда не ждет: при
+    переполнении запись отбрасывается и учитывается в метрике
+    `log_records_total{result="dropped"}`. Форматирование, вывод на консоль,
+    запись в файл (JSON по строке на запись), ротация и сжатие выполняются
+    фоновым потоком. С `per_process` каждый процесс пишет в свой файл с ID
+    процесса в имени, чтобы процессы не ротировали файлы друг друга.
+    """
+
+    def __init__(
+            self, queue_size: int, path: str | None, rotation_bytes: int, console: bool, per_process: bool = False,
+    ) -> None:
+        self.path = path
+        self.rotation_bytes = rotation_bytes
+        self.console = console
+        self.per_process = per_process
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._handler_id: int | None = None
+
+    def start(self, level: str) -> None:
+        """Запуск фонового потока и замена обработчиков loguru на очередь."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        logger.remove()
+        self._handler_id = logger.add(self.write, level=level, format='{message}')
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Запись оставшихся в очереди записей и остановка фонового потока."""
+        if self._thread is None:
+            return
+        logger.remove(self._handler_id)
+        logger.add(sys.stderr)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def write(self, message: Any) -> None:
+        """Sink loguru: постановка записи в очередь без ожидания."""
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            metrics.observe_log_records('dropped')
+
+    def _run(self) -> None:
+        file = None
+        if self.path:
+            path = process_log_path(self.path, os.getpid()) if self.per_process else self.path
+            file = RotatingFile(path, self.rotation_bytes)
+        reported_dropped = 0
+        stopping = False
+        while not stopping:
+            records = [self._queue.get()]
+            while len(records) < WRITE_BATCH_SIZE:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = records[-1] is None
+            entries = [_entry(record) for record in records if record is not None]
+
+            dropped = metrics.log_records['dropped'] - reported_dropped
+            if dropped:
+                reported_dropped += dropped
+                entries.append(_dropped_entry(dropped))
+
+            try:
+                if file is not None:
+                    file.write(b''.join(
+                        orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+                        for entry in entries
+                    ))
+                if self.console:
+                    sys.stderr.write(''.join(_console_line(entry) for entry in entries))
+                    sys.stderr.flush()
+            except (OSError, ValueError) as exc:
+                sys.stderr.write(f'Ошибка записи лога: {exc}\n')
+            metrics.observe_log_records('written', len(entries))
+        if file is not None:
+            file.close()
+
+
+def _entry(record: dict[str, Any]) -> dict[str, Any]:
+    """Структурированная запись лога из записи loguru."""
+    entry = {
+        'time': record['time'].isoformat(),
+        'level': record['level'].name,
+        'message': record['message'],
+        'logger': record['name'],
+        'function': record['function'],
+        'line': record['line'],
+        'process': record['process'].id,
+    }
+    if record['extra']:
+        entry['extra'] = record['extra']
+    if record['exception'] is not None:
+        entry['exception'] = ''.join(traceback.format_exception(*record['exception']))
+    return entry
+
+
+def _dropped_entry(count: int) -> dict[str, Any]:
+    return {
+        'time': datetime.now().astimezone().isoformat(),
+        'level': 'WARNING',
+        'message': f'Очередь лога переполнена, отброшено записей: {count}',
+        'logger': __name__,
+        'function': '_run',
+        'line': 0,
+        'process': os.getpid(),
+    }
+
+
+def _console_line(entry: dict[str, Any]) -> str:
+    source = f"{entry['logger']}:{entry['function']}:{entry['line']}"
+    line = f"{entry['time']} | {entry['level']: <8} | {source} - {entry['message']}\n"
+    if 'exception' in entry:
+        line += entry['exception']
+    return line
+
+
+log_writer = LogWriter(
+    queue_size=settings.LOG_QUEUE_SIZE,
+    path=settings.LOG_FILE or None,
+    rotation_bytes=settings.LOG_ROTATION_BYTES,
+    console=settings.LOG_CONSOLE,
+    # Процессы python -m src.server пишут каждый в свой файл
+    per_process=settings.WEB_WORKERS > 1,
+)
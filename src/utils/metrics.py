@@ -0,0 +1,208 @@
+"""Метрики запросов и базы данных в формате Prometheus."""
+import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Метки результатов поиска в кэше компиляции SQLAlchemy
+CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: 'hit',
+    CacheStats.CACHE_MISS: 'miss',
+    CacheStats.CACHING_DISABLED: 'disabled',
+    CacheStats.NO_CACHE_KEY: 'no_cache_key',
+    CacheStats.NO_DIALECT_SUPPORT: 'no_dialect_support',
+}
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Статистика обращений к базе данных в рамках одного HTTP-запроса."""
+
+    statements: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+
+    def server_timing(self, total: float) -> str:
+        """Значение заголовка Server-Timing (длительности в миллисекундах)."""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries", '
+            f'pool;dur={self.pool_wait * 1000:.2f}, '
+            f'app;dur={total * 1000:.2f}'
+        )
+
+
+# Статистика текущего HTTP-запроса (устанавливается MetricsMiddleware)
+current_request_stats: ContextVar[RequestStats | None] = ContextVar('current_request_stats', default=None)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса."""
+
+    def __init__(self) -> None:
+        self.request_duration: dict[tuple[str, ...], Histogram] = {}
+        self.request_db_duration: dict[tuple[str, ...], Histogram] = {}
+        self.request_statements: dict[tuple[str, ...], Histogram] = {}
+        self.pool_checkout = Histogram(LATENCY_BUCKETS)
+        # Результаты поиска в кэше компиляции SQLAlchemy (hit, miss, ...) и в кэше выражений репозиториев
+        self.compiled_cache: dict[str, int] = {}
+        self.statement_cache: dict[str, int] = {'hit': 0, 'miss': 0}
+        # Записи лога: записанные фоновым потоком и отброшенные из-за переполнения очереди
+        self.log_records: dict[str, int] = {'written': 0, 'dropped': 0}
+
+    def observe_request(self, method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+        """Учет завершенного HTTP-запроса."""
+        route_labels = (method, route)
+        self._histogram(self.request_duration, (*route_labels, str(status)), LATENCY_BUCKETS).observe(duration)
+        self._histogram(self.request_db_duration, route_labels, LATENCY_BUCKETS).observe(stats.db_time)
+        self._histogram(self.request_statements, route_labels, STATEMENT_BUCKETS).observe(stats.statements)
+
+    def observe_pool_checkout(self, duration: float) -> None:
+        """Учет времени ожидания соединения из пула."""
+        self.pool_checkout.observe(duration)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.pool_wait += duration
+
+    def observe_compiled_cache(self, result: str) -> None:
+        """Учет результата поиска выражения в кэше компиляции SQLAlchemy."""
+        self.compiled_cache[result] = self.compiled_cache.get(result, 0) + 1
+
+    def observe_statement_cache(self, hit: bool) -> None:
+        """Учет результата поиска выражения в кэше репозиториев."""
+        self.statement_cache['hit' if hit else 'miss'] += 1
+
+    def observe_log_records(self, result: str, count: int = 1) -> None:
+        """Учет записей лога (written или dropped)."""
+        self.log_records[result] += count
+
+    def render(self) -> str:
+        """Экспорт метрик в текстовом формате Prometheus."""
+        lines: list[str] = []
+        _render_histograms(
+            lines, 'http_request_duration_seconds', 'Длительность обработки HTTP-запроса.',
+            ('method', 'route', 'status'), self.request_duration,
+        )
+        _render_histograms(
+            lines, 'http_request_db_duration_seconds', 'Время выполнения SQL-запросов за HTTP-запрос.',
+            ('method', 'route'), self.request_db_duration,
+        )
+        _render_histograms(
+            lines, 'http_request_db_statements', 'Количество SQL-запросов за HTTP-запрос.',
+            ('method', 'route'), self.request_statements,
+        )
+        _render_histograms(
+            lines, 'db_pool_checkout_seconds', 'Время ожидания соединения из пула.',
+            (), {(): self.pool_checkout},
+        )
+        _render_counter(
+            lines, 'sqlalchemy_compiled_cache_total', 'Поиск SQL-выражений в кэше компиляции SQLAlchemy.',
+            self.compiled_cache,
+        )
+        _render_counter(
+            lines, 'repository_statement_cache_total', 'Поиск заранее построенных выражений репозиториев.',
+            self.statement_cache,
+        )
+        _render_counter(
+            lines, 'log_records_total', 'Записи лога: записанные и отброшенные при переполнении очереди.',
+            self.log_records,
+        )
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _histogram(
+            histograms: dict[tuple[str, ...], Histogram], labels: tuple[str, ...], bounds: Sequence[float],
+    ) -> Histogram:
+        histogram = histograms.get(labels)
+        if histogram is None:
+            histogram = histograms[labels] = Histogram(bounds)
+        return histogram
+
+
+def _render_histograms(
+        lines: list[str],
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        histograms: dict[tuple[str, ...], Histogram],
+) -> None:
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} histogram')
+    for label_values, histogram in list(histograms.items()):
+        labels = ','.join(f'{key}="{_escape(value)}"' for key, value in zip(label_names, label_values, strict=True))
+        prefix = f'{labels},' if labels else ''
+        cumulative = 0
+        for bound, count in zip((*histogram.bounds, '+Inf'), histogram.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        suffix = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {histogram.sum}')
+        lines.append(f'{name}_count{suffix} {histogram.count}')
+
+
+def _render_counter(lines: list[str], name: str, description: str, values: dict[str, int]) -> None:
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} counter')
+    for result, value in list(values.items()):
+        lines.append(f'{name}{{result="{result}"}} {value}')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - conn.info['query_start_time'].pop()
+    if context is not None:
+        metrics.observe_compiled_cache(CACHE_RESULTS[context.cache_hit])
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += duration
+
+
+def _handle_error(exception_context) -> None:
+    # Запрос завершился ошибкой и after_cursor_execute не будет вызван
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_start_time'):
+        conn.info['query_start_time'].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключение учета SQL-запросов к движку (повторный вызов ничего не делает)."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(sync_engine, 'handle_error', _handle_error)
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,47 @@
+"""Утилиты для курсорной (keyset) пагинации."""
+import base64
+import binascii
+from typing import Any
+
+import orjson
+from fastapi import HTTPException
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from src.utils.constants import INVALID_CURSOR_MSG
+
+
+def encode_cursor(*values: Any) -> str:
+    """Кодирует значения ключа последней записи страницы в непрозрачный курсор."""
+    raw = orjson.dumps(values)
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Декодирует курсор обратно в список значений ключа.
+
+    Raises:
+        HTTPException: если курсор поврежден или не соответствует ожидаемому формату
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = orjson.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=INVALID_CURSOR_MSG)
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=INVALID_CURSOR_MSG)
+    return values
+
+
+def cursor_value(value: Any, *types: type) -> Any:
+    """Проверяет тип значения ключа из курсора.
+
+    bool не принимается как число, хотя в Python это подкласс int:
+    `true` в поддельном курсоре - ошибка, а не ID 1.
+
+    Raises:
+        HTTPException: если значение не относится ни к одному из типов `types`
+    """
+    if isinstance(value, bool) or not isinstance(value, types):
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=INVALID_CURSOR_MSG)
+    return value
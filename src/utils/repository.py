@@ -1,12 +1,51 @@
 """Модуль содержит абстрактный репозиторий."""
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Callable, Hashable, Sequence
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import ColumnElement, Executable, any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.utils.metrics import metrics
+
+
+class StatementCache:
+    """Кэш заранее построенных SQL-выражений.
+
+    Ключ описывает форму запроса (модель, операция, набор полей фильтра),
+    а значения передаются через bindparam при выполнении. Выражение строится
+    один раз, и SQLAlchemy находит его в кэше компиляции без повторного
+    построения дерева выражения.
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[Hashable, Executable] = {}
+
+    def get(self, key: Hashable, build: Callable[[], Executable]) -> Executable:
+        """Получение выражения по ключу с построением при первом обращении."""
+        statement = self._statements.get(key)
+        metrics.observe_statement_cache(statement is not None)
+        if statement is None:
+            statement = self._statements[key] = build()
+        return statement
+
+
+statement_cache = StatementCache()
+
+
+def ids_criterion(column: Any, dialect_name: str, name: str = 'ids') -> ColumnElement[bool]:
+    """Условие принадлежности столбца списку значений с одним параметром `name`.
+
+    На PostgreSQL - `column = ANY(:name)` с массивом: текст запроса не зависит от
+    длины списка, поэтому подготовленное выражение драйвера переиспользуется.
+    На остальных базах - раскрывающийся IN, который кэшируется SQLAlchemy.
+    """
+    if dialect_name == 'postgresql':
+        return column == any_(bindparam(name, type_=ARRAY(column.type)))
+    return column.in_(bindparam(name, expanding=True))
+
 
 class AbstractRepository(ABC):
     """Абстрактный класс репозитория, реализующий CRUD операции на уровне репозитория."""
@@ -41,6 +80,11 @@ class AbstractRepository(ABC):
         """Получение всех записей по указанному фильтру."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_by_ids(self, ids: Sequence[int | str | UUID]) -> Sequence[Any]:
+        """Получение записей по списку ID."""
+        raise NotImplementedError
+
     @abstractmethod
     async def update_one_by_id(self, obj_id: int | str | UUID, **kwargs: Any) -> Any:
         """Обновление одной записи по её ID."""
@@ -56,6 +100,11 @@ class AbstractRepository(ABC):
         """Массовое удаление записей по переданным ID."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def delete_one_by_id(self, obj_id: int | str | UUID, *conditions: Any) -> bool:
+        """Удаление одной записи по ID при выполнении дополнительных условий."""
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_all(self) -> None:
         """Массовое удаление всех записей."""
@@ -97,33 +146,110 @@ class BaseRepository(AbstractRepository):
 
     async def get_by_filter_one_or_none(self, **kwargs: Any) -> Any:
         """Получение одной записи по заданному фильтру, если она существует."""
-        query = select(self.model).filter_by(**kwargs)
-        result = await self.session.execute(query)
+        query, params = self._filtered('select', kwargs, lambda criteria: select(self.model).where(*criteria))
+        result = await self.session.execute(query, params)
         return result.scalar_one_or_none()
 
     async def get_by_filter_all(self, **kwargs: Any) -> Sequence[Any]:
         """Получение всех записей по указанному фильтру."""
-        query = select(self.model).filter_by(**kwargs)
-        result = await self.session.execute(query)
+        query, params = self._filtered('select', kwargs, lambda criteria: select(self.model).where(*criteria))
+        result = await self.session.execute(query, params)
+        return result.scalars().all()
+
+    async def get_by_ids(self, ids: Sequence[int | str | UUID]) -> Sequence[Any]:
+        """Получение записей по списку ID (один запрос с параметром-списком)."""
+        if not ids:
+            return []
+        dialect_name = self.session.bind.dialect.name
+        query = statement_cache.get(
+            (self.model, 'get_by_ids', dialect_name),
+            lambda: select(self.model).where(ids_criterion(self.model.id, dialect_name)),
+        )
+        result = await self.session.execute(query, {'ids': list(ids)})
         return result.scalars().all()
 
     async def update_one_by_id(self, obj_id: int | str | UUID, **kwargs: Any) -> Any:
         """Обновление одной записи по её ID."""
-        query = update(self.model).where(self.model.id == obj_id).values(**kwargs).returning(self.model)
-        result = await self.session.execute(query)
+        query = statement_cache.get(
+            (self.model, 'update_one_by_id', tuple(sorted(kwargs))),
+            lambda: (
+                update(self.model)
+                .where(self.model.id == bindparam('obj_id'))
+                .values({name: bindparam(f'value_{name}') for name in kwargs})
+                .returning(self.model)
+                # Объект в сессии обновляется строкой из RETURNING
+                .execution_options(synchronize_session=False, populate_existing=True)
+            ),
+        )
+        params = {f'value_{name}': value for name, value in kwargs.items()}
+        result = await self.session.execute(query, {'obj_id': obj_id, **params})
         return result.scalar_one_or_none()
 
     async def delete_by_filter(self, **kwargs: Any) -> None:
         """Массовое удаление записей по фильтру."""
-        query = delete(self.model).filter_by(**kwargs)
-        await self.session.execute(query)
+        query, params = self._filtered(
+            'delete', kwargs,
+            lambda criteria: delete(self.model).where(*criteria).execution_options(synchronize_session='fetch'),
+        )
+        await self.session.execute(query, params)
 
     async def delete_by_ids(self, *args: int | str | UUID) -> None:
         """Массовое удаление записей по переданным ID."""
-        query = delete(self.model).where(self.model.id.in_(args))
-        await self.session.execute(query)
+        if not args:
+            return
+        dialect_name = self.session.bind.dialect.name
+        query = statement_cache.get(
+            (self.model, 'delete_by_ids', dialect_name),
+            lambda: (
+                delete(self.model)
+                .where(ids_criterion(self.model.id, dialect_name))
+                .execution_options(synchronize_session='fetch')
+            ),
+        )
+        await self.session.execute(query, {'ids': list(args)})
+
+    async def delete_one_by_id(self, obj_id: int | str | UUID, *conditions: Any) -> bool:
+        """Удаление одной записи по ID при выполнении дополнительных условий.
+
+        Выполняется одним запросом DELETE ... WHERE id = :id AND <conditions> RETURNING id.
+
+        Returns:
+            True, если запись удалена, иначе False (не найдена или условия не выполнены)
+        """
+        query = (
+            delete(self.model)
+            .where(self.model.id == obj_id, *conditions)
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none() is not None
 
     async def delete_all(self) -> None:
         """Массовое удаление всех записей."""
         query = delete(self.model)
-        await self.session.execute(query) 
\ No newline at end of file
+        await self.session.execute(query)
+
+    def _filtered(
+            self,
+            operation: str,
+            filters: dict[str, Any],
+            build: Callable[[list[ColumnElement[bool]]], Executable],
+    ) -> tuple[Executable, dict[str, Any]]:
+        """Выражение с фильтром по равенству полей из кэша и параметры для него.
+
+        Форма фильтра - имена полей и то, какие из них равны None (IS NULL
+        не передается параметром), значения передаются как `filter_<поле>`.
+        """
+        shape = tuple((name, filters[name] is None) for name in sorted(filters))
+
+        def build_statement() -> Executable:
+            criteria = [
+                getattr(self.model, name).is_(None) if is_null
+                else getattr(self.model, name) == bindparam(f'filter_{name}')
+                for name, is_null in shape
+            ]
+            return build(criteria)
+
+        query = statement_cache.get((self.model, operation, shape), build_statement)
+        return query, {f'filter_{name}': value for name, value in filters.items() if value is not None}
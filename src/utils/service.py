@@ -18,13 +18,20 @@ T = TypeVar('T', bound=AsyncFunc)
 @overload
 def transaction_mode(_func: T) -> T: ...
 @overload
-def transaction_mode(*, auto_flush: bool) -> Callable[[T], T]: ...
+def transaction_mode(*, auto_flush: bool = False, readonly: bool = False) -> Callable[[T], T]: ...
 
 
-def transaction_mode(_func: T | None = None, *, auto_flush: bool = False) -> T | Callable[[T], T]:
+def transaction_mode(
+        _func: T | None = None,
+        *,
+        auto_flush: bool = False,
+        readonly: bool = False,
+) -> T | Callable[[T], T]:
     """Обертывает функцию в транзакционный режим.
     Проверяет, открыт ли контекстный менеджер UnitOfWork.
     Если нет, то открывает контекстный менеджер и открывает транзакцию.
+    С `readonly=True` новая транзакция открывается на реплике для чтения (если она настроена),
+    вложенный вызов использует уже открытую транзакцию.
     """
 
     def decorator(func: T) -> T:
@@ -35,12 +42,13 @@ def transaction_mode(_func: T | None = None, *, auto_flush: bool = False) -> T |
                 if auto_flush:
                     await self.uow.flush()
                 return res
+            self.uow.readonly = readonly
             async with self.uow:
                 return await func(self, *args, **kwargs)
 
         return wrapper
 
-    if _func is None:  # Использование с параметрами: @transaction_mode(auto_flush=True)
+    if _func is None:  # Использование с параметрами: @transaction_mode(auto_flush=True) / (readonly=True)
         return decorator
     return decorator(_func)  # Использование без параметров: @transaction_mode
 
@@ -95,6 +103,11 @@ class AbstractService(ABC):
         """Массовое удаление записей по переданным ID."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def delete_one_by_id(self, *args: Any, **kwargs: Any) -> Never:
+        """Удаление одной записи по ID при выполнении дополнительных условий."""
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_all(self, *args: Any, **kwargs: Any) -> Never:
         """Массовое удаление всех записей."""
@@ -154,6 +167,10 @@ class BaseService(AbstractService):
     async def delete_by_ids(self, *args: int | str | UUID) -> None:
         await self._get_related_repo().delete_by_ids(*args)
 
+    @transaction_mode
+    async def delete_one_by_id(self, obj_id: int | str | UUID, *conditions: Any) -> bool:
+        return await self._get_related_repo().delete_one_by_id(obj_id, *conditions)
+
     @transaction_mode
     async def delete_all(self) -> None:
         await self._get_related_repo().delete_all()
@@ -0,0 +1,174 @@
+"""Журнал медленных SQL-запросов с планами выполнения."""
+import asyncio
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+import orjson
+from loguru import logger
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+
+# ASGI scope текущего HTTP-запроса (устанавливается middleware)
+current_request_scope: ContextVar[dict | None] = ContextVar('current_request_scope', default=None)
+
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (FORMAT JSON) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+# Для остальных запросов (BEGIN, DDL, сам EXPLAIN) план не строится
+EXPLAINABLE_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+MAX_PARAMETERS_LENGTH = 2000
+
+
+class SlowQueryRecorder:
+    """Запись SQL-запросов, выполнявшихся дольше порога.
+
+    Для медленного запроса в фоне, на отдельном соединении, строится план EXPLAIN
+    (без ANALYZE, запрос повторно не выполняется). Одновременно строится не больше
+    `max_pending_explains` планов, остальные запросы записываются без плана.
+    Последние записи хранятся в кольцевом буфере. Значения параметров запроса
+    записываются только с `log_parameters`, иначе - лишь их количество.
+    """
+
+    max_pending_explains = 4
+
+    def __init__(
+            self, threshold: float, buffer_size: int, explain: bool = True, log_parameters: bool = False,
+    ) -> None:
+        self.threshold = threshold
+        self.explain = explain
+        self.log_parameters = log_parameters
+        self._entries: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self._tasks: set[asyncio.Task] = set()
+        self._engines: dict[Engine, AsyncEngine] = {}
+
+    def instrument(self, engine: AsyncEngine, explain_engine: AsyncEngine | None = None) -> None:
+        """Подключение журнала к движку (повторный вызов ничего не делает).
+
+        Args:
+            engine: движок, запросы которого записываются
+            explain_engine: движок для построения планов (по умолчанию `engine`)
+        """
+        sync_engine = engine.sync_engine
+        if self.threshold <= 0 or event.contains(sync_engine, 'before_cursor_execute', self._before_cursor_execute):
+            return
+        self._engines[sync_engine] = explain_engine or engine
+        event.listen(sync_engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(sync_engine, 'after_cursor_execute', self._after_cursor_execute)
+        event.listen(sync_engine, 'handle_error', self._handle_error)
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Последние медленные запросы, начиная с самого нового."""
+        entries = list(reversed(self._entries))
+        return entries[:limit] if limit is not None else entries
+
+    @staticmethod
+    def _before_cursor_execute(conn, *_event_args) -> None:
+        conn.info.setdefault('slow_query_start_time', []).append(time.perf_counter())
+
+    @staticmethod
+    def _handle_error(exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('slow_query_start_time'):
+            conn.info['slow_query_start_time'].pop()
+
+    def _after_cursor_execute(self, conn, _cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - conn.info['slow_query_start_time'].pop()
+        # Собственные запросы EXPLAIN журнала не записываются
+        if duration < self.threshold or context.execution_options.get('slow_query_explain'):
+            return
+
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(),
+            'duration_ms': round(duration * 1000, 2),
+            'route': _current_route(),
+            'statement': statement,
+            'parameters': _format_parameters(parameters) if self.log_parameters else _redact_parameters(parameters),
+            'executemany': executemany,
+            'plan': None,
+        }
+        self._entries.append(entry)
+
+        dialect = conn.dialect.name
+        if (
+                self.explain
+                and not executemany
+                and dialect in EXPLAIN_PREFIXES
+                and statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS)
+                and len(self._tasks) < self.max_pending_explains
+        ):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                engine = self._engines[conn.engine]
+                task = loop.create_task(self._explain(engine, dialect, statement, parameters, entry))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return
+        _log(entry)
+
+    @staticmethod
+    async def _explain(
+            engine: AsyncEngine, dialect: str, statement: str, parameters: Any, entry: dict[str, Any],
+    ) -> None:
+        """Построение плана медленного запроса на отдельном соединении."""
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    EXPLAIN_PREFIXES[dialect] + statement, parameters,
+                    execution_options={'slow_query_explain': True},
+                )
+                rows = result.all()
+            if dialect == 'postgresql':
+                plan = rows[0][0]
+                entry['plan'] = orjson.loads(plan) if isinstance(plan, str) else plan
+            else:
+                entry['plan'] = [row[-1] for row in rows]
+        except Exception as exc:
+            entry['plan_error'] = str(exc)
+        _log(entry)
+
+
+def _current_route() -> str | None:
+    """Шаблон маршрута текущего запроса (или путь, если маршрут еще не определен)."""
+    scope = current_request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get('route')
+    return f"{scope['method']} {route.path if route is not None else scope['path']}"
+
+
+def _format_parameters(parameters: Any) -> str:
+    formatted = repr(parameters)
+    if len(formatted) > MAX_PARAMETERS_LENGTH:
+        return formatted[:MAX_PARAMETERS_LENGTH] + '...'
+    return formatted
+
+
+def _redact_parameters(parameters: Any) -> str:
+    """Параметры без значений: только их количество (для executemany - число наборов)."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f'<скрыто: {len(parameters)} наборов параметров>'
+    return f'<скрыто: {len(parameters or ())} параметров>'
+
+
+def _log(entry: dict[str, Any]) -> None:
+    logger.bind(slow_query=entry).warning(
+        'Медленный SQL-запрос ({} мс, {}): {}',
+        entry['duration_ms'], entry['route'] or '-', ' '.join(entry['statement'].split())[:200],
+    )
+
+
+slow_queries = SlowQueryRecorder(
+    threshold=settings.SLOW_QUERY_THRESHOLD_MS / 1000,
+    buffer_size=settings.SLOW_QUERY_BUFFER_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    log_parameters=settings.SLOW_QUERY_LOG_PARAMETERS,
+)
@@ -1,11 +1,15 @@
 """Модуль содержит Unit of Work для управления транзакциями."""
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import async_session_maker
+from src.database import async_session_maker, replica_router, sqlite_write_lock
 from src.repositories.dish_repository import DishRepository
+from src.repositories.idempotency_key_repository import IdempotencyKeyRepository
 from src.repositories.order_repository import OrderRepository
+from src.utils.metrics import metrics
 
 
 class AbstractUnitOfWork(ABC):
@@ -50,30 +54,71 @@ class UnitOfWork(AbstractUnitOfWork):
         self.session: AsyncSession | None = None
         self._session_factory = async_session_maker
         self._is_open = False
+        self._after_commit: list[Callable[[], None]] = []
+        # Транзакция только для чтения может быть направлена на реплику
+        self.readonly = False
+        self._holds_write_lock = False
 
     async def __aenter__(self):
         """Вход в контекстный менеджер - создание сессии и репозиториев."""
         if self.session is None:
-            self.session = self._session_factory()
+            session_factory = replica_router.get_session_maker() if self.readonly else self._session_factory
+            self.session = session_factory()
             self._is_open = True
+
+            # Соединение берется из пула сразу, чтобы учесть время ожидания
+            # (для SQLite - и ожидание очереди транзакций записи)
+            started = time.perf_counter()
+            if sqlite_write_lock is not None and not self.readonly:
+                await sqlite_write_lock.acquire()
+                self._holds_write_lock = True
+            try:
+                await self.session.connection()
+            except BaseException:
+                await self._close()
+                raise
+            metrics.observe_pool_checkout(time.perf_counter() - started)
         
         # Создание репозиториев с текущей сессией
         self.dishes = DishRepository(self.session)
         self.orders = OrderRepository(self.session)
+        self.idempotency_keys = IdempotencyKeyRepository(self.session)
         
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Выход из контекстного менеджера - закрытие сессии."""
-        if exc_type:
-            await self.rollback()
-        else:
-            await self.commit()
-        
-        if self.session:
-            await self.session.close()
+        hooks, self._after_commit = self._after_commit, []
+        readonly, self.readonly = self.readonly, False
+        try:
+            if exc_type:
+                await self.rollback()
+            else:
+                await self.commit()
+                if not readonly:
+                    replica_router.mark_write()
+        finally:
+            await self._close()
+
+        if not exc_type:
+            for hook in hooks:
+                hook()
+
+    async def _close(self) -> None:
+        """Закрытие сессии и освобождение очереди записи SQLite."""
+        try:
+            if self.session:
+                await self.session.close()
+        finally:
             self.session = None
             self._is_open = False
+            if self._holds_write_lock:
+                self._holds_write_lock = False
+                sqlite_write_lock.release()
+
+    def add_after_commit(self, callback: Callable[[], None]) -> None:
+        """Регистрация функции, вызываемой после успешного подтверждения транзакции."""
+        self._after_commit.append(callback)
 
     async def commit(self):
         """Подтверждение транзакции."""
@@ -15,4 +15,4 @@ alembic upgrade head
 
 # Запускаем приложение
 echo "Starting FastAPI application..."
-python -m src 
\ No newline at end of file
+exec python -m src.server 
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""Общие фикстуры тестов: отдельная тестовая база данных и клиент API."""
+import asyncio
+import os
+from collections.abc import AsyncIterator, Iterator
+
+# Настройки читаются при импорте src.config, поэтому окружение задается до импорта приложения.
+# Тесты пересоздают таблицы, поэтому DB_URL из .env не используется: база задается TEST_DB_URL
+os.environ['DB_URL'] = os.environ.get('TEST_DB_URL', 'sqlite+aiosqlite:///./test_restaurant.db')
+os.environ.setdefault('LOG_FILE', '')
+os.environ.setdefault('LOG_CONSOLE', 'false')
+os.environ.setdefault('LOG_ACCESS_SAMPLE_RATE', '0')
+os.environ.setdefault('SLOW_QUERY_THRESHOLD_MS', '0')
+
+import pytest
+import pytest_asyncio
+from async_asgi_testclient import TestClient
+
+from src.api.v1.services.dish_service import dish_catalog, menu_cache
+from src.database import recreate_all_tables
+from src.main import app
+
+
+@pytest.fixture(scope='session')
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Один цикл событий на все тесты: пулы соединений привязаны к циклу."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope='session')
+async def client() -> AsyncIterator[TestClient]:
+    """Клиент API; приложение запускается один раз (lifespan) на все тесты."""
+    # Прогрев пула при запуске читает таблицы, поэтому они создаются до запуска приложения
+    await recreate_all_tables()
+    async with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clean_database(client: TestClient) -> None:
+    """Пустые таблицы и сброшенные кэши блюд перед каждым тестом."""
+    await recreate_all_tables()
+    menu_cache.bump()
+    dish_catalog.bump()
+
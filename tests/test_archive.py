@@ -0,0 +1,89 @@
+"""Перенос заказов в архив и чтение вместе с архивными заказами."""
+import pytest
+from async_asgi_testclient import TestClient
+
+from src.api.v1.services.dish_service import DishService
+from src.api.v1.services.order_service import OrderService
+from src.utils.constants import ORDER_NOT_FOUND_MSG, OrderStatus
+from src.utils.unit_of_work import UnitOfWork
+from tests.utils import create_dishes, create_order
+
+COMPLETION_CHAIN = (OrderStatus.PREPARING, OrderStatus.READY, OrderStatus.COMPLETED)
+
+
+async def archive_all() -> int:
+    """Перенос в архив всех заказов в финальных статусах (пачками по одному заказу)."""
+    uow = UnitOfWork()
+    return await OrderService(uow, DishService(uow)).archive_finished_orders(older_than_days=-1, chunk_size=1)
+
+
+@pytest.mark.asyncio
+async def test_archived_order_ids_are_not_reused(client: TestClient) -> None:
+    """Новый заказ не получает ID последнего перенесенного в архив заказа."""
+    (dish,) = await create_dishes(client, 1)
+    order = await create_order(client, [dish])
+    for status in COMPLETION_CHAIN:
+        response = await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': status})
+        assert response.status_code == 200, response.text
+    assert await archive_all() == 1
+
+    new_order = await create_order(client, [dish])
+    assert new_order['id'] > order['id']
+
+    response = await client.patch('/api/v1/orders/status', json={
+        'order_ids': [order['id'], new_order['id']], 'status': OrderStatus.PREPARING,
+    })
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result['updated'] == [new_order['id']]
+    (rejected,) = result['rejected']
+    assert rejected['id'] == order['id']
+    assert OrderStatus.COMPLETED in rejected['reason']
+
+
+@pytest.mark.asyncio
+async def test_include_archive_reads(client: TestClient) -> None:
+    """С include_archive списки и продажи блюд учитывают архивные заказы вместе с их блюдами."""
+    soup, salad = await create_dishes(client, 2)
+    archived = [await create_order(client, [soup]), await create_order(client, [soup, soup, salad])]
+    order_ids = [order['id'] for order in archived]
+    for status in COMPLETION_CHAIN:
+        response = await client.patch('/api/v1/orders/status', json={'order_ids': order_ids, 'status': status})
+        assert response.json()['updated'] == order_ids
+    assert await archive_all() == 2
+    active = await create_order(client, [salad])
+    expected = [*archived, active]
+
+    response = await client.get('/api/v1/orders/')
+    assert [order['id'] for order in response.json()['items']] == [active['id']]
+    response = await client.get('/api/v1/orders/', query_string={'include_archive': 'true'})
+    listed = response.json()['items']
+    assert [order['id'] for order in listed] == [order['id'] for order in expected]
+    assert [order['dishes'] for order in listed] == [order['dishes'] for order in expected]
+    assert [order['status'] for order in listed] == [
+        OrderStatus.COMPLETED, OrderStatus.COMPLETED, OrderStatus.PROCESSING,
+    ]
+
+    response = await client.get(f'/api/v1/dishes/{soup}/orders', query_string={'include_archive': 'true'})
+    assert [order['id'] for order in response.json()['items']] == order_ids
+    response = await client.get(f'/api/v1/dishes/{soup}/orders')
+    assert response.json()['items'] == []
+
+    sales = [('dish_ids', soup), ('dish_ids', salad)]
+    response = await client.get('/api/v1/dishes/sales', query_string=sales)
+    assert response.json() == [
+        {'dish_id': soup, 'orders': 0, 'portions': 0},
+        {'dish_id': salad, 'orders': 1, 'portions': 1},
+    ]
+    response = await client.get('/api/v1/dishes/sales', query_string=[*sales, ('include_archive', 'true')])
+    assert response.json() == [
+        {'dish_id': soup, 'orders': 2, 'portions': 3},
+        {'dish_id': salad, 'orders': 2, 'portions': 2},
+    ]
+
+    response = await client.patch('/api/v1/orders/status', json={
+        'order_ids': [*order_ids, active['id'] + 100], 'status': OrderStatus.CANCELLED,
+    })
+    reasons = {rejected['id']: rejected['reason'] for rejected in response.json()['rejected']}
+    assert reasons[active['id'] + 100] == ORDER_NOT_FOUND_MSG
+    assert all(OrderStatus.COMPLETED in reasons[order_id] for order_id in order_ids)
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.config import settings
+from src.database import warm_up_pool
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_opens_connections_concurrently() -> None:
+    connections = 3
+    engine = create_async_engine(settings.DB_URL, pool_size=connections, max_overflow=0)
+    primed = asyncio.Barrier(connections)
+
+    async def prime(conn: AsyncConnection) -> None:
+        # Барьер пропускает только когда все соединения открыты одновременно
+        await asyncio.wait_for(primed.wait(), timeout=5)
+
+    try:
+        assert await warm_up_pool(engine, connections, prime) == connections
+        assert engine.pool.checkedin() == connections
+    finally:
+        await engine.dispose()
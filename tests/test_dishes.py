@@ -0,0 +1,110 @@
+"""Список блюд: кэш меню с ETag и поиск по названию и описанию."""
+import pytest
+from async_asgi_testclient import TestClient
+
+from src.api.v1.services.dish_service import DishService
+from src.utils.constants import DishCategory
+from tests.utils import create_dishes
+
+SEARCH_PAGE_SIZE = 2
+
+
+async def create_dish(client: TestClient, name: str, description: str | None = None, category: str = 'супы') -> int:
+    response = await client.post(
+        '/api/v1/dishes/', json={'name': name, 'description': description, 'price': 100, 'category': category},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()['id']
+
+
+async def search(client: TestClient, q: str, **params) -> list[int]:
+    """ID найденных блюд на первой странице поиска."""
+    response = await client.get('/api/v1/dishes/', query_string={'q': q, **params})
+    assert response.status_code == 200, response.text
+    return [dish['id'] for dish in response.json()['items']]
+
+
+async def get_menu(client: TestClient, etag: str | None = None, **params) -> tuple[int, str, list[int]]:
+    """Запрос страницы меню: код ответа, ETag и ID блюд (пустой список для 304)."""
+    headers = {'If-None-Match': etag} if etag is not None else {}
+    response = await client.get('/api/v1/dishes/', query_string=params, headers=headers)
+    assert response.headers['Cache-Control'] == 'no-cache'
+    items = response.json()['items'] if response.status_code == 200 else []
+    return response.status_code, response.headers['ETag'], [dish['id'] for dish in items]
+
+
+@pytest.mark.asyncio
+async def test_menu_etag_and_invalidation(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Совпавший If-None-Match дает 304 из кэша, после записи блюда ETag меняется."""
+    first, second = await create_dishes(client, 2)
+    status_code, etag, dish_ids = await get_menu(client)
+    assert (status_code, dish_ids) == (200, [first, second])
+
+    async def no_database(*_args, **_kwargs) -> None:
+        raise AssertionError('страница из кэша не должна читаться из базы')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(DishService, 'get_dishes_page', no_database)
+        for if_none_match in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            assert await get_menu(client, if_none_match) == (304, etag, [])
+        assert await get_menu(client, '"other"') == (200, etag, [first, second])
+    # Ключ кэша включает параметры страницы
+    status_code, category_etag, dish_ids = await get_menu(client, etag, category='салаты')
+    assert (status_code, dish_ids) == (200, [])
+    assert category_etag != etag
+
+    (third,) = await create_dishes(client, 1)
+    status_code, created_etag, dish_ids = await get_menu(client, etag)
+    assert (status_code, dish_ids) == (200, [first, second, third])
+    assert created_etag != etag
+
+    response = await client.delete(f'/api/v1/dishes/{first}')
+    assert response.status_code == 204, response.text
+    status_code, deleted_etag, dish_ids = await get_menu(client, created_etag)
+    assert (status_code, dish_ids) == (200, [second, third])
+    assert deleted_etag not in {etag, created_etag}
+    assert await get_menu(client, deleted_etag) == (304, deleted_etag, [])
+
+
+@pytest.mark.asyncio
+async def test_search_ranking(client: TestClient) -> None:
+    """Совпадение в названии выше совпадения в описании, слова запроса ищутся по началу слова."""
+    in_description = await create_dish(client, 'Закуска дня', 'томатный суп с базиликом')
+    in_name = await create_dish(client, 'Томатный суп', 'с базиликом')
+    salad = await create_dish(client, 'Салат с томатами', category=DishCategory.SALADS)
+    await create_dish(client, 'Грибной суп', 'сливочный')
+
+    found = await search(client, 'томат')
+    assert sorted(found) == [in_description, in_name, salad]
+    assert found.index(in_name) < found.index(in_description)
+    assert await search(client, 'ТОМ суп') == [in_name, in_description]
+    assert await search(client, 'томат', category=DishCategory.SALADS.value) == [salad]
+    # Совпадение внутри слова не считается
+    assert await search(client, 'оматный') == []
+    assert await search(client, '!!!') == []
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_pagination(client: TestClient) -> None:
+    """Страницы поиска по курсору повторяют выдачу без ограничения: без пропусков и повторов."""
+    for index in range(3):
+        await create_dish(client, f'Суп {index}', 'домашний')
+        await create_dish(client, f'Пирог {index}', 'к супу')
+    await create_dish(client, 'Суп суп суп')
+    await create_dish(client, 'Морс')
+    expected = await search(client, 'суп', limit=100)
+    assert len(expected) == 7
+
+    found, cursor = [], None
+    while True:
+        params = {'q': 'суп', 'limit': SEARCH_PAGE_SIZE, **({'cursor': cursor} if cursor else {})}
+        response = await client.get('/api/v1/dishes/', query_string=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert 'ETag' not in response.headers
+        found.extend(dish['id'] for dish in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+        assert len(page['items']) == SEARCH_PAGE_SIZE
+    assert found == expected
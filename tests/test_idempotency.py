@@ -0,0 +1,92 @@
+"""Повтор запросов создания заказа с заголовком Idempotency-Key."""
+import asyncio
+
+import pytest
+from async_asgi_testclient import TestClient
+from async_asgi_testclient.response import Response
+from sqlalchemy import func, select
+
+from src.api.v1.services import idempotency_service
+from src.config import settings
+from src.database import async_session_maker
+from src.models import Order
+from src.utils.constants import IDEMPOTENCY_KEY_REUSED_MSG
+from src.utils.idempotency import IdempotencyCache
+from tests.utils import create_dishes
+
+CONCURRENT_REQUESTS = 5
+
+
+@pytest.fixture(autouse=True)
+def idempotency_cache(monkeypatch: pytest.MonkeyPatch) -> IdempotencyCache:
+    """Пустой кэш ответов на каждый тест: таблица ключей пересоздается перед тестом."""
+    cache = IdempotencyCache(max_entries=settings.IDEMPOTENCY_CACHE_MAX_ENTRIES)
+    monkeypatch.setattr(idempotency_service, 'idempotency_cache', cache)
+    return cache
+
+
+async def count_orders() -> int:
+    async with async_session_maker() as session:
+        return await session.scalar(select(func.count()).select_from(Order))
+
+
+async def post_order(client: TestClient, key: str, dish_ids: list[int]) -> Response:
+    return await client.post(
+        '/api/v1/orders/', json={'customer_name': 'Иван', 'dish_ids': dish_ids}, headers={'Idempotency-Key': key},
+    )
+
+
+@pytest.mark.asyncio
+async def test_same_key_and_body_replays_stored_response(
+        client: TestClient, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Повтор возвращает сохраненный ответ из кэша процесса и из базы, не создавая заказ."""
+    dish_ids = await create_dishes(client, 2)
+    first = await post_order(client, 'order-1', dish_ids)
+    assert first.status_code == 201, first.text
+    assert 'Idempotent-Replayed' not in first.headers
+
+    replay = await post_order(client, 'order-1', dish_ids)
+    # Ответ, сохраненный другим процессом, читается из таблицы ключей
+    monkeypatch.setattr(
+        idempotency_service, 'idempotency_cache', IdempotencyCache(settings.IDEMPOTENCY_CACHE_MAX_ENTRIES),
+    )
+    stored_replay = await post_order(client, 'order-1', dish_ids)
+    for response in (replay, stored_replay):
+        assert response.status_code == 201, response.text
+        assert response.headers['Idempotent-Replayed'] == 'true'
+        assert response.content == first.content
+    assert await count_orders() == 1
+
+
+@pytest.mark.asyncio
+async def test_same_key_with_different_body_is_rejected(client: TestClient) -> None:
+    dish_ids = await create_dishes(client, 2)
+    assert (await post_order(client, 'order-1', dish_ids)).status_code == 201
+
+    response = await post_order(client, 'order-1', dish_ids[:1])
+    assert response.status_code == 422, response.text
+    assert response.json()['detail'] == IDEMPOTENCY_KEY_REUSED_MSG
+    assert await count_orders() == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('coalesced', [True, False], ids=['same-process', 'other-process'])
+async def test_concurrent_requests_with_same_key_create_one_order(
+        client: TestClient, idempotency_cache: IdempotencyCache, monkeypatch: pytest.MonkeyPatch, coalesced: bool,
+) -> None:
+    """Конкурентные запросы с одним ключом создают один заказ и получают одинаковый ответ.
+
+    Без ожидания в процессе (как запросы в разных процессах) каждый запрос сам читает
+    таблицу ключей; заказы запросов, выполнивших обработчик одновременно с первым,
+    откатываются вместе с неудачной вставкой ключа.
+    """
+    dish_ids = await create_dishes(client, 2)
+    if not coalesced:
+        monkeypatch.setattr(idempotency_cache, 'inflight', lambda _key: None)
+
+    responses = await asyncio.gather(*(post_order(client, 'order-1', dish_ids) for _ in range(CONCURRENT_REQUESTS)))
+    assert [response.status_code for response in responses] == [201] * CONCURRENT_REQUESTS
+    assert len({response.content for response in responses}) == 1
+    assert sum('Idempotent-Replayed' not in response.headers for response in responses) == 1
+    assert await count_orders() == 1
@@ -0,0 +1,107 @@
+"""Публикация событий заказов (SSE) только после подтверждения транзакции."""
+import asyncio
+import weakref
+
+import orjson
+import pytest
+from async_asgi_testclient import TestClient
+
+from src.api.v1.services.order_service import order_events
+from src.database import async_session_maker
+from src.models import Order
+from src.utils.constants import OrderStatus
+from src.utils.unit_of_work import UnitOfWork
+from tests.utils import create_dishes, create_order
+
+
+async def stored_status(order_id: int) -> str | None:
+    """Статус заказа, видимый другому соединению (None - заказа нет)."""
+    async with async_session_maker() as session:
+        order = await session.get(Order, order_id)
+        return order.status if order is not None else None
+
+
+async def subscribe(count: int) -> asyncio.Task:
+    """Подписка на события заказов.
+
+    Задача возвращает `count` событий вместе со статусом заказа в базе на момент получения.
+    """
+    async def collect() -> list[tuple[str, dict, str | None]]:
+        received = []
+        async for frame in order_events.stream():
+            if frame.startswith(b':'):
+                continue
+            event_line, data_line = frame.decode().strip().splitlines()
+            data = orjson.loads(data_line.removeprefix('data: '))
+            received.append((event_line.removeprefix('event: '), data, await stored_status(data['id'])))
+            if len(received) == count:
+                return received
+        return received
+
+    subscribers = order_events.subscribers_count
+    task = asyncio.create_task(collect())
+    while order_events.subscribers_count == subscribers:
+        await asyncio.sleep(0)
+    return task
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_after_commit(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """События публикуются после завершения транзакции и доходят до подписчика вместе с изменением."""
+    dish_ids = await create_dishes(client, 2)
+    units_of_work = weakref.WeakSet()
+    published = []
+    aenter, publish = UnitOfWork.__aenter__, order_events.publish
+
+    async def tracking_aenter(self: UnitOfWork) -> UnitOfWork:
+        units_of_work.add(self)
+        return await aenter(self)
+
+    def recording_publish(event: str, data: dict) -> None:
+        published.append((event, any(uow.is_open for uow in units_of_work)))
+        publish(event, data)
+
+    monkeypatch.setattr(UnitOfWork, '__aenter__', tracking_aenter)
+    monkeypatch.setattr(order_events, 'publish', recording_publish)
+    events = await subscribe(2)
+
+    order = await create_order(client, dish_ids)
+    # Отклоненный переход не публикует событие
+    response = await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': OrderStatus.COMPLETED})
+    assert response.status_code == 400, response.text
+    response = await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': OrderStatus.PREPARING})
+    assert response.status_code == 200, response.text
+
+    # Ни одна транзакция не была открыта в момент публикации
+    assert published == [('order_created', False), ('order_status_changed', False)]
+    created, changed = await asyncio.wait_for(events, timeout=5)
+    assert created == ('order_created', order, OrderStatus.PROCESSING)
+    assert changed == (
+        'order_status_changed', {'id': order['id'], 'status': OrderStatus.PREPARING}, OrderStatus.PREPARING,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_transaction_publishes_nothing(
+        client: TestClient, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Событие, зарегистрированное в транзакции, отбрасывается при ее откате."""
+    dish_ids = await create_dishes(client, 1)
+    order = await create_order(client, dish_ids)
+    events = await subscribe(1)
+
+    async def failing_commit(self: UnitOfWork) -> None:
+        raise ConnectionError('соединение потеряно при подтверждении')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(UnitOfWork, 'commit', failing_commit)
+        with pytest.raises(ConnectionError):
+            await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': OrderStatus.PREPARING})
+    assert await stored_status(order['id']) == OrderStatus.PROCESSING
+
+    response = await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': OrderStatus.CANCELLED})
+    assert response.status_code == 200, response.text
+    (received,) = await asyncio.wait_for(events, timeout=5)
+    assert received == (
+        'order_status_changed', {'id': order['id'], 'status': OrderStatus.CANCELLED}, OrderStatus.CANCELLED,
+    )
@@ -0,0 +1,127 @@
+"""Смена статуса заказов: конкурентная смена статуса одного заказа (compare-and-set в UPDATE) и пакетная."""
+import asyncio
+import random
+from itertools import permutations
+
+import pytest
+from async_asgi_testclient import TestClient
+
+from src.utils.constants import ORDER_NOT_FOUND_MSG, OrderStatus
+from tests.utils import create_dishes, create_order
+
+# Каждый целевой статус запрашивается несколько раз, чтобы одинаковые переходы конкурировали
+REQUESTS_PER_STATUS = 8
+
+
+def build_chain(start: str, reached: list[str]) -> list[str] | None:
+    """Упорядочивает достигнутые статусы в цепочку допустимых переходов от `start`.
+
+    Returns:
+        Цепочку статусов от `start` или None, если такого порядка нет
+    """
+    for ordering in permutations(reached):
+        chain = [start, *ordering]
+        if all(OrderStatus.can_transition(current, following) for current, following in zip(chain, chain[1:])):
+            return chain
+    return None
+
+
+@pytest.mark.asyncio
+async def test_parallel_status_transitions_form_valid_chain(client: TestClient) -> None:
+    dish_ids = await create_dishes(client, 2)
+    order = await create_order(client, dish_ids)
+    assert order['status'] == OrderStatus.PROCESSING
+
+    targets = [status.value for status in OrderStatus if status is not OrderStatus.PROCESSING]
+    targets *= REQUESTS_PER_STATUS
+    random.Random(10).shuffle(targets)
+    responses = await asyncio.gather(*(
+        client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': target}) for target in targets
+    ))
+
+    reached = []
+    for target, response in zip(targets, responses):
+        if response.status_code == 200:
+            assert response.json()['status'] == target
+            reached.append(target)
+        else:
+            # Проигравшие запросы отклоняются как недопустимый переход, а не ошибкой сервера
+            assert response.status_code == 400, response.text
+
+    # Каждый статус достигается не больше одного раза, а успешные переходы образуют цепочку
+    assert len(reached) == len(set(reached))
+    chain = build_chain(OrderStatus.PROCESSING, reached)
+    assert chain is not None, f'успешные переходы {reached} не образуют цепочку'
+
+    listed = await client.get('/api/v1/orders/')
+    assert listed.status_code == 200
+    (stored,) = listed.json()['items']
+    assert stored['status'] == chain[-1]
+
+    # Из итогового статуса не осталось перехода, который отклонили бы все запросы
+    pending = {target for target in targets if OrderStatus.can_transition(chain[-1], target)}
+    assert not pending
+
+
+@pytest.mark.asyncio
+async def test_status_update_keeps_repeated_dishes(client: TestClient) -> None:
+    """Ответ на смену статуса содержит все порции блюд заказа, как и список заказов."""
+    soup, salad = await create_dishes(client, 2)
+    order = await create_order(client, [soup, soup, salad])
+
+    response = await client.patch(f"/api/v1/orders/{order['id']}/status", json={'status': OrderStatus.PREPARING})
+    assert response.status_code == 200, response.text
+    updated = response.json()
+    assert updated['status'] == OrderStatus.PREPARING
+    assert [dish['id'] for dish in updated['dishes']] == [soup, soup, salad]
+    assert updated['dishes'] == order['dishes']
+    assert updated['order_time'] == order['order_time']
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_update_reports_each_order(client: TestClient) -> None:
+    """Пакетная смена статуса применяет допустимые переходы и объясняет отказ для остальных ID."""
+    dish_ids = await create_dishes(client, 1)
+    processing, preparing, cancelled = [(await create_order(client, dish_ids))['id'] for _ in range(3)]
+    unknown = cancelled + 100
+    for order_id, status in ((preparing, OrderStatus.PREPARING), (cancelled, OrderStatus.CANCELLED)):
+        response = await client.patch(f'/api/v1/orders/{order_id}/status', json={'status': status})
+        assert response.status_code == 200, response.text
+
+    response = await client.patch('/api/v1/orders/status', json={
+        'order_ids': [processing, preparing, unknown, processing, cancelled, unknown],
+        'status': OrderStatus.PREPARING,
+    })
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result['updated'] == [processing]
+    # Повторные ID учитываются один раз, отказы - в порядке запроса
+    assert [rejected['id'] for rejected in result['rejected']] == [preparing, unknown, cancelled]
+    reasons = {rejected['id']: rejected['reason'] for rejected in result['rejected']}
+    assert reasons[unknown] == ORDER_NOT_FOUND_MSG
+    assert OrderStatus.PREPARING in reasons[preparing]
+    assert OrderStatus.READY in reasons[preparing]
+    assert OrderStatus.CANCELLED in reasons[cancelled]
+
+    response = await client.get('/api/v1/orders/')
+    statuses = {order['id']: order['status'] for order in response.json()['items']}
+    assert statuses == {
+        processing: OrderStatus.PREPARING, preparing: OrderStatus.PREPARING, cancelled: OrderStatus.CANCELLED,
+    }
+
+    response = await client.patch('/api/v1/orders/status', json={
+        'order_ids': [processing, preparing], 'status': OrderStatus.READY,
+    })
+    assert sorted(response.json()['updated']) == [processing, preparing]
+    assert response.json()['rejected'] == []
+
+    # Пакет без допустимых переходов - не ошибка, а пустой список обновленных
+    response = await client.patch('/api/v1/orders/status', json={
+        'order_ids': [cancelled, unknown], 'status': OrderStatus.COMPLETED,
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()['updated'] == []
+    assert [rejected['id'] for rejected in response.json()['rejected']] == [cancelled, unknown]
+
+    response = await client.patch('/api/v1/orders/status', json={'order_ids': [], 'status': OrderStatus.READY})
+    assert response.status_code == 422, response.text
@@ -0,0 +1,122 @@
+import orjson
+import pytest
+from async_asgi_testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.orm import selectinload
+
+from src.api.v1.services.dish_service import DishService, dish_catalog
+from src.api.v1.services.order_service import OrderService
+from src.database import async_session_maker, engine, replica_engines
+from src.models import Order
+from src.schemas.order import OrderRead
+from src.schemas.pagination import Page
+from src.utils.constants import ORDER_DISHES_NOT_FOUND_MSG
+from src.utils.unit_of_work import UnitOfWork
+from tests.utils import create_dishes, create_order
+
+
+@pytest.mark.asyncio
+async def test_single_and_batch_create_accept_same_dish_ids(client: TestClient) -> None:
+    """Одиночное и пакетное создание проверяют блюда заказа по одному правилу."""
+    soup, salad = await create_dishes(client, 2)
+    unknown = salad + 100
+    payloads = [
+        {'customer_name': 'Иван', 'dish_ids': [soup, soup, salad]},
+        {'customer_name': 'Петр', 'dish_ids': [soup, unknown]},
+    ]
+
+    single = [await client.post('/api/v1/orders/', json=payload) for payload in payloads]
+    response = await client.post('/api/v1/orders/batch', json={'items': payloads})
+    assert response.status_code == 200, response.text
+    batch = response.json()
+
+    assert [item['success'] for item in batch] == [response.status_code == 201 for response in single]
+    assert single[1].status_code == 400
+    assert single[1].json()['detail'] == batch[1]['error'] == ORDER_DISHES_NOT_FOUND_MSG
+
+    # Повторный ID блюда - несколько порций в заказе
+    order = single[0].json()
+    assert [dish['id'] for dish in order['dishes']] == [soup, soup, salad]
+    assert [dish['id'] for dish in batch[0]['order']['dishes']] == [soup, soup, salad]
+    response = await client.get('/api/v1/dishes/sales', query_string=[('dish_ids', soup)])
+    assert response.json() == [{'dish_id': soup, 'orders': 2, 'portions': 4}]
+
+
+@pytest.mark.asyncio
+async def test_repeated_dishes_are_returned_by_every_read_path(client: TestClient) -> None:
+    """Все ответы с заказом содержат блюда по элементу на порцию в порядке dish_ids."""
+    soup, salad = await create_dishes(client, 2)
+    order = await create_order(client, [salad, soup, salad], customer_name='Порции')
+    expected = [salad, soup, salad]
+    assert [dish['id'] for dish in order['dishes']] == expected
+
+    pages = [
+        await client.get('/api/v1/orders/'),
+        await client.get('/api/v1/orders/search', query_string={'customer_name': 'Порции'}),
+        await client.get(f'/api/v1/dishes/{soup}/orders'),
+    ]
+    for response in pages:
+        assert response.status_code == 200, response.text
+        (listed,) = response.json()['items']
+        assert listed['dishes'] == order['dishes']
+
+    response = await client.get('/api/v1/orders/export')
+    (exported,) = [orjson.loads(line) for line in response.content.splitlines() if line]
+    assert exported['dishes'] == order['dishes']
+
+    uow = UnitOfWork()
+    (stored,) = await OrderService(uow, DishService(uow)).get_all_orders()
+    assert [dish['id'] for dish in stored['dishes']] == expected
+
+
+@pytest.mark.asyncio
+async def test_orders_page_matches_orm_and_pydantic_schema(client: TestClient) -> None:
+    """Страницы заказов без ORM и pydantic совпадают с Page[OrderRead] из ORM-объектов."""
+    dish_ids = await create_dishes(client, 3)
+    for index in range(5):
+        await create_order(client, dish_ids[:index % 3 + 1], customer_name=f'Клиент {index}')
+    async with async_session_maker() as session:
+        orders = (await session.scalars(
+            select(Order).options(selectinload(Order.dishes)).order_by(Order.order_time, Order.id),
+        )).all()
+
+    cursor = None
+    for start in range(0, len(orders), 2):
+        params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+        response = await client.get('/api/v1/orders/', query_string=params)
+        assert response.status_code == 200, response.text
+        page = Page[OrderRead].model_validate_json(response.content)
+        cursor = page.next_cursor
+
+        expected = Page[OrderRead](items=orders[start:start + 2], next_cursor=cursor)
+        assert orjson.loads(response.content) == expected.model_dump(mode='json')
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_dishes_are_rejected_without_database_access(
+        client: TestClient, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Заказ с неизвестными блюдами отклоняется по снимку каталога, без запросов к базе."""
+    # ID больше наибольшего в снимке не вызывает перестроение снимка в пределах интервала
+    monkeypatch.setattr(dish_catalog, 'min_refresh_interval', 3600)
+    first, deleted, last = await create_dishes(client, 3)
+    assert (await client.delete(f'/api/v1/dishes/{deleted}')).status_code == 204
+    await create_order(client, [first, last])
+
+    statements = []
+
+    def count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    for db_engine in (engine, *replica_engines):
+        event.listen(db_engine.sync_engine, 'before_cursor_execute', count)
+    try:
+        for dish_ids in ([first, deleted], [last + 100], [first, last, last + 1]):
+            response = await client.post('/api/v1/orders/', json={'customer_name': 'Иван', 'dish_ids': dish_ids})
+            assert response.status_code == 400, response.text
+            assert response.json()['detail'] == ORDER_DISHES_NOT_FOUND_MSG
+    finally:
+        for db_engine in (engine, *replica_engines):
+            event.remove(db_engine.sync_engine, 'before_cursor_execute', count)
+    assert statements == []
@@ -0,0 +1,33 @@
+import pytest
+from async_asgi_testclient import TestClient
+
+from src.utils.pagination import encode_cursor
+from tests.utils import create_dishes, create_order
+
+ORDER_TIME = '2024-01-01T00:00:00'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(('path', 'params', 'cursor_values'), [
+    ('/api/v1/dishes/', {}, (True,)),
+    ('/api/v1/dishes/', {'q': 'Блюдо'}, (True, 1)),
+    ('/api/v1/dishes/', {'q': 'Блюдо'}, (0.5, False)),
+    ('/api/v1/orders/', {}, (ORDER_TIME, True)),
+    ('/api/v1/orders/search', {}, (ORDER_TIME, False)),
+    ('/api/v1/dishes/{dish_id}/orders', {}, (False,)),
+])
+async def test_boolean_cursor_values_are_rejected(
+        client: TestClient, path: str, params: dict, cursor_values: tuple,
+) -> None:
+    """true/false в курсоре - ошибка 400, а не ID 1/0."""
+    (dish_id,) = await create_dishes(client, 1)
+    await create_order(client, [dish_id])
+    url = path.format(dish_id=dish_id)
+
+    response = await client.get(url, query_string={**params, 'cursor': encode_cursor(*cursor_values)})
+    assert response.status_code == 400, response.text
+
+    # Курсор той же формы с числами вместо bool принимается
+    valid_values = (int(value) if isinstance(value, bool) else value for value in cursor_values)
+    response = await client.get(url, query_string={**params, 'cursor': encode_cursor(*valid_values)})
+    assert response.status_code == 200, response.text
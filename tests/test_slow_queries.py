@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from async_asgi_testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.utils.slow_queries import SlowQueryRecorder
+
+SECRET = 'Иван Секретов'
+QUERY = text('SELECT id FROM orders WHERE customer_name = :name')
+
+
+async def record_slow_query(recorder: SlowQueryRecorder) -> dict:
+    """Запрос через движок с единственным соединением, которое занято до построения плана."""
+    engine = create_async_engine(settings.DB_URL, pool_size=1, max_overflow=0, pool_timeout=1)
+    explain_engine = create_async_engine(settings.DB_URL)
+    recorder.instrument(engine, explain_engine)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(QUERY, {'name': SECRET})
+            await asyncio.wait_for(asyncio.gather(*recorder._tasks), timeout=5)
+    finally:
+        await engine.dispose()
+        await explain_engine.dispose()
+    (entry,) = recorder.recent()
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_parameters_are_redacted_by_default() -> None:
+    entry = await record_slow_query(SlowQueryRecorder(threshold=1e-9, buffer_size=10))
+
+    assert SECRET not in entry['parameters']
+    # План строится на отдельном движке, пока единственное соединение записанного запроса занято
+    assert entry['plan'] is not None, entry.get('plan_error')
+
+
+@pytest.mark.asyncio
+async def test_parameters_are_logged_when_enabled() -> None:
+    entry = await record_slow_query(SlowQueryRecorder(threshold=1e-9, buffer_size=10, log_parameters=True))
+
+    assert SECRET in entry['parameters']
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_is_disabled_by_default(client: TestClient) -> None:
+    """Журнал с текстом SQL и планами не доступен без ADMIN_ENDPOINTS_ENABLED."""
+    assert not settings.ADMIN_ENDPOINTS_ENABLED
+    response = await client.get('/api/v1/admin/slow-queries')
+    assert response.status_code == 404
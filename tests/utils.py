@@ -0,0 +1,21 @@
+"""Вспомогательные функции тестов."""
+from async_asgi_testclient import TestClient
+
+
+async def create_dishes(client: TestClient, count: int) -> list[int]:
+    """Создание `count` блюд через API, возвращает их ID."""
+    dish_ids = []
+    for index in range(count):
+        response = await client.post(
+            '/api/v1/dishes/', json={'name': f'Блюдо {index}', 'price': 100 + index, 'category': 'супы'},
+        )
+        assert response.status_code == 201, response.text
+        dish_ids.append(response.json()['id'])
+    return dish_ids
+
+
+async def create_order(client: TestClient, dish_ids: list[int], customer_name: str = 'Иван') -> dict:
+    """Создание заказа через API, возвращает заказ в формате OrderRead."""
+    response = await client.post('/api/v1/orders/', json={'customer_name': customer_name, 'dish_ids': dish_ids})
+    assert response.status_code == 201, response.text
+    return response.json()